@@ -0,0 +1,159 @@
+#!/bin/python3
+# 
+# Copyright Florian Pfanner 2026
+#
+# This file is part of AudioPlayer.
+# 
+# AudioPlayer is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# AudioPlayer is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+# 
+# You should have received a copy of the GNU General Public License
+# along with AudioPlayer. If not, see <https://www.gnu.org/licenses/>.
+# 
+# 
+
+
+
+
+
+"""Benchmark of album queries with and without the columnar album table.
+
+A synthetic index with --albums albums (default 100000) is build in memory, no
+files are written. For both CLibrarySnapshot variants (album objects and
+CAlbumTable, see setting library/albumTable) the build of the album lists, the
+ordering by name and date, filters by root, date range and minimum number of
+tracks and top N newest queries are timed. Result is printed (or written with
+--output) as json.
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import platform
+import argparse
+import statistics
+
+sys.path.insert( 0, os.path.join( os.path.dirname( os.path.abspath(__file__) ), "../src" ) )
+
+import CLibraryIndex
+
+
+def measure( func, repeat ):
+    """Call func repeat times, return dictionary with timing statistics in ms
+    """
+    times = []
+    for i in range( repeat ):
+        startTime = time.perf_counter()
+        func()
+        times.append( ( time.perf_counter() - startTime ) * 1000.0 )
+    return { "minMs": min( times ),
+             "medianMs": statistics.median( times ),
+             "meanMs": statistics.mean( times ),
+             "repeat": repeat }
+
+
+def createTree( albums, roots, dirsPerRoot, seed=1 ):
+    """Return combined CAudioDirectory of given number of roots with albums spread
+    over dirsPerRoot directories of each root
+    """
+    rnd = random.Random( seed )
+    now = 1700000000
+    rootDicts = []
+    for rootIdx in range( roots ):
+        rootName = "root{}".format( rootIdx )
+        groups = [ { "type": "CAudioDirectory", "name": "root/{}/Group {}".format( rootName, groupIdx ),
+                     "imageFiles": [], "childs": [] } for groupIdx in range( dirsPerRoot ) ]
+        rootDicts.append( ( rootName, { "type": "CAudioDirectory", "name": "root/" + rootName,
+                                        "imageFiles": [], "childs": groups } ) )
+    for albumIdx in range( albums ):
+        rootName, rootDict = rootDicts[albumIdx % roots]
+        group = rnd.choice( rootDict["childs"] )
+        path = "/music/{}/{}/Album {}".format( rootName, group["name"].split( "/" )[-1], albumIdx )
+        numTracks = rnd.randint( 1, 20 )
+        group["childs"].append( { "type": "CAudioAlbum",
+                                  "path": path,
+                                  "imageFiles": [ path + "/cover.jpg" ],
+                                  "audioFiles": [ "{}/Kapitel {}.mp3".format( path, track + 1 ) for track in range( numTracks ) ],
+                                  "directoryDate": now - rnd.randint( 0, 365 * 24 * 3600 ),
+                                  "size": numTracks * rnd.randint( 1000000, 10000000 ),
+                                  "sortKey": CLibraryIndex.naturalSortKey( group["name"] + "/" + os.path.basename( path ) ) } )
+
+    audioTree = CLibraryIndex.CAudioDirectory( None, None )
+    for rootName, rootDict in rootDicts:
+        rootDict["childs"] = [ group for group in rootDict["childs"] if group["childs"] ]     # a scan skips empty directories
+        rootTree = CLibraryIndex.CAudioDirectory( None, None, rootName )
+        rootTree.fromDict( rootDict )
+        audioTree.addChilds( rootTree )
+    return audioTree
+
+
+def runBenchmarks( audioTree, albumTable, args ):
+    results = {}
+    snapshot = CLibraryIndex.CLibrarySnapshot( audioTree, albumTable=albumTable )
+
+    def build():
+        other = CLibraryIndex.CLibrarySnapshot( audioTree, albumTable=albumTable )
+        other.getAlbumList( "full" )
+        other.getAlbumList( "date" )
+    results["buildAndSort"] = measure( build, args.repeat )
+    if albumTable:
+        results["buildTable"] = measure( lambda: CLibraryIndex.CLibrarySnapshot( audioTree, albumTable=True ).getAlbumTable(), args.repeat )
+
+    snapshot.getAlbumList( "full" )
+    snapshot.getAlbumList( "date" )
+    date = snapshot.getAlbum( snapshot.getAlbumList( "date" )[len( snapshot.getAlbumList( "date" ) ) // 2] ).getDate()
+    queries = { "root": lambda: snapshot.queryAlbums( "full", root="root1" ),
+                "dateRange": lambda: snapshot.queryAlbums( "date", dateFrom=date, dateTo=date + 30 * 24 * 3600 ),
+                "minTracks": lambda: snapshot.queryAlbums( "full", minTracks=15 ),
+                "combined": lambda: snapshot.queryAlbums( "full", root="root0", dateFrom=date, minTracks=10 ),
+                "newest20": lambda: snapshot.queryAlbums( "newest", limit=20 ),
+                "newest20OfRoot": lambda: snapshot.queryAlbums( "newest", root="root2", limit=20 ) }
+    for name, query in queries.items():
+        results["query_" + name] = measure( query, args.repeat )
+        results["query_" + name]["albums"] = len( query() )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser( description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter )
+    parser.add_argument( "--albums", type=int, default=100000, help="Number of albums" )
+    parser.add_argument( "--roots", type=int, default=4, help="Number of library roots" )
+    parser.add_argument( "--dirsPerRoot", type=int, default=100, help="Number of group directories of each root" )
+    parser.add_argument( "--repeat", type=int, default=5, help="Number of repetitions of each measurement" )
+    parser.add_argument( "--output", help="Write json result to this file instead of stdout" )
+    args = parser.parse_args()
+
+    startTime = time.perf_counter()
+    audioTree = createTree( args.albums, args.roots, args.dirsPerRoot )
+    generateTime = time.perf_counter() - startTime
+
+    results = { "objects": runBenchmarks( audioTree, False, args ),
+                "albumTable": runBenchmarks( audioTree, True, args ) }
+    for name, result in results["objects"].items():
+        if name in results["albumTable"]:
+            results["albumTable"][name]["speedup"] = result["medianMs"] / max( 1e-6, results["albumTable"][name]["medianMs"] )
+
+    output = { "benchmark": "albumTable",
+               "timestamp": time.strftime( "%Y-%m-%dT%H:%M:%S" ),
+               "python": platform.python_version(),
+               "parameters": { "albums": args.albums, "roots": args.roots, "dirsPerRoot": args.dirsPerRoot },
+               "generateSeconds": generateTime,
+               "results": results }
+    if args.output:
+        with open( args.output, "w" ) as fp:
+            json.dump( output, fp, indent=2 )
+    else:
+        print( json.dumps( output, indent=2 ) )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+#!/bin/python3
+# 
+# Copyright Florian Pfanner 2026
+#
+# This file is part of AudioPlayer.
+# 
+# AudioPlayer is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# AudioPlayer is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+# 
+# You should have received a copy of the GNU General Public License
+# along with AudioPlayer. If not, see <https://www.gnu.org/licenses/>.
+# 
+# 
+
+
+
+
+
+"""Fault tolerance benchmark of the library scan.
+
+A synthetic library is generated (see syntheticLibrary.py) and scanned once
+to get the last known tree. Then the scan is repeated with the fault
+injecting file system shim (CFileSystem.CFaultyFileSystem): added latency,
+random read errors and a hanging sub directory, each with a per directory
+deadline. For each scenario the scan time, the number of directories which
+could not be read and the number of albums kept (stale) are reported as json.
+The local scan without deadline shows the overhead of the deadline threads.
+"""
+
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import tempfile
+
+sys.path.insert( 0, os.path.join( os.path.dirname( os.path.abspath(__file__) ), "../src" ) )
+
+from PyQt5.QtCore import QCoreApplication
+from PyQt5.QtCore import QSettings
+
+import CAudioLibrary
+import CFileSystem
+import syntheticLibrary
+
+
+def runScenario( library, libraryPath, baseline, fileSystem, timeout ):
+    """Scan library with given file system, the baseline tree is used as last known
+    content. Return dictionary with results
+    """
+    if timeout > 0:
+        fileSystem = CFileSystem.CDeadlineFileSystem( fileSystem, timeout )
+    root = CAudioLibrary.CLibraryRoot( libraryPath, fileSystem=fileSystem )
+    root.setTree( baseline )
+    startTime = time.perf_counter()
+    tree = root.scan( library )
+    duration = time.perf_counter() - startTime
+    snapshot = CAudioLibrary.CLibrarySnapshot( tree )
+    return { "seconds": duration,
+             "failedDirectories": root.getLastScanFailures(),
+             "albums": snapshot.getNumAlbums(),
+             "staleAlbums": snapshot.getNumStaleAlbums() }
+
+
+def main():
+    parser = argparse.ArgumentParser( description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter )
+    syntheticLibrary.addArguments( parser )
+    parser.add_argument( "--latency", type=float, default=0.002, help="Latency in s added to each directory read" )
+    parser.add_argument( "--errorRate", type=float, default=0.05, help="Probability of a directory read to fail" )
+    parser.add_argument( "--timeout", type=float, default=1.0, help="Deadline in s of each directory read" )
+    parser.add_argument( "--output", help="Write json result to this file instead of stdout" )
+    args = parser.parse_args()
+
+    app = QCoreApplication( sys.argv )
+
+    with tempfile.TemporaryDirectory() as tmpDir:
+        libraryPath = os.path.join( tmpDir, "library" )
+        libraryStats = syntheticLibrary.createLibraryFromArgs( libraryPath, args )
+
+        settings = QSettings( os.path.join( tmpDir, "settings.ini" ), QSettings.IniFormat )
+        settings.setValue( "library/dirs", libraryPath )
+        settings.setValue( "library/imageCache", 0 )
+        settings.setValue( "library/progressiveScan", 0 )
+        userData = QSettings( os.path.join( tmpDir, "userData.ini" ), QSettings.IniFormat )
+        library = CAudioLibrary.CAudioLibrary( settings, userData )
+        baseline = library.getRoots()[0].getTree()
+
+        hangPath = os.path.join( libraryPath, sorted( os.listdir( libraryPath ) )[0] )
+        scenarios = { "local": CFileSystem.CFileSystem(),
+                      "latency": CFileSystem.CFaultyFileSystem( latency=args.latency, seed=args.seed ),
+                      "errors": CFileSystem.CFaultyFileSystem( errorRate=args.errorRate, seed=args.seed ),
+                      "hang": CFileSystem.CFaultyFileSystem( hangPaths=[ hangPath ], hangTime=args.timeout * 5 ) }
+        results = { "local_noDeadline": runScenario( library, libraryPath, baseline, CFileSystem.CFileSystem(), 0 ) }
+        for name, fileSystem in scenarios.items():
+            results[name] = runScenario( library, libraryPath, baseline, fileSystem, args.timeout )
+
+    output = { "benchmark": "fault",
+               "timestamp": time.strftime( "%Y-%m-%dT%H:%M:%S" ),
+               "python": platform.python_version(),
+               "platform": platform.platform(),
+               "library": libraryStats,
+               "timeout": args.timeout,
+               "results": results }
+    if args.output:
+        with open( args.output, "w" ) as fp:
+            json.dump( output, fp, indent=2 )
+    else:
+        print( json.dumps( output, indent=2 ) )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,242 @@
+#!/bin/python3
+# 
+# Copyright Florian Pfanner 2026
+#
+# This file is part of AudioPlayer.
+# 
+# AudioPlayer is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# AudioPlayer is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+# 
+# You should have received a copy of the GNU General Public License
+# along with AudioPlayer. If not, see <https://www.gnu.org/licenses/>.
+# 
+# 
+
+
+
+"""Headless benchmark of GUI interaction latency.
+
+CMainWindow runs under Qt's offscreen platform with the simulated playback
+backend against a generated library (see syntheticLibrary.py). Scripted key
+presses and mouse drags are replayed: next/prev album by key and by swipe,
+album selection, jump via group selector, model switch and scrolling of the
+group selector. For each interaction type the latency until all resulting
+events are processed and the number of decoded images are reported as json.
+"""
+
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import tempfile
+
+os.environ.setdefault( "QT_QPA_PLATFORM", "offscreen" )
+sys.path.insert( 0, os.path.join( os.path.dirname( os.path.abspath(__file__) ), "../src" ) )
+
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtGui import QMouseEvent
+from PyQt5.QtGui import QKeyEvent
+from PyQt5.QtCore import QSettings
+from PyQt5.QtCore import QEvent
+from PyQt5.QtCore import QPoint
+from PyQt5.QtCore import QSize
+from PyQt5.QtCore import Qt
+
+import CMainWindow
+import CTracer
+import CScheduler
+import syntheticLibrary
+
+
+def percentile( values, p ):
+    values = sorted( values )
+    return values[ min( len( values ) - 1, int( len( values ) * p / 100 ) ) ]
+
+
+class CInteractionRunner:
+    """Sends synthetic input events to the main window and records latency
+    and image decodes per interaction type
+    """
+
+    def __init__( self, app, window ):
+        self._app = app
+        self._window = window
+        self._library = window._audioLibrary
+        self._results = {}
+
+
+    def _run( self, name, func ):
+        decodes = self._library.getStatistics()["imageDecodes"]
+        startTime = time.perf_counter()
+        func()
+        self._app.processEvents()
+        latency = time.perf_counter() - startTime
+        result = self._results.setdefault( name, { "latency": [], "decodes": [] } )
+        result["latency"].append( latency )
+        result["decodes"].append( self._library.getStatistics()["imageDecodes"] - decodes )
+
+
+    def _key( self, widget, key ):
+        self._app.sendEvent( widget, QKeyEvent( QEvent.KeyPress, key, Qt.NoModifier ) )
+        self._app.sendEvent( widget, QKeyEvent( QEvent.KeyRelease, key, Qt.NoModifier ) )
+
+
+    def _drag( self, widget, start, end, steps=1 ):
+        self._app.sendEvent( widget, QMouseEvent( QEvent.MouseButtonPress, start, Qt.LeftButton, Qt.LeftButton, Qt.NoModifier ) )
+        for step in range( 1, steps + 1 ):
+            pos = start + ( end - start ) * step / steps
+            self._app.sendEvent( widget, QMouseEvent( QEvent.MouseMove, pos, Qt.NoButton, Qt.LeftButton, Qt.NoModifier ) )
+        self._app.sendEvent( widget, QMouseEvent( QEvent.MouseButtonRelease, end, Qt.LeftButton, Qt.NoButton, Qt.NoModifier ) )
+
+
+    def nextKey( self ):
+        self._run( "nextKey", lambda: self._key( self._window._selector, Qt.Key_Right ) )
+
+    def prevKey( self ):
+        self._run( "prevKey", lambda: self._key( self._window._selector, Qt.Key_Left ) )
+
+    def swipeNext( self ):
+        center = self._window._selector.rect().center()
+        self._run( "swipeNext", lambda: self._drag( self._window._selector, center, center - QPoint( 150, 0 ) ) )
+
+    def swipePrev( self ):
+        center = self._window._selector.rect().center()
+        self._run( "swipePrev", lambda: self._drag( self._window._selector, center, center + QPoint( 150, 0 ) ) )
+
+    def select( self ):
+        center = self._window._selector.rect().center()
+        self._run( "select", lambda: self._drag( self._window._selector, center, center + QPoint( 0, 150 ) ) )
+
+    def jump( self ):
+        groupSelector = self._window._groupSelector
+        pos = groupSelector._view.geometry().topLeft() + QPoint( 20, 20 )
+        self._run( "jump", lambda: self._drag( groupSelector, pos, pos ) )
+
+    def switchModel( self, idx ):
+        button = self._window._groupSelector._CGuiAlbumGroupSelector__buttons[idx][3]
+        self._run( "modelSwitch", button.click )
+
+    def scroll( self, distance ):
+        groupSelector = self._window._groupSelector
+        start = groupSelector._view.geometry().center()
+        self._run( "scroll", lambda: self._drag( groupSelector, start, start - QPoint( 0, distance ), 10 ) )
+
+
+    def getResults( self ):
+        res = {}
+        for name, data in self._results.items():
+            latency = data["latency"]
+            res[name] = { "count": len( latency ),
+                          "p50Ms": percentile( latency, 50 ) * 1000.0,
+                          "p90Ms": percentile( latency, 90 ) * 1000.0,
+                          "p99Ms": percentile( latency, 99 ) * 1000.0,
+                          "maxMs": max( latency ) * 1000.0,
+                          "decodes": sum( data["decodes"] ),
+                          "decodesPerInteraction": sum( data["decodes"] ) / len( latency ) }
+        return res
+
+
+def measureWakeups( app, seconds ):
+    """Process events for given time without interaction. Return dictionary with
+    timer wakeups per minute and jobs still active
+    """
+    scheduler = CScheduler.getScheduler()
+    wakeups = scheduler.getNumWakeups()
+    endTime = time.perf_counter() + seconds
+    while time.perf_counter() < endTime:
+        app.processEvents()
+        time.sleep( 0.01 )
+    return { "wakeupsPerMinute": ( scheduler.getNumWakeups() - wakeups ) * 60.0 / seconds,
+             "activeJobs": scheduler.getActiveJobs() }
+
+
+def main():
+    parser = argparse.ArgumentParser( description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter )
+    syntheticLibrary.addArguments( parser )
+    parser.set_defaults( albums=500, imageSize=600, filesPerAlbum=3 )
+    parser.add_argument( "--rounds", type=int, default=20, help="Number of repetitions of the interaction script" )
+    parser.add_argument( "--windowSize", default="800x480", help="Size of main window" )
+    parser.add_argument( "--idleTime", type=float, default=5.0, help="Time in s timer wakeups are counted while playing and while idle" )
+    parser.add_argument( "--output", help="Write json result to this file instead of stdout (GUI messages are printed to stdout as well)" )
+    args = parser.parse_args()
+
+    app = QApplication( sys.argv )
+
+    with tempfile.TemporaryDirectory() as tmpDir:
+        libraryPath = os.path.join( tmpDir, "library" )
+        libraryStats = syntheticLibrary.createLibraryFromArgs( libraryPath, args )
+
+        width, height = [ int( v ) for v in args.windowSize.split( "x" ) ]
+        settings = QSettings( os.path.join( tmpDir, "settings.ini" ), QSettings.IniFormat )
+        settings.setValue( "library/dirs", libraryPath )
+        settings.setValue( "library/cacheDir", os.path.join( tmpDir, "cache" ) )
+        settings.setValue( "library/progressiveScan", 0 )
+        settings.setValue( "audioPlayer/backend", "simulated" )
+        settings.setValue( "audioPlayer/maximized", 0 )
+        settings.setValue( "audioPlayer/windowSize", QSize( width, height ) )
+        settings.setValue( "audioPlayer/idleGraceTime", 1 )
+        userData = QSettings( os.path.join( tmpDir, "user", "userData.ini" ), QSettings.IniFormat )
+
+        startTime = time.perf_counter()
+        window = CMainWindow.CMainWindow( None, None, None, settings, userData )
+        window.show()
+        while not window.isInitDone():
+            app.processEvents()
+        startupTime = time.perf_counter() - startTime
+
+        runner = CInteractionRunner( app, window )
+        for i in range( args.rounds ):
+            for j in range( 5 ):
+                runner.nextKey()
+            for j in range( 3 ):
+                runner.prevKey()
+            for j in range( 3 ):
+                runner.swipeNext()
+            for j in range( 2 ):
+                runner.swipePrev()
+            runner.switchModel( 0 )
+            for j in range( 5 ):
+                runner.scroll( 120 )
+            runner.jump()
+            runner.switchModel( 1 )
+            runner.scroll( 120 )
+            runner.jump()
+            runner.select()
+
+        # album of last select is playing, then pause it and wait until player is idle
+        wakeups = { "playing": measureWakeups( app, args.idleTime ) }
+        window._player._CGuiAudioPlayer__buttons[0][3].click()
+        measureWakeups( app, 1.5 )
+        wakeups["idle"] = measureWakeups( app, args.idleTime )
+
+        output = { "benchmark": "gui",
+                   "timestamp": time.strftime( "%Y-%m-%dT%H:%M:%S" ),
+                   "python": platform.python_version(),
+                   "platform": platform.platform(),
+                   "library": libraryStats,
+                   "windowSize": args.windowSize,
+                   "startupMs": startupTime * 1000.0,
+                   "results": runner.getResults(),
+                   "wakeups": wakeups,
+                   "libraryStatistics": window._audioLibrary.getStatistics(),
+                   "traces": CTracer.getTracer().getHistograms() }
+        window.close()
+
+    if args.output:
+        with open( args.output, "w" ) as fp:
+            json.dump( output, fp, indent=2 )
+    else:
+        print( json.dumps( output, indent=2 ) )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+#!/bin/python3
+# 
+# Copyright Florian Pfanner 2026
+#
+# This file is part of AudioPlayer.
+# 
+# AudioPlayer is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# AudioPlayer is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+# 
+# You should have received a copy of the GNU General Public License
+# along with AudioPlayer. If not, see <https://www.gnu.org/licenses/>.
+# 
+# 
+
+
+
+
+"""Benchmark of cover image decoding.
+
+A library with large cover images (JPEG and PNG) is generated. Each image is
+loaded through CAudioLibrary.getImage for the target sizes of the GUI, once
+like before with a full decode and scaling afterwards ("full") and once
+decoded directly at the target size ("scaled"). Each mode runs in its own
+process, the decode time, the size of the decoded images and the peak
+resident memory of the process are reported as json.
+"""
+
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import resource
+import tempfile
+import subprocess
+
+os.environ.setdefault( "QT_QPA_PLATFORM", "offscreen" )
+sys.path.insert( 0, os.path.join( os.path.dirname( os.path.abspath(__file__) ), "../src" ) )
+
+
+def createImages( path, numImages, width, height ):
+    """Write numImages albums with one JPEG and one PNG cover of given size
+    """
+    from PyQt5.QtGui import QImage
+    from PyQt5.QtGui import QPainter
+    from PyQt5.QtGui import QLinearGradient
+    from PyQt5.QtGui import QColor
+    from PyQt5.QtCore import Qt
+
+    for idx in range( numImages ):
+        image = QImage( width, height, QImage.Format_RGB32 )
+        painter = QPainter( image )
+        gradient = QLinearGradient( 0, 0, width, height )
+        gradient.setColorAt( 0, QColor.fromHsv( ( idx * 37 ) % 360, 200, 220 ) )
+        gradient.setColorAt( 1, QColor.fromHsv( ( idx * 37 + 180 ) % 360, 200, 80 ) )
+        painter.fillRect( 0, 0, width, height, gradient )
+        painter.setPen( Qt.white )
+        for circle in range( 0, min( width, height ) // 2, 40 ):
+            painter.drawEllipse( width // 2 - circle, height // 2 - circle, 2 * circle, 2 * circle )
+        painter.end()
+        albumPath = os.path.join( path, "album{:04d}".format( idx ) )
+        os.makedirs( albumPath )
+        open( os.path.join( albumPath, "track.mp3" ), "w" ).close()
+        image.save( os.path.join( albumPath, "cover.jpg" ), "JPEG", 90 )
+        image.save( os.path.join( albumPath, "cover.png" ), "PNG" )
+
+
+def runChild( args ):
+    """Decode all images of library with given mode and print results as json
+    """
+    from PyQt5.QtWidgets import QApplication
+    from PyQt5.QtCore import QSettings
+    from PyQt5.QtCore import QSize
+    from PyQt5.QtCore import Qt
+    import CAudioLibrary
+
+    app = QApplication( sys.argv )
+    settings = QSettings( os.path.join( args.child, "settings.ini" ), QSettings.IniFormat )
+    settings.setValue( "library/dirs", os.path.join( args.child, "library" ) )
+    settings.setValue( "library/imageExtension", [ "." + args.format ] )
+    settings.setValue( "library/imageCache", 0 )
+    settings.setValue( "library/progressiveScan", 0 )
+    library = CAudioLibrary.CAudioLibrary( settings, QSettings() )
+
+    target = QSize( args.target, args.target )
+    rssBefore = resource.getrusage( resource.RUSAGE_SELF ).ru_maxrss
+    times = []
+    for albumName in library.getAlbumList():
+        album = library.getAlbum( albumName )
+        startTime = time.perf_counter()
+        if args.mode == "full":
+            image = album.getImage( 0 ).scaled( target, Qt.KeepAspectRatio )
+        else:
+            image = album.getImage( 0, target )
+        times.append( time.perf_counter() - startTime )
+        if image.width() > args.target or image.height() > args.target:
+            raise Exception( "Image {} not scaled".format( albumName ) )
+    times.sort()
+    stats = library.getStatistics()
+    print( json.dumps( { "images": len( times ),
+                         "medianMs": times[len( times ) // 2] * 1000.0,
+                         "totalMs": sum( times ) * 1000.0,
+                         "decodedBytesPerImage": stats["imageDecodeBytes"] // max( 1, len( times ) ),
+                         "peakRssKb": resource.getrusage( resource.RUSAGE_SELF ).ru_maxrss,
+                         "peakRssIncreaseKb": resource.getrusage( resource.RUSAGE_SELF ).ru_maxrss - rssBefore } ) )
+
+
+def main():
+    parser = argparse.ArgumentParser( description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter )
+    parser.add_argument( "--images", type=int, default=20, help="Number of albums (covers) to decode" )
+    parser.add_argument( "--imageSize", default="4000x3000", help="Size of cover images" )
+    parser.add_argument( "--targets", default="70,600", help="Comma separated target sizes in pixel (70: group selector icon, 600: album view)" )
+    parser.add_argument( "--output", help="Write json result to this file instead of stdout" )
+    parser.add_argument( "--child", help=argparse.SUPPRESS )
+    parser.add_argument( "--mode", help=argparse.SUPPRESS )
+    parser.add_argument( "--format", help=argparse.SUPPRESS )
+    parser.add_argument( "--target", type=int, help=argparse.SUPPRESS )
+    args = parser.parse_args()
+
+    if args.child:
+        runChild( args )
+        return
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmpDir:
+        from PyQt5.QtGui import QGuiApplication
+        app = QGuiApplication( sys.argv )
+        width, height = [ int( v ) for v in args.imageSize.split( "x" ) ]
+        createImages( os.path.join( tmpDir, "library" ), args.images, width, height )
+
+        for imageFormat in [ "jpg", "png" ]:
+            for target in [ int( v ) for v in args.targets.split( "," ) ]:
+                for mode in [ "full", "scaled" ]:
+                    output = subprocess.check_output( [ sys.executable, os.path.abspath( __file__ ), "--child", tmpDir,
+                                                        "--mode", mode, "--format", imageFormat, "--target", str( target ) ] )
+                    results["{}_{}_{}".format( imageFormat, target, mode )] = json.loads( output.decode().strip().splitlines()[-1] )
+
+    output = { "benchmark": "image",
+               "timestamp": time.strftime( "%Y-%m-%dT%H:%M:%S" ),
+               "python": platform.python_version(),
+               "parameters": { "images": args.images, "imageSize": args.imageSize, "targets": args.targets },
+               "results": results }
+    if args.output:
+        with open( args.output, "w" ) as fp:
+            json.dump( output, fp, indent=2 )
+    else:
+        print( json.dumps( output, indent=2 ) )
+
+
+if __name__ == "__main__":
+    main()
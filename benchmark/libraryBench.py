@@ -0,0 +1,200 @@
+#!/bin/python3
+# 
+# Copyright Florian Pfanner 2026
+#
+# This file is part of AudioPlayer.
+# 
+# AudioPlayer is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# AudioPlayer is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+# 
+# You should have received a copy of the GNU General Public License
+# along with AudioPlayer. If not, see <https://www.gnu.org/licenses/>.
+# 
+# 
+
+
+
+"""Benchmark suite of CAudioLibrary.
+
+A synthetic library is generated in a temporary directory (see
+syntheticLibrary.py for the parameters). Scan, persisted load, save, tree
+comparison, sharing of unchanged subtrees, snapshot (album map) build, album
+lists of each order type and next/prev navigation are timed. Result is printed (or written with --output) as json,
+thus it can be compared between releases.
+"""
+
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import tempfile
+import weakref
+import gc
+import statistics
+
+sys.path.insert( 0, os.path.join( os.path.dirname( os.path.abspath(__file__) ), "../src" ) )
+
+from PyQt5.QtCore import QCoreApplication
+from PyQt5.QtCore import QSettings
+
+import CAudioLibrary
+import syntheticLibrary
+
+
+def measure( func, repeat ):
+    """Call func repeat times, return dictionary with timing statistics in ms
+    """
+    times = []
+    for i in range( repeat ):
+        startTime = time.perf_counter()
+        func()
+        times.append( ( time.perf_counter() - startTime ) * 1000.0 )
+    return { "minMs": min( times ),
+             "medianMs": statistics.median( times ),
+             "meanMs": statistics.mean( times ),
+             "repeat": repeat }
+
+
+def checkNewestIndex( library, tree ):
+    """Regression check of the newest index after a progressive scan: the snapshots
+    published during the scan hold an album map without tree, the final snapshot
+    derived from them must not contain any album twice. Raises exception on error
+    """
+    snapshot = library.getSnapshot()
+    albumMap = { albumName: snapshot.getAlbum( albumName ) for albumName in snapshot.getAlbumList() }
+    batchSnapshot = CAudioLibrary.CLibrarySnapshot( CAudioLibrary.CAudioDirectory( library, None ), albumMap )
+    finalSnapshot = CAudioLibrary.CLibrarySnapshot( tree, previous=batchSnapshot )
+    newest = finalSnapshot.getAlbumList( "newest" )
+    expected = list( reversed( finalSnapshot.getAlbumList( "date" ) ) )[0:len( newest )]
+    if len( set( newest ) ) != len( newest ) or len( newest ) != min( 100, len( albumMap ) ) or \
+       [ albumMap[name].getDate() for name in newest ] != [ albumMap[name].getDate() for name in expected ]:
+        raise Exception( "Newest index after progressive scan is inconsistent" )
+
+
+def checkTreesReleased( library, root, libraryPath ):
+    """Regression check of shareSubtrees: after two rescans with changes, each sharing
+    the unchanged subtrees of the tree before, the first tree must be released.
+    Raises exception on error
+    """
+    firstTree = library._scanRoot( root )
+    firstRef = weakref.ref( firstTree )
+    tree = firstTree
+    for i in range( 2 ):
+        os.makedirs( os.path.join( libraryPath, "Released {}".format( i ) ) )
+        open( os.path.join( libraryPath, "Released {}".format( i ), "01.mp3" ), "w" ).close()
+        newTree = library._scanRoot( root )
+        if newTree.shareSubtrees( tree ):
+            raise Exception( "Rescan did not detect changed tree" )
+        tree = newTree
+    del firstTree, newTree
+    gc.collect()
+    if firstRef() is not None:
+        raise Exception( "Tree is still referenced after two rescans with changes" )
+    for i in range( 2 ):
+        albumPath = os.path.join( libraryPath, "Released {}".format( i ) )
+        os.remove( os.path.join( albumPath, "01.mp3" ) )
+        os.rmdir( albumPath )
+
+
+def runBenchmarks( library, libraryPath, args ):
+    results = {}
+
+    root = library.getRoots()[0]
+    def scan():
+        return library._scanRoot( root )
+    results["scan"] = measure( scan, args.scanRepeat )
+    numEntries = sum( len( files ) + len( dirs ) for root, dirs, files in os.walk( libraryPath ) )
+    results["scan"]["entriesPerSecond"] = numEntries / ( results["scan"]["medianMs"] / 1000.0 )
+
+    tree = root.getTree()
+    checkNewestIndex( library, tree )
+    checkTreesReleased( library, root, libraryPath )
+    results["save"] = measure( lambda: library._saveAudioTree( root, tree ), args.repeat )
+
+    libraryFile = root.getCacheFile()
+    results["save"]["bytes"] = os.path.getsize( libraryFile )
+
+    def load():
+        return root.readTree( library )
+    results["load"] = measure( load, args.repeat )
+
+    otherTree = load()
+    results["compare"] = measure( lambda: tree != otherTree, args.repeat )
+
+    results["buildAlbumMap"] = measure( lambda: CAudioLibrary.CLibrarySnapshot( tree ), args.repeat )
+    sharedTree = load()
+    results["shareSubtrees"] = measure( lambda: sharedTree.shareSubtrees( tree ), args.repeat )
+
+    for orderType in [ "full", "date", "newest", "dir" ]:
+        results["getAlbumList_" + orderType] = measure( lambda: library.getAlbumList( orderType ), args.repeat )
+    results["getNewestAlbums"] = measure( lambda: library.getNewestAlbums( 20 ), args.repeat )
+
+    albums = library.getAlbumList()
+    step = max( 1, len( albums ) // args.navigations )
+    navAlbums = albums[::step][0:args.navigations]
+    for orderType in [ "full", "date" ]:
+        def navigate():
+            for album in navAlbums:
+                library.getNextAlbum( album, orderType )
+                library.getPrevAlbum( album, orderType )
+        res = measure( navigate, args.repeat )
+        res["perCallMs"] = res["medianMs"] / ( 2 * len( navAlbums ) )
+        results["navigation_" + orderType] = res
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser( description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter )
+    syntheticLibrary.addArguments( parser )
+    parser.add_argument( "--repeat", type=int, default=5, help="Number of repetitions of each measurement" )
+    parser.add_argument( "--scanRepeat", type=int, default=3, help="Number of repetitions of full scan" )
+    parser.add_argument( "--navigations", type=int, default=100, help="Number of albums used for next/prev navigation" )
+    parser.add_argument( "--fingerprintSize", type=int, default=16384, help="Setting library/fingerprintSize, 0 to measure scan without fingerprints" )
+    parser.add_argument( "--output", help="Write json result to this file instead of stdout" )
+    args = parser.parse_args()
+
+    app = QCoreApplication( sys.argv )
+
+    with tempfile.TemporaryDirectory() as tmpDir:
+        libraryPath = os.path.join( tmpDir, "library" )
+        startTime = time.perf_counter()
+        libraryStats = syntheticLibrary.createLibraryFromArgs( libraryPath, args )
+        generateTime = time.perf_counter() - startTime
+
+        settings = QSettings( os.path.join( tmpDir, "settings.ini" ), QSettings.IniFormat )
+        settings.setValue( "library/dirs", libraryPath )
+        settings.setValue( "library/cacheDir", os.path.join( tmpDir, "cache" ) )
+        settings.setValue( "library/imageCache", 1 )
+        settings.setValue( "library/progressiveScan", 0 )
+        settings.setValue( "library/fingerprintSize", args.fingerprintSize )
+        userData = QSettings( os.path.join( tmpDir, "userData.ini" ), QSettings.IniFormat )
+
+        library = CAudioLibrary.CAudioLibrary( settings, userData )
+        results = runBenchmarks( library, libraryPath, args )
+
+    output = { "benchmark": "library",
+               "timestamp": time.strftime( "%Y-%m-%dT%H:%M:%S" ),
+               "python": platform.python_version(),
+               "platform": platform.platform(),
+               "library": libraryStats,
+               "generateSeconds": generateTime,
+               "results": results }
+    if args.output:
+        with open( args.output, "w" ) as fp:
+            json.dump( output, fp, indent=2 )
+    else:
+        print( json.dumps( output, indent=2 ) )
+
+
+if __name__ == "__main__":
+    main()
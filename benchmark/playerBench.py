@@ -0,0 +1,134 @@
+#!/bin/python3
+# 
+# Copyright Florian Pfanner 2026
+#
+# This file is part of AudioPlayer.
+# 
+# AudioPlayer is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# AudioPlayer is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+# 
+# You should have received a copy of the GNU General Public License
+# along with AudioPlayer. If not, see <https://www.gnu.org/licenses/>.
+# 
+# 
+
+
+
+"""Headless benchmark of a long playback session with the simulated backend.
+
+A small temporary library is created, CGuiAudioPlayer runs with the simulated
+playback backend under Qt's offscreen platform. Albums are switched and the
+virtual clock is moved in steps of the GUI timer interval while the timer
+handler is called, thus hours of playback are processed in seconds. Result
+is printed as json.
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+
+os.environ.setdefault( "QT_QPA_PLATFORM", "offscreen" )
+sys.path.insert( 0, os.path.join( os.path.dirname( os.path.abspath(__file__) ), "../src" ) )
+
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtCore import QSettings
+
+import CAudioLibrary
+import CGuiAudioPlayer
+
+
+def percentile( values, p ):
+    values = sorted( values )
+    return values[ min( len( values ) - 1, int( len( values ) * p / 100 ) ) ]
+
+
+def timingStats( values ):
+    return { "count": len( values ),
+             "meanUs": sum( values ) / len( values ) * 1e6,
+             "p50Us": percentile( values, 50 ) * 1e6,
+             "p95Us": percentile( values, 95 ) * 1e6,
+             "maxUs": max( values ) * 1e6 }
+
+
+def main():
+    parser = argparse.ArgumentParser( description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter )
+    parser.add_argument( "--albums", type=int, default=50, help="Number of albums in library" )
+    parser.add_argument( "--tracks", type=int, default=10, help="Number of tracks per album" )
+    parser.add_argument( "--switches", type=int, default=200, help="Number of album switches" )
+    parser.add_argument( "--hours", type=float, default=10.0, help="Virtual playback time in h" )
+    parser.add_argument( "--trackLength", type=float, default=300.0, help="Length of each track in s" )
+    args = parser.parse_args()
+
+    app = QApplication( sys.argv )
+
+    with tempfile.TemporaryDirectory() as tmpDir:
+        libDir = os.path.join( tmpDir, "library" )
+        for albumIdx in range( args.albums ):
+            albumDir = os.path.join( libDir, "Album {:05d}".format( albumIdx ) )
+            os.makedirs( albumDir )
+            for trackIdx in range( args.tracks ):
+                open( os.path.join( albumDir, "{:03d}.mp3".format( trackIdx ) ), "w" ).close()
+
+        settings = QSettings( os.path.join( tmpDir, "settings.ini" ), QSettings.IniFormat )
+        settings.setValue( "library/dirs", libDir )
+        settings.setValue( "library/imageCache", 0 )
+        settings.setValue( "audioPlayer/backend", "simulated" )
+        settings.setValue( "audioPlayer/simulationSpeed", 0 )
+        settings.setValue( "audioPlayer/simulationTrackLength", args.trackLength )
+        userData = QSettings( os.path.join( tmpDir, "user", "userData.ini" ), QSettings.IniFormat )
+
+        library = CAudioLibrary.CAudioLibrary( settings, userData )
+        gui = CGuiAudioPlayer.CGuiAudioPlayer( library, settings, userData )
+        gui.initPlayer()         # player is created lazily after first paint
+        backend = gui._player.getBackend()
+        albums = library.getAlbumList()
+
+        switchTimes = []
+        for i in range( args.switches ):
+            startTime = time.perf_counter()
+            gui.playAlbum( albums[ i % len( albums ) ] )
+            switchTimes.append( time.perf_counter() - startTime )
+            backend.advance( 10.0 )
+
+        # long session, one timer tick per virtual second
+        gui.playAlbum( albums[0] )
+        tickTimes = []
+        trackChanges = []
+        backend.addEventHandler( lambda name, idx: trackChanges.append( idx ) if name == "trackChanged" else None )
+        tickInterval = gui._timer.interval() / 1000.0
+        sessionStart = time.perf_counter()
+        ticks = int( args.hours * 3600 / tickInterval )
+        for i in range( ticks ):
+            backend.advance( tickInterval )
+            startTime = time.perf_counter()
+            gui._handleTimer()
+            tickTimes.append( time.perf_counter() - startTime )
+            if backend.isStopped():
+                gui.playAlbum( albums[ ( i // 1000 ) % len( albums ) ] )
+        sessionTime = time.perf_counter() - sessionStart
+        gui.flush()
+
+        result = { "albums": args.albums,
+                   "tracksPerAlbum": args.tracks,
+                   "albumSwitch": timingStats( switchTimes ),
+                   "timerTick": timingStats( tickTimes ),
+                   "virtualSeconds": backend.getVirtualTime(),
+                   "wallSeconds": sessionTime,
+                   "speedup": backend.getVirtualTime() / sessionTime,
+                   "trackChanges": len( trackChanges ),
+                   "resumeWrites": gui._resumeStore.getWriteCount() if gui._resumeStore is not None else 0 }
+        print( json.dumps( result, indent=2 ) )
+
+
+if __name__ == "__main__":
+    main()
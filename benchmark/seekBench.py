@@ -0,0 +1,150 @@
+#!/bin/python3
+#
+# Copyright Florian Pfanner 2026
+#
+# This file is part of AudioPlayer.
+#
+# AudioPlayer is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# AudioPlayer is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with AudioPlayer. If not, see <https://www.gnu.org/licenses/>.
+#
+#
+
+"""Benchmark of seek accuracy and latency with and without CSeekIndex.
+
+A synthetic VBR MP3 stream without TOC is generated (silence and speech
+segments with different bitrates). For random target times the byte offset
+is calculated by the seek index and by the byte ratio guess a player does
+without TOC. The real time at the resulting offset is compared with the
+target time. Result is printed as json.
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import bisect
+import argparse
+import tempfile
+
+sys.path.insert( 0, os.path.join( os.path.dirname( os.path.abspath(__file__) ), "../src" ) )
+
+import CSeekIndex
+
+
+_BITRATE_IDX = { 32: 1, 64: 5, 96: 7, 128: 9, 160: 10, 192: 11 }
+
+
+def createVbrFile( path, length, seed ):
+    """Write MPEG1 layer III frames (44.1 kHz) with varying bitrate to path.
+    Return list with (time, offset) of each frame
+    """
+    rnd = random.Random( seed )
+    frames = []
+    curTime = 0.0
+    offset = 0
+    with open( path, "wb" ) as fp:
+        while curTime < length:
+            bitrate = rnd.choice( [ 32, 32, 64 ] ) if rnd.random() < 0.3 else rnd.choice( [ 96, 128, 160, 192 ] )
+            segmentFrames = rnd.randint( 40, 400 )
+            for i in range( segmentFrames ):
+                frameLength = 144 * bitrate * 1000 // 44100
+                header = bytes( [ 0xFF, 0xFB, _BITRATE_IDX[bitrate] << 4, 0x44 ] )
+                fp.write( header + bytes( frameLength - 4 ) )
+                frames.append( ( curTime, offset ) )
+                curTime += 1152 / 44100
+                offset += frameLength
+    return frames
+
+
+def timeOfOffset( frames, offsets, offset ):
+    """Return start time of the frame containing offset (this is where a decoder resyncs)
+    """
+    idx = max( 0, bisect.bisect_right( offsets, offset ) - 1 )
+    return frames[idx][0]
+
+
+def percentile( values, p ):
+    values = sorted( values )
+    return values[ min( len( values ) - 1, int( len( values ) * p / 100 ) ) ]
+
+
+def errorStats( errors ):
+    return { "mean": sum( errors ) / len( errors ),
+             "p50": percentile( errors, 50 ),
+             "p95": percentile( errors, 95 ),
+             "max": max( errors ) }
+
+
+def main():
+    parser = argparse.ArgumentParser( description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter )
+    parser.add_argument( "--length", type=float, default=3600.0, help="Length of track in s" )
+    parser.add_argument( "--seeks", type=int, default=1000, help="Number of random seeks" )
+    parser.add_argument( "--interval", type=float, default=1.0, help="Interval of seek index in s" )
+    parser.add_argument( "--seed", type=int, default=1 )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpDir:
+        path = os.path.join( tmpDir, "track.mp3" )
+        frames = createVbrFile( path, args.length, args.seed )
+        fileSize = os.path.getsize( path )
+        length = len( frames ) * 1152 / 44100
+
+        startTime = time.perf_counter()
+        index = CSeekIndex.CSeekIndex( args.interval )
+        index.build( path )
+        buildTime = time.perf_counter() - startTime
+
+        startTime = time.perf_counter()
+        loaded = CSeekIndex.CSeekIndex()
+        loaded.fromDict( json.loads( json.dumps( index.toDict() ) ) )
+        loadTime = time.perf_counter() - startTime
+
+        # length guess of a player without TOC, based on bitrate of first frame
+        firstFrameBitrate = ( frames[1][1] - frames[0][1] ) * 8 * 44100 / 1152
+        guessedLength = fileSize * 8 / firstFrameBitrate
+
+        rnd = random.Random( args.seed + 1 )
+        targets = [ rnd.uniform( 0, length ) for i in range( args.seeks ) ]
+
+        frameOffsets = [ f[1] for f in frames ]
+        errIndex = []
+        errRatio = []
+        errBitrate = []
+        startTime = time.perf_counter()
+        offsets = [ loaded.getOffset( t ) for t in targets ]
+        lookupTime = ( time.perf_counter() - startTime ) / len( targets )
+
+        for target, offset in zip( targets, offsets ):
+            errIndex.append( abs( timeOfOffset( frames, frameOffsets, offset ) - target ) )
+            errRatio.append( abs( timeOfOffset( frames, frameOffsets, int( target / length * fileSize ) ) - target ) )
+            errBitrate.append( abs( timeOfOffset( frames, frameOffsets, int( min( 1.0, target / guessedLength ) * fileSize ) ) - target ) )
+
+        result = { "trackLength": length,
+                   "fileSize": fileSize,
+                   "frames": len( frames ),
+                   "interval": args.interval,
+                   "indexEntries": len( index.toDict()["times"] ),
+                   "indexLength": index.getLength(),
+                   "indexJsonBytes": len( json.dumps( index.toDict() ) ),
+                   "buildTime": buildTime,
+                   "loadTime": loadTime,
+                   "lookupTimeUs": lookupTime * 1e6,
+                   "seekErrorIndex": errorStats( errIndex ),
+                   "seekErrorByteRatio": errorStats( errRatio ),
+                   "seekErrorFirstFrameBitrate": errorStats( errBitrate ) }
+        print( json.dumps( result, indent=2 ) )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+#!/bin/python3
+# 
+# Copyright Florian Pfanner 2026
+#
+# This file is part of AudioPlayer.
+# 
+# AudioPlayer is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# AudioPlayer is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+# 
+# You should have received a copy of the GNU General Public License
+# along with AudioPlayer. If not, see <https://www.gnu.org/licenses/>.
+# 
+# 
+
+
+
+"""Generator of synthetic audio libraries for benchmarks.
+
+Creates a directory tree with group directories of given depth, album
+directories with (empty or sized) mp3 files and small PNG cover images.
+Directory dates are spread over one year, thus date ordering is meaningful.
+Can be used as module (createLibrary) or from command line.
+"""
+
+import os
+import json
+import zlib
+import struct
+import random
+import argparse
+
+
+def createPng( width, height, color ):
+    """Return bytes of a PNG image with one color
+    """
+    def chunk( chunkType, data ):
+        crc = zlib.crc32( chunkType + data ) & 0xFFFFFFFF
+        return struct.pack( ">I", len( data ) ) + chunkType + data + struct.pack( ">I", crc )
+
+    row = b"\x00" + bytes( color ) * width
+    header = struct.pack( ">IIBBBBB", width, height, 8, 2, 0, 0, 0 )
+    return b"\x89PNG\r\n\x1a\n" + chunk( b"IHDR", header ) + chunk( b"IDAT", zlib.compress( row * height ) ) + chunk( b"IEND", b"" )
+
+
+def createLibrary( path, albums=1000, depth=2, dirsPerLevel=10, filesPerAlbum=10, imagesPerAlbum=1,
+                   imageSize=64, fileSize=0, seed=1 ):
+    """Create synthetic library below path.
+    :param albums:          Number of album directories
+    :param depth:           Number of group directory levels above the albums
+    :param dirsPerLevel:    Number of group directories per level
+    :param filesPerAlbum:   Number of mp3 files per album
+    :param imagesPerAlbum:  Number of PNG images per album
+    :param imageSize:       Width and height of images in pixel
+    :param fileSize:        Size of each mp3 file in bytes (sparse file)
+    Return dictionary with statistics of created library
+    """
+    rnd = random.Random( seed )
+    now = 1700000000
+    numDirs = 0
+    numFiles = 0
+    numImages = 0
+
+    for albumIdx in range( albums ):
+        groupPath = path
+        for level in range( depth ):
+            groupIdx = rnd.randrange( dirsPerLevel )
+            groupPath = os.path.join( groupPath, "Group {} {:03d}".format( level, groupIdx ) )
+        albumPath = os.path.join( groupPath, "Album {:06d}".format( albumIdx ) )
+        os.makedirs( albumPath )
+        numDirs += 1
+
+        for fileIdx in range( filesPerAlbum ):
+            with open( os.path.join( albumPath, "Kapitel {}.mp3".format( fileIdx + 1 ) ), "wb" ) as fp:
+                if fileSize > 0:
+                    fp.truncate( fileSize )
+            numFiles += 1
+
+        for imageIdx in range( imagesPerAlbum ):
+            color = ( rnd.randrange( 256 ), rnd.randrange( 256 ), rnd.randrange( 256 ) )
+            with open( os.path.join( albumPath, "cover{}.png".format( imageIdx ) ), "wb" ) as fp:
+                fp.write( createPng( imageSize, imageSize, color ) )
+            numImages += 1
+
+        albumDate = now - rnd.randrange( 365 * 24 * 3600 )
+        os.utime( albumPath, ( albumDate, albumDate ) )
+
+    return { "albums": albums,
+             "depth": depth,
+             "dirsPerLevel": dirsPerLevel,
+             "filesPerAlbum": filesPerAlbum,
+             "imagesPerAlbum": imagesPerAlbum,
+             "files": numFiles,
+             "images": numImages }
+
+
+def addArguments( parser ):
+    """Add arguments of createLibrary to given argparse parser
+    """
+    parser.add_argument( "--albums", type=int, default=1000, help="Number of albums" )
+    parser.add_argument( "--depth", type=int, default=2, help="Number of group directory levels" )
+    parser.add_argument( "--dirsPerLevel", type=int, default=10, help="Number of group directories per level" )
+    parser.add_argument( "--filesPerAlbum", type=int, default=10, help="Number of mp3 files per album" )
+    parser.add_argument( "--imagesPerAlbum", type=int, default=1, help="Number of images per album" )
+    parser.add_argument( "--imageSize", type=int, default=64, help="Width and height of images in pixel" )
+    parser.add_argument( "--fileSize", type=int, default=0, help="Size of mp3 files in bytes" )
+    parser.add_argument( "--seed", type=int, default=1 )
+
+
+def createLibraryFromArgs( path, args ):
+    return createLibrary( path, args.albums, args.depth, args.dirsPerLevel, args.filesPerAlbum,
+                          args.imagesPerAlbum, args.imageSize, args.fileSize, args.seed )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser( description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter )
+    parser.add_argument( "path", help="Directory to create library in" )
+    addArguments( parser )
+    args = parser.parse_args()
+    print( json.dumps( createLibraryFromArgs( args.path, args ), indent=2 ) )
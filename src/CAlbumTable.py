@@ -0,0 +1,159 @@
+#!/bin/python3
+# 
+# Copyright Florian Pfanner 2026
+#
+# This file is part of AudioPlayer.
+# 
+# AudioPlayer is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# AudioPlayer is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+# 
+# You should have received a copy of the GNU General Public License
+# along with AudioPlayer. If not, see <https://www.gnu.org/licenses/>.
+# 
+# 
+
+
+
+import numpy
+
+
+
+class CAlbumTable:
+    """Columnar table of all albums of a CLibrarySnapshot. Each album is one row, its
+    attributes are stored in NumPy arrays, thus ordering, filtering and top N queries
+    are vectorized and return arrays of row indices instead of walking album objects.
+    The table is build once per snapshot and never changed afterwards. Needs NumPy,
+    see setting library/albumTable.
+    """
+
+    def __init__( self, albumMap ):
+        """
+        :param albumMap:    Album name and CAudioAlbum object
+        """
+        names = list( albumMap )
+        albums = [ albumMap[name] for name in names ]
+        self._names = names
+        self._rowOfName = None              # album name and row, created on first use
+
+        rootNames = {}
+        parentNames = {}
+        parentRows = {}                     # id of parent directory object and ( root id, parent id )
+        rootIds = []
+        parentIds = []
+        for album in albums:
+            parentDir = album.getParentDir()
+            ids = parentRows.get( id( parentDir ) )
+            if ids is None:
+                ids = ( rootNames.setdefault( album.getRootName(), len( rootNames ) ),
+                        parentNames.setdefault( parentDir.getName() if parentDir is not None else "", len( parentNames ) ) )
+                parentRows[id( parentDir )] = ids
+            rootIds.append( ids[0] )
+            parentIds.append( ids[1] )
+        self._rootIds = rootNames                               # root name and id
+        self._parentIds = parentNames                           # parent directory name and id
+
+        self.dates = numpy.array( [ album.getDate() or 0.0 for album in albums ], dtype=numpy.float64 )
+        self.numTracks = numpy.array( [ album.getNumAudioFiles() for album in albums ], dtype=numpy.int32 )
+        self.sizes = numpy.array( [ album.getSize() or 0 for album in albums ], dtype=numpy.int64 )
+        self.roots = numpy.array( rootIds, dtype=numpy.int32 )
+        self.parents = numpy.array( parentIds, dtype=numpy.int32 )
+
+        # rank of sort key, ties are resolved by album name like CLibrarySnapshot.getAlbumList. Keys
+        # are strings, they are sorted once here and only the integer ranks are used by queries
+        sortKeys = [ ( album.getSortKey() or "", name ) for album, name in zip( albums, names ) ]
+        self.sortRanks = numpy.empty( len( names ), dtype=numpy.int32 )
+        self.sortRanks[sorted( range( len( names ) ), key=sortKeys.__getitem__ )] = numpy.arange( len( names ), dtype=numpy.int32 )
+
+        self._orders = {}                   # order type and row indices, created on first use
+
+
+    def __len__( self ):
+        return len( self._names )
+
+
+    def getName( self, row ):
+        return self._names[row]
+
+    def getNames( self, rows ):
+        """Return list with album names of given row indices
+        """
+        names = self._names
+        return [ names[row] for row in rows.tolist() ]
+
+    def getRow( self, albumName ):
+        """Return row of album, None if not in table
+        """
+        if self._rowOfName is None:
+            self._rowOfName = { name: row for row, name in enumerate( self._names ) }
+        return self._rowOfName.get( albumName )
+
+    def getRootId( self, rootName ):
+        """Return id of root in column roots, None if no album of root is available
+        """
+        return self._rootIds.get( rootName )
+
+    def getParentId( self, directoryName ):
+        """Return id of parent directory in column parents, None if not available
+        """
+        return self._parentIds.get( directoryName )
+
+
+    def order( self, type="full" ):
+        """Return row indices of all albums sorted by type
+        :param type:    "full": sort key, "date": ascending date (ties by sort key)
+        """
+        if type not in self._orders:
+            if "full" == type:
+                rows = numpy.argsort( self.sortRanks, kind="stable" )
+            elif "date" == type:
+                rows = numpy.lexsort( ( self.sortRanks, self.dates ) )
+            else:
+                raise Exception( "Order type/method {} not implemented yet".format( type ) )
+            self._orders[type] = rows
+        return self._orders[type]
+
+
+    def filter( self, root=None, dateFrom=None, dateTo=None, minTracks=None, parent=None, type="full" ):
+        """Return row indices of albums matching all given conditions, sorted by type
+        :param root:        Name of root, see CLibraryRoot.getName
+        :param dateFrom:    Minimum date (timestamp, inclusive)
+        :param dateTo:      Maximum date (timestamp, exclusive)
+        :param minTracks:   Minimum number of audio files
+        :param parent:      Name of parent directory, see CAudioDirectory.getName
+        """
+        mask = numpy.ones( len( self._names ), dtype=bool )
+        if root is not None:
+            mask &= self.roots == ( -1 if self.getRootId( root ) is None else self.getRootId( root ) )
+        if parent is not None:
+            mask &= self.parents == ( -1 if self.getParentId( parent ) is None else self.getParentId( parent ) )
+        if dateFrom is not None:
+            mask &= self.dates >= dateFrom
+        if dateTo is not None:
+            mask &= self.dates < dateTo
+        if minTracks is not None:
+            mask &= self.numTracks >= minTracks
+        rows = self.order( type )
+        return rows[mask[rows]]
+
+
+    def newest( self, count, rows=None ):
+        """Return row indices of the count newest albums, newest first (reverse of order
+        "date"). Only the top count rows are sorted
+        :param rows:    Row indices to select from, e.g. result of filter. All if None
+        """
+        dates = self.dates if rows is None else self.dates[rows]
+        if count <= 0 or len( dates ) == 0:
+            return numpy.empty( 0, dtype=numpy.intp )
+        if count < len( dates ):
+            top = numpy.argpartition( -dates, count - 1 )[0:count]
+        else:
+            top = numpy.arange( len( dates ) )
+        top = top[numpy.lexsort( ( -self.sortRanks[top if rows is None else rows[top]], -dates[top] ) )]     # reverse of order "date"
+        return top if rows is None else rows[top]
@@ -23,348 +23,203 @@
 import os
 import sys
 import logging
-import json
-import pathlib
 import shutil
 import threading
 import time
-import shutil
+import functools
+
+import CSeekIndex
+import CScanWorker
+import CLibraryIndex
+import CImageCache
+import CScheduler
+import CLibraryService
+
+# tree classes are Qt free, see CLibraryIndex. Also available here for existing users
+from CLibraryIndex import getCacheDirectory, CScanContext, CAudioAlbum, CAudioDirectory, CLibrarySnapshot, CLibraryRoot
 
 from PyQt5.QtCore import QObject
-from PyQt5.QtCore import QTimer
+from PyQt5.QtCore import QCoreApplication
 from PyQt5.Qt import QPixmap
+from PyQt5.QtGui import QImageReader
+from PyQt5.QtCore import Qt
 from PyQt5.QtCore import pyqtSignal
 
 
 
-class CAudioAlbum:
-    """Represents one directory with audio files and an optional image"""
-
-    def __init__( self, directoryPath, audioLibraryObj, parentDir ):
-        self._path = directoryPath
-        self._libObj = audioLibraryObj
-        self._parentDir = parentDir         # parent CAudioDirectory object
-        self._imageFiles = []
-        self._audioFiles = []
-        self._directoryDate = None
-
-        if directoryPath is not None:
-            self._searchDirectory( self._libObj.getAudioExtensions(), self._libObj.getImageExtensions() )
-
-
-    def __eq__( self, other ):
-        return self._path == other._path and \
-               self._imageFiles == other._imageFiles and    \
-               self._audioFiles == other._audioFiles and    \
-               self._directoryDate == other._directoryDate
-
-    def __ne__( self, other ):
-        return not ( self == other )
-
-
-    def _searchDirectory( self, audioExtensions, imageExtensions ):
-        """Search in own path for audio files and image
-        """
-        logging.debug( "Search in directory {} for album files".format( self._path ) )
-        for entry in os.listdir( self._path ):
-            entryPathName = os.path.join( self._path, entry )
-            if not entry.startswith('.') and os.path.isfile( entryPathName ):
-                logging.debug( "  Found file {}".format( entry ) )
-                extension = os.path.splitext( entry )[1]
-                if extension in audioExtensions:
-                    self._audioFiles.append( entryPathName )
-                elif extension in imageExtensions:
-                    self._imageFiles.append( entryPathName )
-        self._imageFiles.sort()
-        self._audioFiles.sort()
-
-        statData = os.stat( self._path )
-        self._directoryDate = statData.st_mtime
-
-        logging.debug( " Found {} file(s) and {} image(s)".format( len( self._audioFiles ), len( self._imageFiles ) ) )
-
-
-    def toDict( self ):
-        return { "type": "CAudioAlbum",
-                 "path": self._path,
-                 "imageFiles": self._imageFiles,
-                 "audioFiles": self._audioFiles,
-                 "directoryDate": self._directoryDate }
-
-    def fromDict( self, data ):
-        if data["type"] != "CAudioAlbum":
-            raise Exception( "Wrong type {}".format( str( data ) ) )
-        self._path = data["path"]
-        self._imageFiles = data["imageFiles"]
-        self._audioFiles = data["audioFiles"]
-        self._directoryDate = data["directoryDate"]
-
-
-    def getNumAudioFiles( self ):
-        """Return number of audio files in this album
-        """
-        return len( self._audioFiles )
-
-    def getAudioFiles( self ):
-        """Return list with audio files of this album
-        """
-        return self._audioFiles
-
-    def getImageFiles( self ):
-        """Return list with all image files of this album
-        """
-        return self._imageFiles
-
-
-    def getImage( self, idx=0, size=None ):
-        """Return image object of this album. Return None in case image is not
-        available or error during load.
-        """
-        res = None
-        if idx < len( self._imageFiles ):
-            res = self._libObj.getImage( self._imageFiles[idx] )
-        return res
-
-
-
-    def getNumImageFiles( self ):
-        """Return number of image files in this album
-        """
-        return len( self._imageFiles )
-
-    def getPath( self ):
-        """Return path to this directory
-        """
-        return self._path
-
-    def getName( self ):
-        """Return name of this object derived from path
-        """
-        return self._path.replace( " ", "" ).replace( "/", "" )
-
-    def getDisplayName( self ):
-        """Return last directory part which might be shown in case no picture is available
-        """
-        return os.path.basename( self._path )
-
-    def getDate( self ):
-        """Return create timestamp of directory
-        """
-        return self._directoryDate
-
-
+class CAudioLibrary( QObject ):
 
-class CAudioDirectory:
-    """Represents one directory with at least one other audio directory or album directory
+    contentChanged = pyqtSignal()
+    """Signal emitted after audio library changed. All clients saved at least parts of the
+    audio library have to load the changed library data again
     """
 
-    def __init__( self, audioLibraryObj, parentDir ):
-        self._libObj = audioLibraryObj
-        self._parentDir = parentDir         # parent CAudioDirectory or None in case of root
-        self._childs = {}
-        self._imageFiles = []
-        if parentDir is not None:
-            self._name = parentDir.getName() + "/"
-        else:
-            self._name = "root/"
-
-
-    def __eq__( self, other ):
-        if self._imageFiles != other._imageFiles:
-            return False
-
-        myChildList = list( self._childs )
-        myChildList.sort()
-        otherChildList = list( other._childs )
-        otherChildList.sort()
-        if myChildList != otherChildList:
-            return False
-
-        for child in myChildList:
-            if self._childs[child] != other._childs[child]:
-                return False
-
-        return True
-
-
-    def __ne__( self, other ):
-        return not ( self == other )
-
-
-    def toDict( self ):
-        childsData = []
-        for child in self._childs:
-            childsData.append( self._childs[child].toDict() )
-        return { "type": "CAudioDirectory",
-                "name": self._name,
-                "imageFiles": self._imageFiles,
-                "childs": childsData }
-
-    def fromDict( self, data ):
-        if data["type"] != "CAudioDirectory":
-            raise Exception( "Invalid type: {}".format( str( data ) ) )
-        self._name = data["name"]
-        self._imageFiles = data["imageFiles"]
-        self._childs.clear()
-        for childData in data["childs"]:
-            if childData["type"] == "CAudioDirectory":
-                child = CAudioDirectory( self._libObj, self )
-            else:
-                child = CAudioAlbum( None, self._libObj, self )
-            child.fromDict( childData )
-            logging.debug( "Restored {}: {}".format( str( child ), child.getName() ) )
-            self._childs[child.getName()] = child
-
-
-    def addPath( self, path, splash, delay=False ):
-        if self._name.endswith( "/" ):
-            self._name += os.path.basename( path )
-        self._searchDirectory( self._libObj.getImageExtensions(), path, splash, delay )
-
-    def getNumChilds( self ):
-        """Return number of child directories
-        """
-        return len( self._childs )
-
-    def getChildList( self ):
-        """Return list with name of child elements
-        """
-        res = list( self._childs )
-        res.sort()
-        return res
-
-    def getChild( self, childName ):
-        """Return one child item
-        """
-        assert childName in self._childs
-        return self._childs[childName]
-
-    def _searchDirectory( self, imageExtensions, path, splash, delay ):
-        """Search in own path for albums or other directories
-        """
-        logging.debug( "Search in directory {} for directories or albums".format( path ) )
-        for entry in os.listdir( path ):
-            entryPathName = os.path.join( path, entry )
-            if not entry.startswith( '.' ) and os.path.isdir( entryPathName ):
-                logging.debug( "  Found directory {}".format( entry ) )
-                if splash is not None:
-                    splash.showMessage( self._libObj.tr( "Search in directory {} for audio files" ).format( entry ) )
-                albumObj = CAudioAlbum( entryPathName, self._libObj, self )
-                if albumObj.getNumAudioFiles() > 0:
-                    # found album, append to my list
-                    self._childs[albumObj.getName()] = albumObj
-                else:
-                    # no album, try directory
-                    del albumObj
-                    dirObj = CAudioDirectory( self._libObj, self )
-                    dirObj.addPath( entryPathName, splash, delay )
-                    if dirObj.getNumChilds() > 0:
-                        # found directory with at least one album, append to my list
-                        self._childs[dirObj.getName()] = dirObj
-                    else:
-                        # nothing found
-                        del dirObj
-                        logging.debug( " No content in directory {}".format( entryPathName ) )
-            elif not entry.startswith( "." ) and os.path.isfile( entryPathName ):
-                # also look for image files
-                extension = os.path.splitext( entry )[1]
-                if extension in imageExtensions:
-                    self._imageFiles.append( entryPathName )
-            if delay is not None:
-                time.sleep( 0.010 )         # short sleep to allow other threads to continue and to reduce CPU load
-
-        self._imageFiles.sort()
-
-
-    def getName( self ):
-        """Return name of this directory derived from tree and path
-        """
-        return self._name
-
-
-    def getFirstAlbumName( self ):
-        """Return first album found in my list. If first entry is a
-        directory, forward call to this object
-        """
-        childNames = self.getChildList()
-        child = self.getChild( childNames[0] )
-        if isinstance( child, CAudioDirectory ):
-            return child.getFirstAlbumName()
-        return child.getName()
+    scanProgress = pyqtSignal( int, int )
+    """Signal emitted during refresh with number of directories done and found so far
+    """
 
+    scanFinished = pyqtSignal( bool )
+    """Signal emitted after refresh is done, argument is True if content changed
+    """
 
+    scanError = pyqtSignal( str )
+    """Signal emitted in case refresh failed
+    """
 
-class CAudioLibrary( QObject ):
+    albumsAdded = pyqtSignal( list )
+    """Signal emitted during progressive scan with the names of albums found since
+    last emit. contentChanged is emitted after scan is done.
+    """
 
-    contentChanged = pyqtSignal()
-    """Signal emitted after audio library changed. All clients saved at least parts of the
-    audio library have to load the changed library data again
+    albumsMoved = pyqtSignal( list )
+    """Signal emitted before contentChanged with tuples (old name, new name) of albums
+    which were renamed or moved (detected by fingerprint). Cached images and seek index
+    are already taken over, clients keeping album names should update them
     """
 
+    _serviceUpdate = pyqtSignal( object )       # trees received from library service, emitted by subscription thread
+
     def __init__( self, settings, userData, parent=None, splash=None ):
         super().__init__( parent )
 
         self._settings = settings
         self._userData = userData
 
-        self._directoryList = self._settings.value( "library/dirs" )
-        self._audioExtensions = self._settings.value( "library/audioExtension", [ ".mp3" ] )
-        self._imageExtensions = self._settings.value( "library/imageExtension", [ ".png", ".jpg" ] )
-        self._cacheUpdateTime = int( self._settings.value( "library/updateCache", 600 ) )
-        if isinstance( self._directoryList, str ):
-            self._directoryList = [ self._directoryList ]
-        if isinstance( self._audioExtensions, str ):
-            self._audioExtensions = [ self._audioExtensions ]
-        if isinstance( self._imageExtensions, str ):
-            self._imageExtensions = [ self._imageExtensions ]
+        self._directoryList = CLibraryIndex.getListSetting( self._settings, "library/dirs", [] )
+        self._audioExtensions = CLibraryIndex.getListSetting( self._settings, "library/audioExtension", [ ".mp3" ] )
+        self._imageExtensions = CLibraryIndex.getListSetting( self._settings, "library/imageExtension", [ ".png", ".jpg" ] )
 
         logging.debug( "CAudioLibrary: {}, {}, {}".format( self._directoryList, self._audioExtensions, self._imageExtensions ) )
 
         if int( self._settings.value( "library/imageCache", True ) ):
-            self._cacheDir = os.path.join( pathlib.Path.home(), ".cache", "AudioPlayer" )
-            self._cacheImgDir = os.path.join( self._cacheDir, "img" )
+            self._cacheDir = getCacheDirectory( self._settings )
             logging.debug( "Cache dir: {}".format( self._cacheDir ) )
-            os.makedirs( self._cacheImgDir, exist_ok=True )
         else:
             self._cacheDir = None
             logging.debug( "Image cache disabled" )
 
-        self._cacheWorker = {}                                  # Data exchange between cache update worker and this object
-
-        self._audioTree = CAudioDirectory( self, None )         # Tree with all albums found
-        self._albumMap = {}                                     # Dictionary with album name and album object
-
+        self._seekIndex = None
+        if self._cacheDir is not None and int( self._settings.value( "library/seekIndex", 0 ) ):
+            self._seekIndex = CSeekIndex.CSeekIndexStore( os.path.join( self._cacheDir, "seekindex.json" ),
+                                                          float( self._settings.value( "library/seekIndexInterval", 1.0 ) ) )
+
+        self._progressiveScan = None                            # Data exchange with progressive scan worker, None if not running
+        self._scanTimer = None                                  # job of _processProgressiveScan
+        self._statisticsLock = threading.Lock()                 # scan counters are updated by several scan threads
+        self._statistics = { "imageDecodes": 0,                 # Counters for benchmarks and monitoring
+                             "imageDecodeTime": 0.0,
+                             "imageDecodeBytes": 0,           # size of decoded images
+                             "imageCacheHits": 0,
+                             "imageCacheMisses": 0,
+                             "imageCacheFiles": 0,
+                             "imageCacheBytes": 0,
+                             "scans": 0,
+                             "scanFailures": 0,
+                             "scanEntries": 0,
+                             "scanDirectoryFailures": 0,
+                             "lastScanDuration": 0.0,
+                             "lastScanEntriesPerSecond": 0.0,
+                             "cacheCycles": 0,
+                             "cacheChanges": 0,
+                             "albumMoves": 0,
+                             "albums": 0,
+                             "staleAlbums": 0,
+                             "directories": 0 }
+
+        self._newestSize = int( self._settings.value( "library/newestIndexSize", 100 ) )
+        self._fingerprintSize = int( self._settings.value( "library/fingerprintSize", 16384 ) )
+        self._albumTable = CLibraryIndex.isAlbumTableEnabled( self._settings )
+        self._snapshot = CLibrarySnapshot( CAudioDirectory( self, None ) )    # Current state, only replaced as a whole
+
+        self._roots = CLibraryIndex.createRoots( self._settings, self._cacheDir )   # CLibraryRoot object of each directory
+        self._imageCache = None
         if self._cacheDir is not None:
+            self._imageCache = CImageCache.CImageCache( os.path.join( self._cacheDir, "img" ),
+                                                        { root.getPath(): root.getName() for root in self._roots } )
+        for root in self._roots:
+            root.setTimer( CScheduler.getScheduler().addJob( "libraryRefresh/" + root.getName(),
+                                                             functools.partial( self._startRootScan, root ), 0, True ) )
+
+        self._service = None                                    # CLibraryClient in case library is served by a separate process
+        self._serviceGenerations = {}                           # root name and generation of tree received from service
+        serviceSocket = self._settings.value( "library/serviceSocket", "" )
+        if serviceSocket:
+            self._service = CLibraryService.CLibraryClient( serviceSocket )
             try:
-                logging.info( "Try to load previous state" )
-                with open( os.path.join( self._cacheDir, "library.json" ), "r" ) as fp:
-                    jsonData = json.load( fp )
-                    self._audioTree.fromDict( jsonData )
-                    logging.info( "Successfully loaded previous state" )
+                trees = self._fetchServiceTrees()
+                if not trees:
+                    raise Exception( "no tree available so far" )
+                self._setServiceTrees( trees )
+                self._serviceUpdate.connect( self._processServiceUpdate )
+                logging.info( "Library served by service {}".format( serviceSocket ) )
             except Exception as e:
-                logging.exception( "Error load previous state" )
-
-        if self._audioTree.getNumChilds() <= 0:
+                logging.warning( "Library service {} not available, use library in process: {}".format( serviceSocket, e ) )
+                self._service.close()
+                self._service = None
+
+        if self._service is None:
+            for root in self._roots:
+                root.load( self )
+
+        if any( root.getTree() is not None for root in self._roots ):
+            # build up flat list, needed for search next / previous. Roots not loaded are scanned in background
+            self._publishSnapshot( self._buildSnapshot() )
+        elif int( self._settings.value( "library/progressiveScan", 1 ) ):
+            # No data available so far, scan in background and continue as soon as first album is found
+            self._startProgressiveScan( splash )
+        else:
             # No data available so far, try to read directories and save directories read
-            self._createAudioTree( self._audioTree, splash )
-            self._saveAudioTree( self._audioTree )
-
-        # build up flat list, needed for search next / previous
-        self._buildAlbumMap( self._audioTree )
-        logging.info( "Found {} ({}) albums".format( len( self._albumMap ), self._audioTree.getNumChilds() ) )
-        if len( self._albumMap ) <= 0:
+            for root in self._roots:
+                try:
+                    tree = self._scanRoot( root, splash )
+                except Exception:
+                    logging.exception( "Error scan {}".format( root.getPath() ) )
+                    continue
+                self._saveAudioTree( root, tree )
+                root.setTree( tree )
+            self._publishSnapshot( self._buildSnapshot() )
+
+        snapshot = self._snapshot
+        logging.info( "Found {} ({}) albums".format( snapshot.getNumAlbums(), snapshot.getTree().getNumChilds() ) )
+        if snapshot.getNumAlbums() <= 0:
             raise Exception( "No album found. Could not start" )
 
-        self._timer = QTimer()
-        self._timer.setInterval( 10000 )
-        self._timer.timeout.connect( self._processCache )
-        self._timer.start()
+        self._refreshStarted = False
+
+
+    def startRefresh( self ):
+        """Start periodic refresh of the library. Called after startup is done
+        to not delay the first paint.
+        """
+        self._refreshStarted = True
+        if self._service is not None:
+            self._service.subscribe( self._serviceEvent )     # service does the refresh
+        elif self._progressiveScan is None:
+            for root in self._roots:
+                if root.getTree() is None:
+                    self._scheduleRefresh( root, 0 )        # not available so far, scan now
+                elif root.getWatchMode() == "poll":
+                    self._scheduleRefresh( root, 30 )       # do first scan 30 seconds after start
 
 
     def __del__( self ):
-        if "thread" in self._cacheWorker:
-            self._cacheWorker["stop"] = True
-            self._cacheWorker["thread"].join()
+        self.stopScan()
+        if self._service is not None:
+            self._service.close()
+        if self._seekIndex is not None:
+            self._seekIndex.stop()
+
+
+    def getDirectoryList( self ):
+        """Return list with root directories of library
+        """
+        return self._directoryList
+
+
+    def getRoots( self ):
+        """Return list with CLibraryRoot object of each root directory
+        """
+        return self._roots
 
 
     def getAudioExtensions( self ):
@@ -379,50 +234,140 @@ class CAudioLibrary( QObject ):
         return self._imageExtensions
 
 
-    def getImage( self, imgPath ):
+    def getFingerprintSize( self ):
+        """Return number of bytes of first track hashed for album fingerprint, 0 if disabled
+        """
+        return self._fingerprintSize
+
+
+    def getStatistics( self ):
+        """Return dictionary with counters of library, e.g. number of images decoded
+        """
+        return dict( self._statistics )
+
+
+    def getMetrics( self ):
+        """Collector for CMetrics, return list of ( name, type, help, value, labels )
+        """
+        stats = self._statistics
+        return [ ( "library_albums", "gauge", "Number of albums in library", stats["albums"], None ),
+                 ( "library_stale_albums", "gauge", "Number of albums of directories which could not be read during last scan", stats["staleAlbums"], None ),
+                 ( "library_directories", "gauge", "Number of directories with albums in library", stats["directories"], None ),
+                 ( "scans_total", "counter", "Number of library scans", stats["scans"], None ),
+                 ( "scan_failures_total", "counter", "Number of failed library scans", stats["scanFailures"], None ),
+                 ( "scan_directory_failures_total", "counter", "Number of directories which could not be read or timed out", stats["scanDirectoryFailures"], None ),
+                 ( "scan_entries_total", "counter", "Number of directory entries read by scans", stats["scanEntries"], None ),
+                 ( "scan_duration_seconds", "gauge", "Duration of last library scan", stats["lastScanDuration"], None ),
+                 ( "scan_entries_per_second", "gauge", "Directory entries per second of last library scan", stats["lastScanEntriesPerSecond"], None ),
+                 ( "cache_cycles_total", "counter", "Number of finished cache update cycles", stats["cacheCycles"], None ),
+                 ( "cache_changes_total", "counter", "Number of cache update cycles with changes", stats["cacheChanges"], None ),
+                 ( "album_moves_total", "counter", "Number of albums renamed or moved, detected by fingerprint", stats["albumMoves"], None ),
+                 ( "image_cache_requests_total", "counter", "Image requests by cache result", stats["imageCacheHits"], { "result": "hit" } ),
+                 ( "image_cache_requests_total", "counter", "Image requests by cache result", stats["imageCacheMisses"], { "result": "miss" } ),
+                 ( "image_cache_files", "gauge", "Number of files in image cache", stats["imageCacheFiles"], None ),
+                 ( "image_cache_bytes", "gauge", "Size of image cache", stats["imageCacheBytes"], None ),
+                 ( "image_decodes_total", "counter", "Number of decoded images", stats["imageDecodes"], None ),
+                 ( "image_decode_seconds_total", "counter", "Time spent decoding images", stats["imageDecodeTime"], None ),
+                 ( "image_decode_bytes_total", "counter", "Size of decoded images", stats["imageDecodeBytes"], None ) ]
+
+
+    def _addScanEntries( self, count ):
+        """Called by tree objects for each directory read
+        """
+        with self._statisticsLock:
+            self._statistics["scanEntries"] += count
+
+
+    def _updateCacheSize( self ):
+        """Count files and bytes in image cache
+        """
+        numFiles, numBytes = self._imageCache.getSize()
+        self._statistics["imageCacheFiles"] = numFiles
+        self._statistics["imageCacheBytes"] = numBytes
+
+
+    def getCachedImagePath( self, imgPath ):
+        """Return path of the copy of imgPath in the image cache. Returns imgPath
+        in case cache is disabled
+        """
+        if self._imageCache is not None:
+            return self._imageCache.getPath( imgPath )
+        return imgPath
+
+
+    def getImage( self, imgPath, size=None ):
         """Return QPixmap of given imgPath. If possible try to fetch image from cache
         directory. If file does not exist in cache fetch from given location and save
         copy in cache.
+        If size (QSize) is given, the image is decoded directly at the size fitting into
+        it (keeping aspect ratio), thus a large cover is not fully decoded for a small
+        icon. JPEG images are scaled during decode (scaled DCT). Images smaller than size
+        are not enlarged.
         Returns none in case image could not be loaded
         """
-        if self._cacheDir is not None:
-            cachePath = os.path.join( self._cacheImgDir, imgPath[1:] if imgPath[0] == "/" else imgPath )
-            if not os.path.isfile( cachePath ):
-                try:
-                    logging.debug( "Image {} not in cache, try to copy now".format( imgPath ) )
-                    os.makedirs( os.path.dirname( cachePath ), exist_ok = True )
-                    shutil.copyfile( imgPath, cachePath )
-                except Exception as e:
-                    logging.exception( "Copy file to cache" )
-                    return None
-
-            logging.debug( "Load image {} from cache {}".format( imgPath, cachePath ) )
+        if self._imageCache is not None:
+            try:
+                cachePath, cached = self._imageCache.fetch( imgPath )
+            except Exception:
+                self._statistics["imageCacheMisses"] += 1
+                logging.exception( "Copy file to cache" )
+                return None
+            self._statistics["imageCacheHits" if cached else "imageCacheMisses"] += 1
+
+            logging.debug( "Load image %s from cache %s", imgPath, cachePath )
         else:
             cachePath = imgPath
 
         try:
-            p = QPixmap()
-            if p.load( cachePath ):
-                return p
+            startTime = time.perf_counter()
+            reader = QImageReader( cachePath )
+            if size is not None and size.isValid():
+                imageSize = reader.size()
+                if imageSize.isValid() and ( imageSize.width() > size.width() or imageSize.height() > size.height() ):
+                    reader.setScaledSize( imageSize.scaled( size, Qt.KeepAspectRatio ) )
+            image = reader.read()
+            self._statistics["imageDecodes"] += 1
+            self._statistics["imageDecodeTime"] += time.perf_counter() - startTime
+            if not image.isNull():
+                self._statistics["imageDecodeBytes"] += image.sizeInBytes()
+                return QPixmap.fromImage( image )
+            logging.warning( "Could not load image {}: {}".format( cachePath, reader.errorString() ) )
         except:
             logging.exception( "Could not load image {} ({})".format( imgPath, cachePath ) )
         return None
 
 
 
-    def _buildAlbumMap( self, audioDirectory ):
-        """Walk through audioDirectory childs and write all albums found to self._albumMap
+    def getSeekIndex( self, audioFile ):
+        """Return CSeekIndex of given audio file or None in case seek index is
+        disabled or not build so far
         """
-        for childName in audioDirectory.getChildList():
-            child = audioDirectory.getChild( childName )
-            if isinstance( child, CAudioAlbum ):
-                if child.getName() in self._albumMap:
-                    raise Exception( "Child name {} already in album map".format( child.getName() ) )
-                self._albumMap[ child.getName() ] = child
-            elif isinstance( child, CAudioDirectory ):
-                self._buildAlbumMap( child )
-            else:
-                raise Exception( "invalid object {}".format( str( child ) ) )
+        if self._seekIndex is not None:
+            return self._seekIndex.get( audioFile )
+        return None
+
+
+    def requestSeekIndex( self, audioFiles ):
+        """Build seek index of given audio files in background, if enabled
+        """
+        if self._seekIndex is not None:
+            self._seekIndex.request( audioFiles )
+
+
+    def getSnapshot( self ):
+        """Return current CLibrarySnapshot. The snapshot stays consistent, also if
+        the library is updated meanwhile
+        """
+        return self._snapshot
+
+
+    def _publishSnapshot( self, snapshot ):
+        """Make snapshot the current state of the library. Called in GUI thread
+        """
+        self._snapshot = snapshot
+        self._statistics["albums"] = snapshot.getNumAlbums()
+        self._statistics["staleAlbums"] = snapshot.getNumStaleAlbums()
+        self._statistics["directories"] = snapshot.getNumDirectories()
 
 
     def getAlbumList( self, type="full" ):
@@ -430,32 +375,41 @@ class CAudioLibrary( QObject ):
         :param  type:   Type of list to return. Could be
                         "full":     Returns all albums in ascending order
                         "date":     Returns all albums in ascending date order
+                        "newest":   Returns the newest albums, newest first. Number
+                                    is limited by setting library/newestIndexSize
                         "dir":      Returns only first album of each directory
         """
-        res = list( self._albumMap )
-        if "full" == type:
-            res.sort()
-        elif "date" == type:
-            res.sort( key=lambda albumName: self._albumMap[albumName].getDate() )
-        elif "dir" == type:
-            res = []
-            for childName in self._audioTree.getChildList():
-                child = self._audioTree.getChild( childName )
-                if isinstance( child, CAudioDirectory ):
-                    firstAlbumName = child.getFirstAlbumName()
-                    res.append( firstAlbumName )
-                    logging.debug( "First album of directory {} is {}".format( child.getName(), firstAlbumName ) )
-        else:
-            raise Exception( "Order type/method {} not implemented yet".format( type ) )
-        return res
+        return list( self._snapshot.getAlbumList( type ) )
+
+
+    def getNewestAlbums( self, count ):
+        """Return list with the names of the count newest albums, newest first. Served
+        from the maintained index without sorting all albums as long as count does not
+        exceed setting library/newestIndexSize
+        """
+        return self._snapshot.getNewestAlbums( count )
+
+
+    def queryAlbums( self, type="full", root=None, dateFrom=None, dateTo=None, minTracks=None, limit=None ):
+        """Return list with names of albums filtered by root, date range (timestamps, end
+        exclusive) and minimum number of tracks. See CLibrarySnapshot.queryAlbums. Served
+        by vectorized queries of the album table if setting library/albumTable is enabled
+        """
+        return self._snapshot.queryAlbums( type, root, dateFrom, dateTo, minTracks, limit )
+
+
+    def iterAlbums( self, type="full", reverse=False ):
+        """Return iterator over the album names in order of getAlbumList. The list is
+        not copied and the iterator is not affected by later updates of the library
+        """
+        albumList = self._snapshot.getAlbumList( type )
+        return reversed( albumList ) if reverse else iter( albumList )
 
 
     def getAlbum( self, albumName ):
         """Return album object for given name. Return None in case not found
         """
-        if albumName in self._albumMap:
-            return self._albumMap[albumName]
-        return None
+        return self._snapshot.getAlbum( albumName )
 
 
     def getNextAlbum( self, album, type="full" ):
@@ -465,11 +419,10 @@ class CAudioLibrary( QObject ):
         if isinstance( album, CAudioAlbum ):
             album = album.getName()
 
-        allAlbums = self.getAlbumList( type )
-        try:
-            idx = allAlbums.index( album ) + 1
-        except:
-            idx = 0
+        snapshot = self._snapshot
+        allAlbums = snapshot.getAlbumList( type )
+        idx = snapshot.getAlbumIndex( album, type )
+        idx = 0 if idx is None else idx + 1
 
         if idx >= len( allAlbums ):
             idx = 0
@@ -483,11 +436,10 @@ class CAudioLibrary( QObject ):
         if isinstance( album, CAudioAlbum ):
             album = album.getName()
 
-        allAlbums = self.getAlbumList( type )
-        try:
-            idx = allAlbums.index( album ) - 1
-        except:
-            idx = -1
+        snapshot = self._snapshot
+        allAlbums = snapshot.getAlbumList( type )
+        idx = snapshot.getAlbumIndex( album, type )
+        idx = -1 if idx is None else idx - 1
 
         if idx < 0:
             idx = len( allAlbums ) - 1
@@ -495,56 +447,371 @@ class CAudioLibrary( QObject ):
 
 
 
-    def _processCache( self ):
-        """Periodically executed by timer. Build up new audio tree in a separate thread. After thread
-        is done check if new audio tree differs from current one. If yes, replace current with new one
-        and inform other parts about update via signal contentChanged().
+    def rescanNow( self ):
+        """Start refresh of all roots immediately. Roots with a running scan are skipped
         """
+        if self._service is not None:
+            try:
+                self._service.request( "rescan" )
+            except Exception as e:
+                self.scanError.emit( str( e ) )
+            return
+        for root in self._roots:
+            self._startRootScan( root )
 
-        if "state" not in self._cacheWorker:
-            self._cacheWorker["state"] = "idle"
-        if "nextCheck" not in self._cacheWorker:
-            self._cacheWorker["nextCheck"] = time.time() + 30           # do first scan 30 seconds after start
 
-        if self._cacheWorker["state"] == "idle" and time.time() > self._cacheWorker["nextCheck"]:
-            self._cacheWorker["stop"] = False
-            self._cacheWorker["state"] = "update"
-            self._cacheWorker["thread"] = threading.Thread( target=self._processCacheWorker )
-            self._cacheWorker["thread"].start()
+    def stopScan( self ):
+        """Cancel running refreshes and wait until workers are done
+        """
+        scan = self._progressiveScan
+        if scan is not None:
+            scan["control"].cancel()
+            for thread in scan["threads"]:
+                thread.join()
+            if self._scanTimer is not None:
+                self._scanTimer.stop()
+            self._progressiveScan = None        # albums found so far stay published
+        for root in self._roots:
+            root.getTimer().stop()
+            worker = root.getWorker()
+            if worker is not None:
+                worker.cancel()
+                worker.wait()
+                root.setWorker( None )
+
+
+    def _startRootScan( self, root ):
+        """Start refresh of one root in a scan worker
+        """
+        if self._progressiveScan is not None or root.getWorker() is not None:
+            return
+        logging.info( "Start refresh of %s", root.getPath() )
+        root.getTimer().stop()
+        worker = CScanWorker.CScanWorker( functools.partial( self._processCacheWorker, root ) )
+        worker.progress.connect( self._scanProgress )
+        worker.finished.connect( self._processCache )
+        worker.error.connect( self._scanError )
+        worker.cancelled.connect( self._scanCancelled )
+        root.setWorker( worker )
+        worker.start()
+
+
+    def _scheduleRefresh( self, root, delay ):
+        """Start next refresh of root after delay in s
+        """
+        root.getTimer().start( int( delay * 1000 ) )
 
-        elif self._cacheWorker["state"] == "done":
-            if self._cacheWorker["cacheChanged"]:
-                logging.info( "Audio tree changed, exchange now" )
-                self._audioTree = self._cacheWorker["tree"]
-                del self._cacheWorker["tree"]
-                self._albumMap = {}
-                self._buildAlbumMap( self._audioTree )
-                self.contentChanged.emit()
-            else:
-                logging.info( "No changes in audio tree" )
-            self._cacheWorker["state"] = "idle"
-            self._cacheWorker["nextCheck"] = time.time() + self._cacheUpdateTime
+
+    def _scheduleNextRefresh( self, root ):
+        """Schedule next refresh of root according to its watch mode. Roots or directories
+        not available so far are retried also in mode manual
+        """
+        delay = root.getUpdateInterval()
+        nextRetry = root.getNextRetry()
+        if nextRetry is not None:
+            # directories which could not be read are retried with backoff
+            delay = min( delay, max( 0.0, nextRetry - time.monotonic() ) )
+        if root.getWatchMode() == "poll" or root.getTree() is None or nextRetry is not None:
+            self._scheduleRefresh( root, delay )
+
+
+    def _scanProgress( self, done, total ):
+        logging.debug( "Scan progress %s/%s directories", done, total )
+        self.scanProgress.emit( done, total )
 
 
-    def _processCacheWorker( self ):
-        """Executed in separate thread to do work load of cache update
+    def _releaseScanWorker( self ):
+        """Wait until thread of finished scan worker (sender of signal) terminated and
+        drop it. Return root of the worker, None in case refresh was stopped meanwhile
         """
-        logging.info( "Started thread to update cache" )
-        self._cacheWorker["tree"] = self._audioTree
-        self._cacheWorker["tree"] = CAudioDirectory( self, None )
-        self._createAudioTree( self._cacheWorker["tree"], None, True )      # Build up new audio tree. Use short delay for each directory found
+        worker = self.sender()
+        for root in self._roots:
+            if root.getWorker() is worker:
+                worker.wait()
+                root.setWorker( None )
+                return root
+        return None
+
+
+    def _scanError( self, message ):
+        root = self._releaseScanWorker()
+        if root is None:
+            return
+        self._statistics["cacheCycles"] += 1
+        self.scanError.emit( message )
+        self._scheduleNextRefresh( root )
 
-        cacheChanged = self._cacheWorker["tree"] != self._audioTree
+
+    def _scanCancelled( self ):
+        root = self._releaseScanWorker()
+        if root is not None:
+            self._scheduleNextRefresh( root )
+
+
+    def _processCache( self, result ):
+        """Called in GUI thread after the scan worker of a root is done. If the tree of
+        the root changed, replace it and inform other parts about update via signal
+        contentChanged().
+        """
+        root = self._releaseScanWorker()
+        if root is None:
+            return
+        tree, snapshot, trees, cacheChanged, moves = result
         if cacheChanged:
-            self._saveAudioTree( self._cacheWorker["tree"] )                # save new data read if changed
+            logging.info( "Audio tree of %s changed, exchange now", root.getPath() )
+            if tree is not None:
+                root.setTree( tree )
+                if any( rootTree is not other.getTree() for rootTree, other in zip( trees, self._roots ) ):
+                    snapshot = self._buildSnapshot()        # other root changed meanwhile
+                self._publishSnapshot( snapshot )
+            self._statistics["cacheChanges"] += 1
+            if moves:
+                self.albumsMoved.emit( moves )
+            self.contentChanged.emit()
+        else:
+            logging.info( "No changes in audio tree of %s", root.getPath() )
+        self._statistics["cacheCycles"] += 1
+        self.scanFinished.emit( cacheChanged )
+        self._scheduleNextRefresh( root )
 
-        if self._cacheDir:
-            cacheChanged = self._checkCacheContent( self._cacheImgDir, "/" ) or cacheChanged
 
-        self._cacheWorker["cacheChanged"] = cacheChanged
+    def _processCacheWorker( self, root, worker ):
+        """Executed by scan worker in separate thread to do work load of cache update of
+        one root. Returns tuple of new tree of root, new snapshot, trees of all roots the
+        snapshot is build of (all None if tree did not change), flag if content changed
+        and list of album names moved, see albumsMoved
+        """
+        logging.info( "Started thread to update cache of %s", root.getPath() )
+        curTree = root.getTree()
+        newTree = self._scanRoot( root, None, worker, True )       # Build up new audio tree with throttling of root
+
+        tree = None
+        snapshot = None
+        trees = None
+        moves = []
+        cacheChanged = curTree is None or not newTree.shareSubtrees( curTree )     # unchanged parts of current tree are reused
+        if cacheChanged:
+            moves = self._moveAlbumData( newTree, curTree )         # before outdated images are removed from cache
+            self._saveAudioTree( root, newTree )                    # save new data read if changed
+            tree = newTree
+            trees = [ newTree if other is root else other.getTree() for other in self._roots ]
+            snapshot = self._buildSnapshot( trees )
+
+        if self._cacheDir:
+            worker.checkCancelled()
+            cacheRootDir = self.getCachedImagePath( root.getPath() )
+            if os.path.isdir( cacheRootDir ) and root.getLastScanFailures() == 0:     # keep images of stale albums
+                cacheChanged = self._checkCacheContent( cacheRootDir, root.getPath() ) or cacheChanged
+            self._updateCacheSize()
 
-        self._cacheWorker["state"] = "done"
         logging.info( "Thread done" )
+        return ( tree, snapshot, trees, cacheChanged, moves )
+
+
+    def _moveAlbumData( self, newTree, curTree ):
+        """Detect albums of curTree renamed or moved in newTree by their fingerprint and
+        take over their cached images and seek index. Return list of tuples (old name,
+        new name) of albums moved
+        """
+        if curTree is None:
+            return []
+        moves = CLibraryIndex.getAlbumMoves( *newTree.getAlbumChanges( curTree ) )
+        for oldAlbum, newAlbum in moves:
+            logging.info( "Album moved from %s to %s", oldAlbum.getPath(), newAlbum.getPath() )
+            if self._imageCache is not None:
+                self._imageCache.moveAlbum( oldAlbum, newAlbum )
+            if self._seekIndex is not None:
+                self._seekIndex.move( oldAlbum.getAudioFiles(), newAlbum.getAudioFiles() )
+        self._statistics["albumMoves"] += len( moves )
+        return [ ( oldAlbum.getName(), newAlbum.getName() ) for oldAlbum, newAlbum in moves ]
+
+
+    def _fetchServiceTrees( self, names=None ):
+        """Request trees from library service and return dictionary of root name and
+        tuple (generation, tree). Could be called in any thread
+        :param names:   Names of roots to request, None for all
+        """
+        response = self._service.request( "trees", roots=names )
+        roots = { root.getName(): root for root in self._roots }
+        trees = {}
+        for data in response["roots"]:
+            root = roots.get( data["name"] )
+            if root is None:
+                logging.warning( "Library service serves unknown root {}".format( data["name"] ) )
+                continue
+            tree = root.createTree( self )
+            tree.fromDict( data["tree"], root.getPath() )
+            trees[root.getName()] = ( data["generation"], tree )
+        return trees
+
+
+    def _setServiceTrees( self, trees ):
+        """Take over trees received from library service. Return list of album names
+        moved, see albumsMoved, or None in case content did not change. Called in GUI thread
+        """
+        changed = False
+        moves = []
+        for root in self._roots:
+            if root.getName() not in trees:
+                continue
+            generation, tree = trees[root.getName()]
+            self._serviceGenerations[root.getName()] = generation
+            curTree = root.getTree()
+            if curTree is None or not tree.shareSubtrees( curTree ):     # unchanged parts of current tree are reused
+                moves.extend( self._moveAlbumData( tree, curTree ) )    # images are already moved by service
+                root.setTree( tree )
+                changed = True
+        if not changed:
+            return None
+        self._publishSnapshot( self._buildSnapshot() )
+        return moves
+
+
+    def _serviceEvent( self, event ):
+        """Called by subscription thread on each event of library service. Trees of
+        changed roots are requested and handed over to GUI thread
+        """
+        names = [ name for name, generation in event.get( "roots", {} ).items()
+                  if self._serviceGenerations.get( name ) != generation ]
+        if not names:
+            return
+        try:
+            trees = self._fetchServiceTrees( names )
+        except Exception as e:
+            logging.warning( "Could not get trees from library service: {}".format( e ) )
+            return
+        self._serviceUpdate.emit( trees )
+
+
+    def _processServiceUpdate( self, trees ):
+        """Called in GUI thread with trees of changed roots received from library service
+        """
+        moves = self._setServiceTrees( trees )
+        changed = moves is not None
+        if changed:
+            logging.info( "Audio tree changed by library service, exchange now" )
+            self._statistics["cacheChanges"] += 1
+            if moves:
+                self.albumsMoved.emit( moves )
+            self.contentChanged.emit()
+        self._statistics["cacheCycles"] += 1
+        self.scanFinished.emit( changed )
+
+
+    def _startProgressiveScan( self, splash ):
+        """Start scan of all roots in separate threads and wait until first album is
+        found. Further albums are added in batches by _processProgressiveScan.
+        """
+        self._progressiveScan = { "trees": {},                          # root and tree of finished root scans
+                                  "pending": [],                        # albums found, not added so far
+                                  "lock": threading.Lock(),
+                                  "firstAlbum": threading.Event(),      # set with first album or end of scan
+                                  "running": len( self._roots ),        # number of root scans not done so far
+                                  "done": False,
+                                  "albumMap": {},                       # albums added so far, owned by GUI thread
+                                  "dirFirstAlbums": {},                 # top directory name and first album found
+                                  "control": CScanWorker.CScanControl() }   # cancelled by stopScan
+        self._progressiveScan["threads"] = [ threading.Thread( target=self._progressiveScanWorker, args=( root, ) ) for root in self._roots ]
+        for thread in self._progressiveScan["threads"]:
+            thread.start()
+
+        scan = self._progressiveScan
+        while not scan["firstAlbum"].wait( 0.1 ):
+            if splash is not None:
+                splash.showMessage( self.tr( "Search for audio files" ) )
+                QCoreApplication.processEvents()
+        if self._progressiveScan is None:
+            return                          # stopped meanwhile
+
+        self._scanTimer = CScheduler.getScheduler().addJob( "libraryProgressiveScan", self._processProgressiveScan,
+                                                            float( self._settings.value( "library/progressiveScanInterval", 500 ) ) / 1000.0 )
+        self._processProgressiveScan()
+        if self._progressiveScan is not None:
+            self._scanTimer.start()
+
+
+    def waitForScan( self ):
+        """Block until a running progressive scan is done and all albums are added
+        """
+        if self._progressiveScan is not None:
+            for thread in self._progressiveScan["threads"]:
+                thread.join()
+            self._processProgressiveScan()
+
+
+    def _progressiveScanWorker( self, root ):
+        """Executed in separate thread for each root to build up library for the first time
+        """
+        logging.info( "Started progressive scan of %s", root.getPath() )
+        scan = self._progressiveScan
+        scanStart = self._scanStarted()
+        tree = root.createTree( self )
+        context = root.createScanContext( scan["control"] )
+        try:
+            for album in tree.scanPath( root.getPath(), None, context ):
+                with scan["lock"]:
+                    scan["pending"].append( album )
+                scan["firstAlbum"].set()
+            self._scanDone( scanStart, directoryFailures=context.getNumFailures() )
+            self._saveAudioTree( root, tree )
+            with scan["lock"]:
+                scan["trees"][root] = tree
+        except CScanWorker.CScanCancelled:
+            logging.info( "Progressive scan of %s cancelled", root.getPath() )
+            self._scanDone( scanStart, True )
+        except Exception:
+            logging.exception( "Error during progressive scan of {}".format( root.getPath() ) )
+            self._scanDone( scanStart, True )
+        finally:
+            with scan["lock"]:
+                scan["running"] -= 1
+                scan["done"] = scan["running"] <= 0
+                if scan["done"]:
+                    scan["firstAlbum"].set()
+        logging.info( "Progressive scan of %s done", root.getPath() )
+
+
+    def _processProgressiveScan( self ):
+        """Periodically executed by timer during progressive scan. Add albums found
+        since last call. After scan is done the complete tree is used.
+        """
+        scan = self._progressiveScan
+        with scan["lock"]:
+            albums = scan["pending"]
+            scan["pending"] = []
+            done = scan["done"]
+
+        newNames = []
+        for album in albums:
+            scan["albumMap"][album.getName()] = album
+            newNames.append( album.getName() )
+
+            # search directory below root this album belongs to
+            topDir = album.getParentDir()
+            if topDir is not None and topDir.getParentDir() is not None:
+                while topDir.getParentDir().getParentDir() is not None:
+                    topDir = topDir.getParentDir()
+                if topDir.getName() not in scan["dirFirstAlbums"]:
+                    scan["dirFirstAlbums"][topDir.getName()] = album.getName()
+
+        if done:
+            self._scanTimer.stop()
+            self._progressiveScan = None
+            for root, tree in scan["trees"].items():
+                root.setTree( tree )
+            self._publishSnapshot( self._buildSnapshot() )
+            if self._refreshStarted:
+                for root in self._roots:
+                    self._scheduleNextRefresh( root )
+            logging.info( "Progressive scan finished with {} albums".format( self._snapshot.getNumAlbums() ) )
+            self.contentChanged.emit()
+        elif newNames:
+            # tree is still build up by scan thread, publish albums found so far with an empty tree
+            self._publishSnapshot( CLibrarySnapshot( CAudioDirectory( self, None ), dict( scan["albumMap"] ),
+                                                     scan["dirFirstAlbums"].values(), newestSize=self._newestSize,
+                                                     albumTable=self._albumTable ) )
+            logging.debug( "Progressive scan added {} albums".format( len( newNames ) ) )
+            self.albumsAdded.emit( newNames )
 
 
     def _checkCacheContent( self, cacheDir, origDir ):
@@ -564,7 +831,7 @@ class CAudioLibrary( QObject ):
                         res = self._checkCacheContent( entryPath, origPath ) or res
                     else:
                         # directory does no longer exist, delete from cache now
-                        logging.debug( "Directory {} in cache outdated".format( entryPath ) )
+                        logging.debug( "Directory %s in cache outdated", entryPath )
                         shutil.rmtree( entryPath )
                         res = True
                 elif os.path.isfile( entryPath ):
@@ -574,7 +841,7 @@ class CAudioLibrary( QObject ):
                         statOrig = os.stat( origPath )
                         keep = statCache.st_size == statOrig.st_size
                     if not keep:
-                        logging.debug( "File {} in cache outdated".format( entryPath ) )
+                        logging.debug( "File %s in cache outdated", entryPath )
                         os.remove( entryPath )
                         res = True
             except:
@@ -582,37 +849,67 @@ class CAudioLibrary( QObject ):
         return res
 
 
-    def _createAudioTree( self, audioTree, splash=None, delay=None ):
-        """Append self._directoryList directories to audio tree. Audio tree is
-        build up.
+    def _scanRoot( self, root, splash=None, control=None, throttle=False ):
+        """Build up and return new audio tree of given CLibraryRoot
+        :param control:     CScanWorker object for cancellation and progress or None
+        :param throttle:    If True the scan delay of root is used
         """
-        for directory in self._directoryList:
-            audioTree.addPath( directory, splash, delay )
+        scanStart = self._scanStarted()
+        try:
+            tree = root.scan( self, splash, control, throttle )
+        except Exception:
+            self._scanDone( scanStart, True )
+            raise
+        self._scanDone( scanStart, directoryFailures=root.getLastScanFailures() )
+        return tree
 
 
-    def _saveAudioTree( self, audioTree ):
-        if self._cacheDir is not None:
-            with open( os.path.join( self._cacheDir, "library.json" ), "w" ) as fp:
-                json.dump( audioTree.toDict(), fp )
+    def _buildSnapshot( self, trees=None ):
+        """Return CLibrarySnapshot of the combined trees of all roots
+        :param trees:   Tree of each root, None to use current ones
+        """
+        if trees is None:
+            trees = [ root.getTree() for root in self._roots ]
+        audioTree = CAudioDirectory( self, None )
+        for rootTree in trees:
+            if rootTree is not None:
+                audioTree.addChilds( rootTree )
+        return CLibrarySnapshot( audioTree, previous=self._snapshot, newestSize=self._newestSize, albumTable=self._albumTable )
 
 
+    def _scanStarted( self ):
+        """Return start state of a scan, used for statistics in _scanDone
+        """
+        with self._statisticsLock:
+            return ( time.perf_counter(), self._statistics["scanEntries"] )
 
 
-if __name__ == "__main__":
-    logging.basicConfig( level=logging.DEBUG )
-    if len( sys.argv ) > 1:
-        a = CAudioLibrary( sys.argv[1:] )
-        print( "-----" )
-        print( "Full list:" )
-        for albumName in a.getAlbumList():
-            print( "  Album {}".format( albumName ) )
+    def _scanDone( self, scanStart, failed=False, directoryFailures=0 ):
+        """Update scan statistics, called by scan threads
+        :param directoryFailures:   Number of directories which could not be read
+        """
+        duration = time.perf_counter() - scanStart[0]
+        with self._statisticsLock:
+            entries = self._statistics["scanEntries"] - scanStart[1]
+            self._statistics["scans"] += 1
+            self._statistics["scanDirectoryFailures"] += directoryFailures
+            if failed:
+                self._statistics["scanFailures"] += 1
+            else:
+                self._statistics["lastScanDuration"] = duration
+                self._statistics["lastScanEntriesPerSecond"] = entries / duration if duration > 0 else 0.0
+        logging.info( "Scan done in %.3fs, %s entries", duration, entries )
+
+
+    def _saveAudioTree( self, root, audioTree ):
+        """Save audio tree of given root to its cache file
+        """
+        root.save( audioTree )
 
-        print( "-----" )
-        print( "date list:" )
-        for albumName in a.getAlbumList( "date" ):
-            print( "  Album {}".format( albumName ) )
 
-    else:
-        raise Exception( "At least one argument has to be given" )
 
 
+if __name__ == "__main__":
+    # library tool without Qt, see libraryTool.py
+    import libraryTool
+    sys.exit( libraryTool.main() )
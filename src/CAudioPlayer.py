@@ -20,28 +20,30 @@
 # 
 
 
-import vlc
+
 import os
 
+import CTracer
+
 
 
 
 
 class CAudioPlayer():
 
-    def __init__( self, audioLibrary ):
+    def __init__( self, audioLibrary, backend ):
+        """:param backend:  CPlaybackBackend object used for playback
+        """
 
         self.__audioLibrary = audioLibrary
-
-        self.__player = vlc.MediaPlayer()
-        self.__listPlayer = vlc.MediaListPlayer()
-        self.__listPlayer.set_media_player( self.__player )
-        self.__curMediaList = vlc.MediaList()
+        self.__backend = backend
         self.__curAlbum = None
-
-        self.__eventManager = self.__listPlayer.event_manager()
-        self.__eventManager.event_attach( vlc.EventType.MediaListPlayerNextItemSet, self.__eventHandler )
-        self.__eventsCount = 0
+        self.__curFiles = []
+        self.__pendingSeek = None       # (track index, seconds) applied when the track plays
+        self.__readySeek = None         # pending seek whose track started playing
+        self.__playingTrace = None      # name of trace of the action which starts playback, see CTracer
+        self.__tracer = CTracer.getTracer()
+        self.__backend.addEventHandler( self.__eventHandler )
 
 
     def __del__( self ):
@@ -49,120 +51,194 @@ class CAudioPlayer():
             self.stop()
 
 
-    def __eventHandler( self, *args ):
-        self.__eventsCount = min( self.getTrackCount(), self.__eventsCount + 1 )
+    def __eventHandler( self, eventName, trackIdx ):
+        """Called by backend, maybe from other thread"""
+        if eventName == "playing":
+            traceName = self.__playingTrace
+            if traceName is not None:
+                self.__playingTrace = None
+                self.__tracer.end( traceName, "playing" )
+            pendingSeek = self.__pendingSeek
+            if pendingSeek is not None and pendingSeek[0] == trackIdx:
+                # backend plays asynchronously, a seek before this event may be ignored. Seek
+                # is not allowed within the backend callback, see applyPendingSeek
+                self.__readySeek = pendingSeek
+
+
+    def getBackend( self ):
+        return self.__backend
+
+
+    def applyPendingSeek( self ):
+        """Seek to resume position given with playAlbum once its track is playing. Has to
+        be called after the "playing" event of the backend, but not from within the event
+        handler (e.g. libvlc does not support this)
+        """
+        readySeek = self.__readySeek
+        if readySeek is not None and readySeek is self.__pendingSeek:
+            self.__pendingSeek = None
+            self.__readySeek = None
+            self.__seek( readySeek[0], readySeek[1] )
 
 
-    def playAlbum( self, albumName ):
+    def playAlbum( self, albumName, track=0, seconds=0.0 ):
         """Play all files of given album. The name has to exist, else
         an exception is thrown. If currently another album is playing,
-        it stops and the new one starts"""
+        it stops and the new one starts. Playback starts directly at given
+        track index and time in s of this track"""
 
         album = self.__audioLibrary.getAlbum( albumName )
         albumFiles = album.getAudioFiles()
         if not self.isStopped():
             self.stop()
-        self.__eventsCount = 0
-
-        mediaList = vlc.MediaList()
-        for file in albumFiles:
-            mediaList.add_media( file )
-        self.__curMediaList = mediaList
-        self.__listPlayer.set_media_list( mediaList )
-        self.__listPlayer.play()
+        if track < 0 or track >= len( albumFiles ):
+            track = 0
+            seconds = 0.0
+
+        self.__curFiles = albumFiles
+        self.__pendingSeek = ( track, seconds ) if seconds > 0 else None
+        self.__readySeek = None
+        self.__playingTrace = "play"
+        self.__backend.setPlaylist( albumFiles )
+        self.__tracer.stamp( "play", "mediaList" )
+        self.__backend.playItem( track )
+        self.__tracer.stamp( "play", "playCalled" )
         self.__curAlbum = albumName
+        self.__audioLibrary.requestSeekIndex( albumFiles )
 
 
     def getCurAlbum( self ):
         return self.__curAlbum
 
 
+    def renameAlbum( self, oldName, newName ):
+        """Album oldName was renamed or moved by the library, see CAudioLibrary.albumsMoved
+        """
+        if self.__curAlbum == oldName:
+            self.__curAlbum = newName
+
+
     def stop( self ):
-        self.__listPlayer.stop()
+        self.__pendingSeek = None
+        self.__playingTrace = None
+        self.__backend.stop()
 
 
     def pause( self, on ):
-        self.__player.set_pause( on )
+        if on:
+            self.__playingTrace = None
+        self.__backend.pause( on )
 
 
     def play( self ):
-        self.__listPlayer.play()
+        self.__backend.play()
 
 
     def next( self ):
-        self.__listPlayer.next()
+        # on last track there is no further playing event
+        self.__playingTrace = "next" if self.getTrack() < self.getTrackCount() else None
+        self.__backend.next()
+        self.__tracer.stamp( "next", "command" )
 
 
     def previous( self ):
-        oldEvents = self.__eventsCount
-        self.__listPlayer.previous()
-        newEvents = self.__eventsCount
-        if oldEvents < newEvents:
-            self.__eventsCount = max( 1, self.__eventsCount - 2 )
+        self.__playingTrace = "previous"
+        self.__backend.previous()
+        self.__tracer.stamp( "previous", "command" )
 
 
     def isPlaying( self ):
-        return self.__player.is_playing()
+        return self.__backend.isPlaying()
 
 
     def isStopped( self ):
-        return self.__player.get_state() == vlc.State.Stopped
+        return self.__backend.isStopped()
 
 
     def isPause( self ):
-        return self.__player.get_state() == vlc.State.Paused
+        return self.__backend.isPause()
 
 
     def getTrackCount( self ):
-        return self.__curMediaList.count()
+        return self.__backend.getTrackCount()
 
 
     def getTrack( self ):
-        return self.__eventsCount
+        return self.__backend.getTrack()
 
 
     def getVolume( self ):
         """Return volume in the rage of 0 ... 1.0"""
-        return self.__player.audio_get_volume() / 100.0
+        return self.__backend.getVolume()
 
 
     def setVolume( self, volume ):
         """Set volume, input range is 0 ... 1.0"""
-        self.__player.audio_set_volume( max( 0, min( 100, int( volume*100 )  ) ) )
+        self.__backend.setVolume( volume )
+
+
+    def __getSeekIndex( self, trackIdx=None ):
+        """Return seek index of track with given index 0 ... n-1, default is the
+        current track. None if not available"""
+        if trackIdx is None:
+            trackIdx = self.getTrack() - 1
+        if 0 <= trackIdx < len( self.__curFiles ):
+            return self.__audioLibrary.getSeekIndex( self.__curFiles[trackIdx] )
+        return None
 
 
     def getTime( self ):
         """Return time of current track in s"""
-        return self.__player.get_time() / 1000.0
+        seekIndex = self.__getSeekIndex()
+        if seekIndex is not None:
+            # player position is the byte position in case of VBR files without TOC
+            return seekIndex.getTimeOfRatio( self.__backend.getPosition() )
+        return self.__backend.getTime()
+
+
+    def setTime( self, seconds ):
+        """Set playback time of current track in s"""
+        self.__seek( None, seconds )
+
+
+    def __seek( self, trackIdx, seconds ):
+        """Set playback time in s of track with given index, None for current track"""
+        seekIndex = self.__getSeekIndex( trackIdx )
+        if seekIndex is not None:
+            # seek to byte position of requested time, player does not have to guess
+            self.__backend.setPosition( seekIndex.getRatio( seconds ) )
+        else:
+            self.__backend.setTime( seconds )
 
 
     def getLength( self ):
         """Return length of current track in s"""
-        return self.__player.get_length() / 1000.0
+        seekIndex = self.__getSeekIndex()
+        if seekIndex is not None:
+            return seekIndex.getLength()
+        return self.__backend.getLength()
 
 
     def getPosition( self ):
         """Return position of current track in percent 0 ... 1.0"""
-        return self.__player.get_position()
+        seekIndex = self.__getSeekIndex()
+        if seekIndex is not None and seekIndex.getLength() > 0:
+            return self.getTime() / seekIndex.getLength()
+        return self.__backend.getPosition()
 
 
     def setPosition( self, pos ):
         """Set playback position of current track in percent 0 ... 1.0"""
-        self.__player.set_position( pos )
+        seekIndex = self.__getSeekIndex()
+        if seekIndex is not None:
+            self.setTime( pos * seekIndex.getLength() )
+        else:
+            self.__backend.setPosition( pos )
 
 
     def getTrackDescription( self ):
         """Return text description of current active track"""
-        m = self.__player.get_media()
-        if m is not None:
-            title = m.get_meta( vlc.Meta.Title )
-            artist = m.get_meta( vlc.Meta.Artist )
-            if title is None:
-                title = ""
-            if artist is None:
-                artist = ""
-            return  "{} - {}".format( title, artist )
-        return ""
+        return self.__backend.getTrackDescription()
 
 
 
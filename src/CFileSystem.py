@@ -0,0 +1,212 @@
+#!/bin/python3
+# 
+# Copyright Florian Pfanner 2026
+#
+# This file is part of AudioPlayer.
+# 
+# AudioPlayer is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# AudioPlayer is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+# 
+# You should have received a copy of the GNU General Public License
+# along with AudioPlayer. If not, see <https://www.gnu.org/licenses/>.
+# 
+# 
+
+
+
+
+import os
+import time
+import queue
+import random
+import logging
+import threading
+
+
+
+class CFileSystem:
+    """Access to the file system used by the library scan. All information of one
+    directory is read with one call, thus a deadline can be applied per directory.
+    """
+
+    def readDirectory( self, path ):
+        """Return tuple (modification time of directory, list of ( name, isDir, isFile ))
+        """
+        entries = []
+        with os.scandir( path ) as it:
+            for entry in it:
+                entries.append( ( entry.name, entry.is_dir(), entry.is_file() ) )
+        return ( os.stat( path ).st_mtime, entries )
+
+
+    def readFiles( self, paths, sampleSize ):
+        """Return tuple (list with size of each file, first sampleSize bytes of first file)
+        """
+        sizes = [ os.stat( path ).st_size for path in paths ]
+        sample = b""
+        if paths and sampleSize > 0:
+            with open( paths[0], "rb" ) as fp:
+                sample = fp.read( sampleSize )
+        return ( sizes, sample )
+
+
+
+class CFaultyFileSystem( CFileSystem ):
+    """File system shim for tests and benchmarks. Adds latency to each directory read,
+    fails randomly or for given paths and hangs for given paths.
+    """
+
+    def __init__( self, fileSystem=None, latency=0.0, errorRate=0.0, failPaths=(), hangPaths=(), hangTime=3600.0, seed=None ):
+        """
+        :param latency:     Time in s added to each directory read
+        :param errorRate:   Probability 0 ... 1.0 of a directory read to fail with OSError
+        :param failPaths:   Reads of these paths and all paths below always fail
+        :param hangPaths:   Reads of these paths and all paths below block for hangTime s
+        """
+        self._fileSystem = fileSystem if fileSystem is not None else CFileSystem()
+        self._latency = latency
+        self._errorRate = errorRate
+        self._failPaths = [ os.path.normpath( path ) for path in failPaths ]
+        self._hangPaths = [ os.path.normpath( path ) for path in hangPaths ]
+        self._hangTime = hangTime
+        self._random = random.Random( seed )
+        self._lock = threading.Lock()
+
+
+    def readDirectory( self, path ):
+        self._inject( path )
+        return self._fileSystem.readDirectory( path )
+
+
+    def readFiles( self, paths, sampleSize ):
+        if paths:
+            self._inject( os.path.dirname( paths[0] ) )
+        return self._fileSystem.readFiles( paths, sampleSize )
+
+
+    def _inject( self, path ):
+        """Apply latency, hang and errors configured for path
+        """
+        if self._latency > 0:
+            time.sleep( self._latency )
+        if self._matches( path, self._hangPaths ):
+            time.sleep( self._hangTime )
+        with self._lock:
+            fail = self._random.random() < self._errorRate
+        if fail or self._matches( path, self._failPaths ):
+            raise OSError( "Injected error reading {}".format( path ) )
+
+
+    def _matches( self, path, paths ):
+        path = os.path.normpath( path )
+        for prefix in paths:
+            if path == prefix or path.startswith( prefix + os.sep ):
+                return True
+        return False
+
+
+
+class CDeadlineFileSystem( CFileSystem ):
+    """Runs each directory or file read in a helper thread and raises TimeoutError in case it
+    does not finish within timeout. A blocked read (e.g. hanging network mount) can not
+    be interrupted, its thread is abandoned and new reads are served by another thread.
+    Once maxBlocked threads are blocked no further threads are started, reads which
+    need a new thread fail with TimeoutError immediately.
+    """
+
+    def __init__( self, fileSystem, timeout, maxBlocked=8 ):
+        self._fileSystem = fileSystem
+        self._timeout = timeout
+        self._maxBlocked = maxBlocked
+        self._requests = queue.Queue()
+        self._lock = threading.Lock()
+        self._idleThreads = 0
+        self._numThreads = 0
+        self._numBlocked = 0                # threads with a timed out read which did not return so far
+
+
+    def readDirectory( self, path ):
+        return self._call( path, self._fileSystem.readDirectory, path )
+
+
+    def readFiles( self, paths, sampleSize ):
+        return self._call( os.path.dirname( paths[0] ) if paths else "", self._fileSystem.readFiles, paths, sampleSize )
+
+
+    def _call( self, path, func, *args ):
+        """Run func with args in helper thread, raise TimeoutError if it does not
+        finish within timeout
+        :param path:    Path read by func, used for error message
+        """
+        request = { "func": func, "args": args, "done": threading.Event(), "result": None, "error": None, "abandoned": False }
+        with self._lock:
+            if self._idleThreads > 0:
+                self._idleThreads -= 1          # reserved for this request
+            elif self._numBlocked >= self._maxBlocked:
+                raise TimeoutError( "Reading {} not started, {} reads are blocked".format( path, self._numBlocked ) )
+            else:
+                self._numThreads += 1
+                threading.Thread( target=self._worker, daemon=True ).start()
+        self._requests.put( request )
+        if not request["done"].wait( self._timeout ):
+            with self._lock:
+                if not request["done"].is_set():
+                    request["abandoned"] = True
+                    self._numBlocked += 1
+            if request["abandoned"]:
+                raise TimeoutError( "Reading {} took longer than {}s".format( path, self._timeout ) )
+        if request["error"] is not None:
+            raise request["error"]
+        return request["result"]
+
+
+    def getNumThreads( self ):
+        """Return number of helper threads started so far, including blocked ones
+        """
+        return self._numThreads
+
+
+    def getNumBlocked( self ):
+        """Return number of helper threads blocked by a read which timed out
+        """
+        return self._numBlocked
+
+
+    def _worker( self ):
+        while True:
+            request = self._requests.get()
+            try:
+                request["result"] = request["func"]( *request["args"] )
+            except Exception as e:
+                request["error"] = e
+            with self._lock:
+                request["done"].set()
+                if request["abandoned"]:
+                    self._numBlocked -= 1
+                self._idleThreads += 1
+
+
+
+def createFileSystem( settings ):
+    """Return CFileSystem used for library scans. In case section faultInjection is
+    enabled in settings the faulty shim is used
+    """
+    fileSystem = CFileSystem()
+    if int( settings.value( "faultInjection/enabled", 0 ) ):
+        failPaths = settings.value( "faultInjection/failPaths", [] )
+        hangPaths = settings.value( "faultInjection/hangPaths", [] )
+        fileSystem = CFaultyFileSystem( fileSystem,
+                                        float( settings.value( "faultInjection/latency", 0.0 ) ),
+                                        float( settings.value( "faultInjection/errorRate", 0.0 ) ),
+                                        [ failPaths ] if isinstance( failPaths, str ) else failPaths,
+                                        [ hangPaths ] if isinstance( hangPaths, str ) else hangPaths,
+                                        float( settings.value( "faultInjection/hangTime", 3600.0 ) ) )
+        logging.warning( "Fault injection enabled for library scans" )
+    return fileSystem
@@ -42,19 +42,33 @@ from PyQt5.QtCore import QSize
 from PyQt5.QtCore import QVariant
 import logging
 import os
+import itertools
 
 
 class CDataModel( QAbstractListModel ):
-    def __init__( self, audioLibrary, iconSize, dataType, maxNumItems=None, reverse=False, parent=None):
+    """List of albums of one type (see CAudioLibrary.getAlbumList). Rows are loaded in
+    batches as requested by the view (canFetchMore / fetchMore), thus the cost of
+    opening the list does not depend on the size of the library.
+    """
+
+    def __init__( self, audioLibrary, iconSize, dataType, maxNumItems=None, reverse=False, parent=None, batchSize=50 ):
         super().__init__( parent )
         self._audioLibrary = audioLibrary
         self._iconSize = iconSize
         self._dataType = dataType
         self._maxNumItems = maxNumItems
         self._reverse = reverse
-        self._albumList = []
-        audioLibrary.contentChanged.connect( self._reloadContent )
+        self._batchSize = max( 1, batchSize )
+        self._albumList = []            # albums of rows loaded so far
+        self._albumIter = None          # iterator over albums not loaded so far, None if all loaded
+        self._iconData = {}
 
+
+    def populate( self ):
+        """Load content first time and follow changes of library afterwards
+        """
+        self._audioLibrary.contentChanged.connect( self._reloadContent )
+        self._audioLibrary.albumsAdded.connect( self._appendContent )
         self._reloadContent()
 
 
@@ -62,6 +76,25 @@ class CDataModel( QAbstractListModel ):
         return len( self._albumList )
 
 
+    def canFetchMore( self, parent ):
+        return not parent.isValid() and self._albumIter is not None
+
+
+    def fetchMore( self, parent ):
+        """Load next batch of albums
+        """
+        if parent.isValid() or self._albumIter is None:
+            return
+        albums = list( itertools.islice( self._albumIter, self._batchSize ) )
+        if len( albums ) < self._batchSize:
+            self._albumIter = None
+        if albums:
+            numRows = len( self._albumList )
+            self.beginInsertRows( QModelIndex(), numRows, numRows + len( albums ) - 1 )
+            self._albumList.extend( albums )
+            self.endInsertRows()
+
+
     def data( self, index, role ):
         if index.isValid() and index.row() < len( self._albumList):
             albumName = self._albumList[index.row()]
@@ -83,18 +116,34 @@ class CDataModel( QAbstractListModel ):
         return QVariant()
 
 
+    def _createAlbumIter( self, start=0 ):
+        """Return iterator over albums of this model, starting at row start
+        """
+        albums = self._audioLibrary.iterAlbums( self._dataType, self._reverse )
+        return itertools.islice( albums, start, self._maxNumItems )
+
+
+    def _appendContent( self, albumNames ):
+        """Albums were added to library during scan. Continue after the rows loaded
+        so far if they did not change, else reload whole content
+        """
+        numRows = len( self._albumList )
+        if list( itertools.islice( self._createAlbumIter(), numRows ) ) != self._albumList:
+            self._reloadContent()
+        else:
+            self._albumIter = self._createAlbumIter( numRows )
+            self.fetchMore( QModelIndex() )
+
+
     def _reloadContent( self ):
-        logging.debug( "Reload content of {} CDataModel".format( self._dataType ) )
-        self.layoutAboutToBeChanged.emit()
-
-        self._albumList = self._audioLibrary.getAlbumList( self._dataType )
-        if self._reverse:
-            self._albumList.reverse()
-        if self._maxNumItems is not None:
-            self._albumList = self._albumList[0:self._maxNumItems]
+        logging.debug( "Reload content of %s CDataModel", self._dataType )
+        self.beginResetModel()
+
+        self._albumList = []
+        self._albumIter = self._createAlbumIter()
         self._iconData = {}
 
-        self.layoutChanged.emit()
+        self.endResetModel()
 
 
 
@@ -133,9 +182,10 @@ class CGuiAlbumGroupSelector( QWidget ):
 
         # create model
         dateListMaxItems = int( self._settings.value( "albumSelectorGroup/dateListNumItems", 20 ) )
+        batchSize = int( self._settings.value( "albumSelectorGroup/fetchBatchSize", 50 ) )
         self._model = {}
-        self._model["date"] = CDataModel( audioLibrary, iconSize, "date", dateListMaxItems, True )
-        self._model["dir"] = CDataModel( audioLibrary, iconSize, "dir" )
+        self._model["date"] = CDataModel( audioLibrary, iconSize, "newest", dateListMaxItems, batchSize=batchSize )
+        self._model["dir"] = CDataModel( audioLibrary, iconSize, "dir", batchSize=batchSize )
 
         buttonLayout = QHBoxLayout()
         self.__buttons = [ #icon filename, modelName, slot, buttonObj
@@ -200,6 +250,13 @@ class CGuiAlbumGroupSelector( QWidget ):
         self._clickPos = event.pos()
 
 
+    def populate( self ):
+        """Fill models with albums of library. Done after startup to speed up first paint
+        """
+        for model in self._model.values():
+            model.populate()
+
+
     def _dirButtonClicked( self ):
         self._buttonClicked( "dir" )
 
@@ -27,10 +27,12 @@ from PyQt5.QtCore import Qt
 from PyQt5.QtCore import QEvent
 from PyQt5.QtCore import pyqtSignal
 from PyQt5.QtCore import pyqtSlot
-from PyQt5.QtCore import QTimer
 from PyQt5.QtCore import QSize
 import logging
 
+import CTracer
+import CScheduler
+
 
 
 class CGuiAlbumSelector( QLabel ):
@@ -57,25 +59,24 @@ class CGuiAlbumSelector( QLabel ):
         self.setFont( font )
         self.setFocusPolicy( Qt.StrongFocus )
 
-        self.showAlbum()
+        # album is shown with first resizeEvent, thus image is only decoded in final size
 
         self._audioLibrary.contentChanged.connect( self.showAlbum )             # in case cache has changed also update my image
+        self._audioLibrary.albumsMoved.connect( self._albumsMoved )             # emitted before contentChanged
 
         self._curPlayName = None
-        self._timer = QTimer()
-        self._timer.setInterval( 10000 )
-        self._timer.timeout.connect( self._handleTimer )
+        self._timer = CScheduler.getScheduler().addJob( "albumSelectorReset", self._handleTimer, 10.0, True )
 
         self._mousePressPos = None
 
 
     def showAlbum( self ):
-        logging.info( "Show album {}".format( self._curAlbumName ) )
+        logging.info( "Show album %s", self._curAlbumName )
         self._curAlbum = self._audioLibrary.getAlbum( self._curAlbumName )
         if self._curAlbum is None:
             self._curAlbumName = self._audioLibrary.getNextAlbum( "" )      # use first one
             self._curAlbum = self._audioLibrary.getAlbum( self._curAlbumName )
-            logging.info( "Album not found, use first one {}".format( self._curAlbumName ) )
+            logging.info( "Album not found, use first one %s", self._curAlbumName )
 
         self.clear()
         image = self._curAlbum.getImage( 0, self.size() )
@@ -98,12 +99,40 @@ class CGuiAlbumSelector( QLabel ):
 
 
     def selectAlbum( self ):
+        CTracer.getTracer().begin( "play" )
         print( "Album selected: {}".format( self._curAlbumName ) )
         self.playAlbumSignal.emit( self._curAlbumName )
-        self._userData.setValue( "albumSelector/last", self._curAlbumName )
+        self._saveLastAlbum( self._curAlbum )
         self._curPlayName = self._curAlbumName
 
 
+    def _saveLastAlbum( self, album ):
+        """Remember album selected last, restored during next start
+        """
+        self._userData.setValue( "albumSelector/last", album.getName() )
+        imageFiles = album.getImageFiles()
+        if imageFiles:
+            # shown as splash screen during next start
+            self._userData.setValue( "albumSelector/lastImage", self._audioLibrary.getCachedImagePath( imageFiles[0] ) )
+        else:
+            self._userData.remove( "albumSelector/lastImage" )
+        CScheduler.getScheduler().trigger( "settingsSync" )
+
+
+    @pyqtSlot( list )
+    def _albumsMoved( self, moves ):
+        """Follow albums renamed or moved, thus current and last album are still found
+        """
+        for oldName, newName in moves:
+            if self._curAlbumName == oldName:
+                self._curAlbumName = newName
+            if self._curPlayName == oldName:
+                self._curPlayName = newName
+            album = self._audioLibrary.getAlbum( newName )
+            if album is not None and self._userData.value( "albumSelector/last", "" ) == oldName:
+                self._saveLastAlbum( album )
+
+
     def resizeEvent( self, event ):
         super().resizeEvent( event )
         self.showAlbum()
@@ -141,13 +170,12 @@ class CGuiAlbumSelector( QLabel ):
             # reset selector to album currently playing
             self._curAlbumName = self._curPlayName
             self.showAlbum()
-        self._timer.stop()
 
 
     def jumpAlbum( self, albumName ):
         """Jump to given album and just show it
         """
-        logging.debug( "Jump to album {}".format( albumName ) )
+        logging.debug( "Jump to album %s", albumName )
         self._curAlbumName = albumName
         self.showAlbum()
         self._timer.start()
@@ -21,6 +21,10 @@
 
 
 import CAudioPlayer
+import CPlaybackBackend
+import CResumeStore
+import CTracer
+import CScheduler
 from PyQt5.QtWidgets import QWidget
 from PyQt5.QtWidgets import QLabel
 from PyQt5.QtWidgets import QProgressBar
@@ -31,13 +35,13 @@ from PyQt5.QtGui import QPalette
 from PyQt5.QtGui import QIcon
 from PyQt5.QtGui import QFontMetrics
 from PyQt5.QtCore import Qt
-from PyQt5.QtCore import QTimer
 from PyQt5.QtCore import QSize
 from PyQt5.QtCore import QEvent
 from PyQt5.QtCore import pyqtSignal
 from PyQt5.QtCore import pyqtSlot
 import logging
 import os
+import time
 
 
 fileDirName = os.path.dirname( os.path.abspath(__file__) )
@@ -46,17 +50,21 @@ fileDirName = os.path.dirname( os.path.abspath(__file__) )
 
 class CGuiAudioPlayer( QWidget ):
 
+    _playing = pyqtSignal()         # emitted by backend thread, handled in GUI thread
+
     def __init__( self, audioLibrary, settings, userData, parent=None ):
         super().__init__( parent )
         self._audioLibrary = audioLibrary
         self._settings = settings
         self._userData = userData
-        self._player = CAudioPlayer.CAudioPlayer( self._audioLibrary )
+        self._player = None                 # created with initPlayer()
 
-        # restore volume
-        volume = float( self._userData.value( "audioPlayer/volume", 0.5 ) )
-        print( "restore volume to {}".format( volume ) )
-        self._player.setVolume( min( 1.0, max( 0.0, volume ) ) )
+        # resume position of albums, stored beside user data
+        self._resumeStore = None
+        if int( self._settings.value( "audioPlayer/resume", 1 ) ):
+            resumeFile = os.path.join( os.path.dirname( self._userData.fileName() ), "AudioPlayerResume.json" )
+            writeInterval = float( self._settings.value( "audioPlayer/resumeWriteInterval", 60 ) )
+            self._resumeStore = CResumeStore.CResumeStore( resumeFile, writeInterval )
 
         # create UI
         self.__buttons = [ #icon file name(s), icons, slot, buttonObj
@@ -99,59 +107,177 @@ class CGuiAudioPlayer( QWidget ):
         mainLayout.addWidget( self.__progress )
         self.setLayout( mainLayout )
 
-        self._timer = QTimer()
-        self._timer.setInterval( 1000 )
-        self._timer.timeout.connect( self._handleTimer )
-        self._timer.start()
+        # progress is only polled while playing, see _wakeTimer
+        self._timer = CScheduler.getScheduler().addJob( "playerProgress", self._handleTimer, 1.0 )
+        self._idleGraceTime = float( self._settings.value( "audioPlayer/idleGraceTime", 5 ) )
+        self._idleAfter = 0.0
+
+        self._audioLibrary.albumsMoved.connect( self._albumsMoved )
+        self._playing.connect( self._handlePlaying )
+
+
+    def initPlayer( self ):
+        """Create playback backend and start progress timer. Done after first paint
+        to speed up startup or on first use.
+        """
+        if self._player is not None:
+            return
+        self._player = CAudioPlayer.CAudioPlayer( self._audioLibrary, CPlaybackBackend.createBackend( self._settings ) )
+        self._player.getBackend().addEventHandler( self._backendEvent )
+
+        # restore volume
+        volume = float( self._userData.value( "audioPlayer/volume", 0.5 ) )
+        print( "restore volume to {}".format( volume ) )
+        self._player.setVolume( min( 1.0, max( 0.0, volume ) ) )
 
         self._handleTimer()
 
 
     @pyqtSlot( str )
     def playAlbum( self, albumName ):
-        self._player.playAlbum( albumName )
-        self._handleTimer()
+        CTracer.getTracer().stamp( "play", "signal" )
+        self.initPlayer()
+        if self._resumeStore is not None:
+            self._saveResumePosition()
+            track, seconds = self._resumeStore.get( albumName )
+            logging.info( "Resume album {} at track {}, {:.1f}s".format( albumName, track, seconds ) )
+            self._player.playAlbum( albumName, track, seconds )
+        else:
+            self._player.playAlbum( albumName )
+        self._wakeTimer()
+
+
+    def _backendEvent( self, eventName, trackIdx ):
+        """Called by backend, maybe from other thread"""
+        if eventName == "playing":
+            self._playing.emit()
+
+
+    @pyqtSlot()
+    def _handlePlaying( self ):
+        self._player.applyPendingSeek()
+
+
+    def getCurAlbum( self ):
+        """Return name of album played last, None if nothing played so far
+        """
+        if self._player is not None:
+            return self._player.getCurAlbum()
+        return None
+
+
+    def flush( self ):
+        """Write pending resume positions immediately, e.g. before exit
+        """
+        if self._resumeStore is not None and self._player is not None:
+            self._saveResumePosition()
+            self._resumeStore.flush( True )
+
+
+    def getMetrics( self ):
+        """Collector for CMetrics, return list of ( name, type, help, value, labels )
+        """
+        state = "stopped"
+        track = 0
+        volume = 0.0
+        if self._player is not None:
+            if self._player.isPlaying():
+                state = "playing"
+            elif self._player.isPause():
+                state = "paused"
+            track = self._player.getTrack()
+            volume = self._player.getVolume()
+        res = []
+        for stateName in [ "playing", "paused", "stopped" ]:
+            res.append( ( "playback_state", "gauge", "Current playback state", 1 if state == stateName else 0, { "state": stateName } ) )
+        res.append( ( "playback_track", "gauge", "Number of current track in album", track, None ) )
+        res.append( ( "playback_volume", "gauge", "Playback volume 0 ... 1", volume, None ) )
+        if self._resumeStore is not None:
+            res.append( ( "resume_writes_total", "counter", "Number of writes of resume positions", self._resumeStore.getWriteCount(), None ) )
+        return res
+
+
+    @pyqtSlot( list )
+    def _albumsMoved( self, moves ):
+        """Keep resume position and current album of albums renamed or moved
+        """
+        for oldName, newName in moves:
+            if self._resumeStore is not None:
+                self._resumeStore.move( oldName, newName )
+            if self._player is not None:
+                self._player.renameAlbum( oldName, newName )
+
+
+    def _saveResumePosition( self ):
+        """Remember position of album currently playing
+        """
+        albumName = self._player.getCurAlbum()
+        if albumName is not None and ( self._player.isPlaying() or self._player.isPause() ):
+            self._resumeStore.update( albumName, self._player.getTrack() - 1, self._player.getTime() )
 
 
     @pyqtSlot()
     def _handlePlay( self ):
+        self.initPlayer()
         if self._shownPlayButton == 0:
             # play is shown
             self._player.play()
         else:
             # pause is shown
             self._player.pause( True )
-        self._handleTimer()
+        self._wakeTimer()
 
     @pyqtSlot()
     def _handlePrevious( self ):
+        CTracer.getTracer().begin( "previous" )
+        self.initPlayer()
         self._player.previous()
-        self._handleTimer()
+        self._wakeTimer()
 
     @pyqtSlot()
     def _handleNext( self ):
+        CTracer.getTracer().begin( "next" )
+        self.initPlayer()
         self._player.next()
-        self._handleTimer()
+        self._wakeTimer()
 
     @pyqtSlot()
     def _handleVolumeUp( self ):
+        self.initPlayer()
         curVolume = self._player.getVolume()
         self._player.setVolume( min( 1.0, curVolume+0.05 ) )
         volume = self._player.getVolume()
         print( "set volume to {}".format( volume ) )
         self._userData.setValue( "audioPlayer/volume", volume )
+        CScheduler.getScheduler().trigger( "settingsSync" )
 
     @pyqtSlot()
     def _handleVolumeDown( self ):
+        self.initPlayer()
         curVolume = self._player.getVolume()
         self._player.setVolume( max( 0.0, curVolume-0.05 ) )
         volume = self._player.getVolume()
         print( "set volume to {}".format( volume ) )
         self._userData.setValue( "audioPlayer/volume", volume )
+        CScheduler.getScheduler().trigger( "settingsSync" )
+
+    def _wakeTimer( self ):
+        """Called after each user action: update display now and poll the player until
+        it is idle again. Playback may start delayed, thus polling continues for a grace
+        time even if player is not playing yet
+        """
+        self._idleAfter = time.monotonic() + self._idleGraceTime
+        self._handleTimer()
+        self._timer.start()
+
 
     @pyqtSlot()
     def _handleTimer( self ):
-        if self._player.isPlaying():
+        """Update progress and play button. Return False in case the player is idle
+        (stopped or paused), then the timer is stopped until the next user action
+        """
+        playing = self._player.isPlaying()
+        if playing:
             curTrack = self._player.getTrack()
             numTracks = self._player.getTrackCount()
             trackTxt = self._player.getTrackDescription()
@@ -161,6 +287,9 @@ class CGuiAudioPlayer( QWidget ):
             displayTxt = fontMetrics.elidedText( displayTxt, Qt.ElideRight, self.__progress.width() )
             self.__progress.setFormat( displayTxt )
             expectedPlaybutton = 1
+            if self._resumeStore is not None:
+                self._saveResumePosition()
+                self._resumeStore.flush()
         else:
             expectedPlaybutton = 0
             if not self._player.isPause():
@@ -170,12 +299,19 @@ class CGuiAudioPlayer( QWidget ):
             self.__buttons[0][3].setIcon( self.__buttons[0][1][expectedPlaybutton] )
             self._shownPlayButton = expectedPlaybutton
 
+        if playing or time.monotonic() < self._idleAfter:
+            return True
+        if self._resumeStore is not None:
+            self._saveResumePosition()
+            self._resumeStore.flush( True )       # no further flush until playback continues
+        return False
+
     def mousePressEvent( self, event ):
         if self.childAt( event.pos() ) == self.__progress:
             event.accept()
             pos = self.__progress.mapFrom( self, event.pos() )
             percent = pos.x() / self.__progress.width()
-            if self._player.isPlaying():
+            if self._player is not None and self._player.isPlaying():
                 self._player.setPosition( percent )
         else:
             super().mousePressEvent( event )
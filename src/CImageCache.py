@@ -0,0 +1,145 @@
+#!/bin/python3
+# 
+# Copyright Florian Pfanner 2026
+#
+# This file is part of AudioPlayer.
+# 
+# AudioPlayer is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# AudioPlayer is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+# 
+# You should have received a copy of the GNU General Public License
+# along with AudioPlayer. If not, see <https://www.gnu.org/licenses/>.
+# 
+# 
+
+
+
+
+import os
+import logging
+import shutil
+import threading
+import concurrent.futures
+
+
+
+class CImageCache:
+    """Local copy of the cover images. Images on slow storage (e.g. network shares)
+    are read once, afterwards the copy in the cache directory is used. The copy is
+    written to a temporary file first, thus a reader never sees a partial image.
+    Copies are stored below the name of their library root, not below the mount
+    point, thus the cache could be build on another machine.
+    """
+
+    def __init__( self, cacheDir, roots=None ):
+        """
+        :param cacheDir:    Directory the copies are written to
+        :param roots:       Dictionary root directory and name of root. Path of images below
+                            a root are kept relative to cacheDir/name, other ones absolute
+        """
+        self._cacheDir = cacheDir
+        self._roots = [ ( path.rstrip( "/" ) + "/", name ) for path, name in ( roots or {} ).items() ]
+        os.makedirs( self._cacheDir, exist_ok=True )
+
+
+    def getCacheDir( self ):
+        return self._cacheDir
+
+
+    def getPath( self, imgPath ):
+        """Return path of the copy of imgPath in the cache. imgPath could also be a root
+        directory, then the cache directory of the root is returned
+        """
+        for prefix, name in self._roots:
+            if imgPath.startswith( prefix ):
+                return os.path.join( self._cacheDir, name, imgPath[len( prefix ):] )
+            if imgPath == prefix[0:-1]:
+                return os.path.join( self._cacheDir, name )
+        return os.path.join( self._cacheDir, imgPath[1:] if imgPath.startswith( "/" ) else imgPath )
+
+
+    def fetch( self, imgPath ):
+        """Return tuple (path of copy, True if copy was available before). The copy is
+        created in case it is not available. Raises exception if image could not be copied
+        """
+        cachePath = self.getPath( imgPath )
+        if os.path.isfile( cachePath ):
+            return ( cachePath, True )
+
+        logging.debug( "Image %s not in cache, try to copy now", imgPath )
+        os.makedirs( os.path.dirname( cachePath ), exist_ok=True )
+        tmpName = "{}.{}.tmp".format( cachePath, threading.get_ident() )
+        shutil.copyfile( imgPath, tmpName )
+        os.replace( tmpName, cachePath )
+        return ( cachePath, False )
+
+
+    def move( self, oldImgPath, newImgPath ):
+        """Move copy of oldImgPath to the copy of newImgPath, used after an album was
+        renamed or moved. Return True in case a copy was moved
+        """
+        oldPath = self.getPath( oldImgPath )
+        newPath = self.getPath( newImgPath )
+        if not os.path.isfile( oldPath ) or os.path.exists( newPath ):
+            return False
+        os.makedirs( os.path.dirname( newPath ), exist_ok=True )
+        os.replace( oldPath, newPath )
+        return True
+
+
+    def moveAlbum( self, oldAlbum, newAlbum ):
+        """Move copies of all images of oldAlbum to the images with same name of newAlbum.
+        Return number of images moved
+        """
+        count = 0
+        newImages = set( newAlbum.getImageFiles() )
+        for oldImgPath in oldAlbum.getImageFiles():
+            newImgPath = os.path.join( newAlbum.getPath(), os.path.relpath( oldImgPath, oldAlbum.getPath() ) )
+            if newImgPath in newImages:
+                try:
+                    count += self.move( oldImgPath, newImgPath )
+                except OSError as e:
+                    logging.warning( "Could not move cached image {}: {}".format( oldImgPath, e ) )
+        return count
+
+
+    def prewarm( self, imgPaths, concurrency=4 ):
+        """Copy all given images not available so far into the cache. Copies are done
+        with concurrency threads, which hides the latency of network storage.
+        Return dictionary with number of images "copied", "cached" (available before)
+        and "failed"
+        """
+        result = { "copied": 0, "cached": 0, "failed": 0 }
+        with concurrent.futures.ThreadPoolExecutor( max( 1, concurrency ) ) as executor:
+            futures = { executor.submit( self.fetch, imgPath ): imgPath for imgPath in imgPaths }
+            for future in concurrent.futures.as_completed( futures ):
+                try:
+                    cached = future.result()[1]
+                except Exception as e:
+                    logging.warning( "Could not copy image {} to cache: {}".format( futures[future], e ) )
+                    result["failed"] += 1
+                    continue
+                result["cached" if cached else "copied"] += 1
+        return result
+
+
+    def getSize( self ):
+        """Return tuple (number of files, bytes) of cache
+        """
+        numFiles = 0
+        numBytes = 0
+        for root, dirs, files in os.walk( self._cacheDir ):
+            for name in files:
+                try:
+                    numBytes += os.path.getsize( os.path.join( root, name ) )
+                    numFiles += 1
+                except OSError:
+                    pass
+        return ( numFiles, numBytes )
@@ -0,0 +1,84 @@
+#!/bin/python3
+# 
+# Copyright Florian Pfanner 2026
+#
+# This file is part of AudioPlayer.
+# 
+# AudioPlayer is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# AudioPlayer is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+# 
+# You should have received a copy of the GNU General Public License
+# along with AudioPlayer. If not, see <https://www.gnu.org/licenses/>.
+# 
+# 
+
+
+
+
+import configparser
+
+
+
+def _parseValue( text ):
+    """Parse value of ini file like QSettings does: a comma separated value is
+    returned as list of strings, quotes are removed
+    """
+    items = []
+    item = ""
+    quoted = False
+    for char in text + ",":
+        if char == "," and not quoted:
+            item = item.strip()
+            if len( item ) >= 2 and item[0] == '"' and item[-1] == '"':
+                item = item[1:-1]
+            items.append( item )
+            item = ""
+            continue
+        if char == '"':
+            quoted = not quoted
+        item += char
+    if len( items ) == 1:
+        return items[0]
+    return items
+
+
+
+class CIniSettings:
+    """Read only access to a settings file in ini format without Qt. Keys and values
+    are compatible to QSettings( fileName, QSettings.IniFormat ), thus the same
+    settings file is used by the player and by tools like libraryTool.
+    """
+
+    def __init__( self, fileName ):
+        parser = configparser.ConfigParser( interpolation=None, strict=False )
+        parser.optionxform = str                    # keys are case sensitive
+        with open( fileName, "r" ) as fp:
+            parser.read_file( fp )
+
+        self._fileName = fileName
+        self._values = {}
+        for section in parser.sections():
+            prefix = "" if section == "General" else section + "/"
+            for key, text in parser.items( section ):
+                self._values[prefix + key] = _parseValue( text )
+
+
+    def fileName( self ):
+        return self._fileName
+
+
+    def contains( self, key ):
+        return key in self._values
+
+
+    def value( self, key, default=None ):
+        """Return value of key ("section/name"), default in case key is not available
+        """
+        return self._values.get( key, default )
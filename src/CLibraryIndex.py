@@ -0,0 +1,1401 @@
+#!/bin/python3
+# 
+# Copyright Florian Pfanner 2026
+#
+# This file is part of AudioPlayer.
+# 
+# AudioPlayer is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# AudioPlayer is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+# 
+# You should have received a copy of the GNU General Public License
+# along with AudioPlayer. If not, see <https://www.gnu.org/licenses/>.
+# 
+# 
+
+
+import os
+import re
+import logging
+import json
+import pathlib
+import threading
+import time
+import hashlib
+import unicodedata
+import concurrent.futures
+
+import CFileSystem
+import CRecentIndex
+
+
+
+def getCacheDirectory( settings ):
+    """Return directory of local cache configured in settings
+    """
+    return settings.value( "library/cacheDir", "" ) or os.path.join( pathlib.Path.home(), ".cache", "AudioPlayer" )
+
+
+
+def getListSetting( settings, key, default ):
+    """Return setting which could be a single value or a list as list
+    """
+    value = settings.value( key, default )
+    if isinstance( value, str ):
+        value = [ value ]
+    return value
+
+
+
+def getRootSetting( settings, key, idx, default ):
+    """Return setting library/key of root with index idx. In case of a list the
+    value at position idx is used (last one if list is shorter), otherwise the
+    value applies to all roots
+    """
+    value = settings.value( "library/" + key, default )
+    if isinstance( value, list ):
+        value = value[idx] if idx < len( value ) else value[-1]
+    return value
+
+
+
+def isAlbumTableEnabled( settings ):
+    """Return True in case setting library/albumTable is enabled and NumPy is available
+    """
+    if not int( settings.value( "library/albumTable", 0 ) ):
+        return False
+    try:
+        import CAlbumTable
+    except ImportError as e:
+        logging.warning( "Album table disabled, NumPy not available: {}".format( e ) )
+        return False
+    return True
+
+
+
+def _toRelative( path, root ):
+    """Return path relative to root directory, path itself in case it is not below root
+    """
+    if root is None:
+        return path
+    prefix = root.rstrip( "/" ) + "/"
+    if path.startswith( prefix ):
+        return path[len( prefix ):]
+    return path
+
+
+def _toAbsolute( path, root ):
+    """Inverse of _toRelative, path is resolved against given root directory
+    """
+    if root is None or path.startswith( "/" ):
+        return path
+    return root.rstrip( "/" ) + "/" + path
+
+
+
+def createRoots( settings, cacheDir=None, fileSystem=None ):
+    """Return list with one CLibraryRoot for each directory of setting library/dirs
+    :param cacheDir:    Directory of the persisted trees, None to disable persistence
+    :param fileSystem:  CFileSystem used for scans, created from settings if None
+    """
+    if fileSystem is None:
+        fileSystem = CFileSystem.createFileSystem( settings )
+    roots = []
+    names = set()
+    for idx, directory in enumerate( getListSetting( settings, "library/dirs", [] ) ):
+        name = getRootSetting( settings, "rootName", idx, "" )
+        if name:
+            if name in names:
+                raise Exception( "Root name {} of {} is used by another root, change library/rootName".format( name, directory ) )
+        else:
+            # roots share cache file and album names if their directories have the same base name
+            baseName = CLibraryRoot.getNameOfPath( directory )
+            name = baseName
+            suffix = 2
+            while name in names:
+                name = "{}-{}".format( baseName, suffix )
+                suffix += 1
+            if name != baseName:
+                logging.warning( "Root name %s of %s is used by another root, use %s. Set library/rootName to choose a name",
+                                 baseName, directory, name )
+        names.add( name )
+        cacheFile = None
+        if cacheDir is not None:
+            # file is named by root name, not by path, thus index is found independent of mount point
+            cacheFile = os.path.join( cacheDir, "library-{}.json".format( hashlib.sha1( name.encode() ).hexdigest()[0:16] ) )
+            legacyFile = os.path.join( cacheDir, "library-{}.json".format( hashlib.sha1( directory.encode() ).hexdigest()[0:16] ) )
+            if not os.path.exists( cacheFile ) and os.path.exists( legacyFile ):
+                os.replace( legacyFile, cacheFile )
+            _migrateImageCache( os.path.join( cacheDir, "img" ), directory, name )
+        rootFileSystem = fileSystem
+        dirTimeout = float( getRootSetting( settings, "dirTimeout", idx, 10 ) )
+        if dirTimeout > 0:
+            rootFileSystem = CFileSystem.CDeadlineFileSystem( fileSystem, dirTimeout )
+        roots.append( CLibraryRoot( directory,
+                                    int( getRootSetting( settings, "updateCache", idx, 600 ) ),
+                                    float( getRootSetting( settings, "scanDelay", idx, 10 ) ) / 1000.0,
+                                    int( getRootSetting( settings, "scanConcurrency", idx, 1 ) ),
+                                    getRootSetting( settings, "watch", idx, "poll" ),
+                                    cacheFile,
+                                    rootFileSystem,
+                                    float( getRootSetting( settings, "retryDelay", idx, 60 ) ),
+                                    name ) )
+    return roots
+
+
+
+def _migrateImageCache( imageCacheDir, directory, name ):
+    """Move image copies of root directory from the legacy layout (below the absolute
+    path of the root) to the directory of the root name, see CImageCache.getPath
+    """
+    legacyDir = os.path.join( imageCacheDir, directory.strip( "/" ) )
+    nameDir = os.path.join( imageCacheDir, name )
+    if os.path.normpath( legacyDir ) == os.path.normpath( nameDir ) or not os.path.isdir( legacyDir ) or os.path.exists( nameDir ):
+        return
+    try:
+        os.replace( legacyDir, nameDir )
+        logging.info( "Moved image cache of %s to %s", directory, nameDir )
+    except OSError as e:
+        logging.warning( "Could not move image cache of %s to %s: %s", directory, nameDir, e )
+        return
+    try:
+        os.removedirs( os.path.dirname( legacyDir ) )       # empty parents of legacy path
+    except OSError:
+        pass
+
+
+
+_NUMBER_PATTERN = re.compile( r"([0-9]+)" )
+
+def naturalSortKey( text ):
+    """Return key to sort text natural: numbers by their value ("Kapitel 2" before
+    "Kapitel 10"), case insensitive and accents ignored ("Ärzte" next to "Arzte"). The
+    path separator sorts first, thus a directory is followed by its sub directories.
+    The key is a plain string, thus it is stored in the index and compared fast
+    """
+    text = unicodedata.normalize( "NFKD", text.casefold() )
+    text = "".join( char for char in text if not unicodedata.combining( char ) )
+    parts = _NUMBER_PATTERN.split( text.replace( "/", "\x00" ) )
+    for idx in range( 1, len( parts ), 2 ):
+        digits = parts[idx].lstrip( "0" ) or "0"
+        parts[idx] = "\x01" + chr( 0x30 + len( digits ) ) + digits       # shorter number is smaller
+    return "".join( parts )
+
+
+def _fileSortKey( path ):
+    return naturalSortKey( os.path.basename( path ) )
+
+
+
+def computeFingerprint( audioFiles, sampleSize, fileSystem=None ):
+    """Return tuple (fingerprint, total size in bytes) of album content. Fingerprint is
+    build of name and size of each audio file and hash of the first sampleSize bytes of
+    the first track. Does not depend on the path of the album, thus a renamed or moved
+    album has the same fingerprint.
+    Raises OSError in case a file could not be read
+    :param fileSystem:  CFileSystem or CScanContext used to read the files, thus the
+                        deadline of the scan applies
+    """
+    if fileSystem is None:
+        fileSystem = CFileSystem.CFileSystem()
+    audioFiles = sorted( audioFiles )          # independent of sort order of tracks
+    sizes, sample = fileSystem.readFiles( audioFiles, sampleSize )
+    digest = hashlib.sha1()
+    for path, size in zip( audioFiles, sizes ):
+        digest.update( "{}\0{}\0".format( os.path.basename( path ), size ).encode() )
+    digest.update( sample )
+    totalSize = sum( sizes )
+    return ( digest.hexdigest()[0:20], totalSize )
+
+
+
+def getAlbumMoves( added, removed ):
+    """Return list of tuples (removed album, added album) with same fingerprint, thus
+    album was renamed or moved. Albums without fingerprint or with a fingerprint which
+    is not unique are not matched, also changed albums at the same path
+    :param added:       CAudioAlbum objects added, see CAudioDirectory.getAlbumChanges
+    :param removed:     CAudioAlbum objects removed
+    """
+    def byFingerprint( albums ):
+        res = {}
+        for album in albums:
+            fingerprint = album.getFingerprint()
+            if fingerprint is not None:
+                res[fingerprint] = None if fingerprint in res else album
+        return res
+
+    removedMap = byFingerprint( removed )
+    moves = []
+    for fingerprint, album in byFingerprint( added ).items():
+        oldAlbum = removedMap.get( fingerprint )
+        if album is not None and oldAlbum is not None and oldAlbum.getPath() != album.getPath():
+            moves.append( ( oldAlbum, album ) )
+    return moves
+
+
+
+def _consume( generator ):
+    """Iterate generator until its end and return its return value
+    """
+    while True:
+        try:
+            next( generator )
+        except StopIteration as stop:
+            return stop.value
+
+
+
+class CScanContext:
+    """State of one scan: file system access, throttling, cancellation and progress
+    (see CScanWorker) and bookkeeping of directories which could not be read. These
+    directories are retried with exponential backoff, until then their last known
+    content is used.
+    """
+
+    def __init__( self, fileSystem=None, delay=None, control=None, failures=None, retryDelay=60.0, maxRetryDelay=3600.0 ):
+        """
+        :param delay:       Time in s to sleep after each directory entry or None
+        :param control:     CScanWorker or None
+        :param failures:    Dictionary path and [ number of failures, time.monotonic() of next retry ],
+                            kept between scans
+        """
+        self._fileSystem = fileSystem if fileSystem is not None else CFileSystem.CFileSystem()
+        self._delay = delay
+        self._control = control
+        self._failures = failures if failures is not None else {}
+        self._retryDelay = retryDelay
+        self._maxRetryDelay = maxRetryDelay
+        self._numFailures = 0
+        self._lock = threading.Lock()
+
+
+    def readDirectory( self, path ):
+        return self._fileSystem.readDirectory( path )
+
+    def readFiles( self, paths, sampleSize ):
+        return self._fileSystem.readFiles( paths, sampleSize )
+
+    def throttle( self ):
+        if self._delay:
+            time.sleep( self._delay )         # short sleep to allow other threads to continue and to reduce CPU load
+
+    def checkCancelled( self ):
+        if self._control is not None:
+            self._control.checkCancelled()
+
+    def directoryFound( self ):
+        if self._control is not None:
+            self._control.directoryFound()
+
+    def directoryDone( self ):
+        if self._control is not None:
+            self._control.directoryDone()
+
+
+    def isBackingOff( self, path ):
+        """Return True in case path failed before and next retry is not reached so far
+        """
+        with self._lock:
+            failure = self._failures.get( path )
+        return failure is not None and time.monotonic() < failure[1]
+
+
+    def failed( self, path, error ):
+        """Remember that path could not be read
+        """
+        with self._lock:
+            count = self._failures.get( path, [ 0, 0.0 ] )[0] + 1
+            retryDelay = min( self._maxRetryDelay, self._retryDelay * 2 ** ( count - 1 ) )
+            self._failures[path] = [ count, time.monotonic() + retryDelay ]
+            self._numFailures += 1
+        logging.warning( "Could not read %s (%s), retry in %.0fs", path, error, retryDelay )
+
+
+    def succeeded( self, path ):
+        with self._lock:
+            self._failures.pop( path, None )
+
+
+    def getNumFailures( self ):
+        """Return number of directories which could not be read during this scan
+        """
+        return self._numFailures
+
+
+
+class CAudioAlbum:
+    """Represents one directory with audio files and an optional image"""
+
+    def __init__( self, directoryPath, audioLibraryObj, parentDir, listing=None, previous=None, context=None ):
+        """
+        :param listing:     Result of CFileSystem.readDirectory of directoryPath, if already read
+        :param previous:    Last known CAudioAlbum of directoryPath or None. Its fingerprint
+                            is reused in case the content did not change
+        :param context:     CScanContext of this scan or None, used to read the files for the fingerprint
+        """
+        self._path = directoryPath
+        self._libObj = audioLibraryObj
+        self._parentDir = parentDir         # parent CAudioDirectory object
+        self._imageFiles = []
+        self._audioFiles = []
+        self._directoryDate = None
+        self._fingerprint = None            # see computeFingerprint, None if not available
+        self._size = None                   # total size of audio files in bytes, None if not available
+        self._sortKey = None                # see naturalSortKey, computed once at scan time
+
+        if directoryPath is not None:
+            self._searchDirectory( self._libObj.getAudioExtensions(), self._libObj.getImageExtensions(), listing )
+            self._updateFingerprint( previous, context )
+            self._sortKey = self._createSortKey()
+
+
+    def __eq__( self, other ):
+        return self._path == other._path and \
+               self._imageFiles == other._imageFiles and    \
+               self._audioFiles == other._audioFiles and    \
+               self._directoryDate == other._directoryDate and \
+               self._fingerprint == other._fingerprint and \
+               self._size == other._size and \
+               self._sortKey == other._sortKey
+
+    def __ne__( self, other ):
+        return not ( self == other )
+
+
+    def _searchDirectory( self, audioExtensions, imageExtensions, listing ):
+        """Search in own path for audio files and image
+        """
+        logging.debug( "Search in directory %s for album files", self._path )
+        if listing is None:
+            listing = CFileSystem.CFileSystem().readDirectory( self._path )
+        directoryDate, entries = listing
+        self._libObj._addScanEntries( len( entries ) )
+        for entry, isDir, isFile in entries:
+            entryPathName = os.path.join( self._path, entry )
+            if not entry.startswith('.') and isFile:
+                logging.debug( "  Found file %s", entry )
+                extension = os.path.splitext( entry )[1]
+                if extension in audioExtensions:
+                    self._audioFiles.append( entryPathName )
+                elif extension in imageExtensions:
+                    self._imageFiles.append( entryPathName )
+        self._imageFiles.sort( key=_fileSortKey )
+        self._audioFiles.sort( key=_fileSortKey )
+
+        self._directoryDate = directoryDate
+
+        logging.debug( " Found %s file(s) and %s image(s)", len( self._audioFiles ), len( self._imageFiles ) )
+
+
+    def _createSortKey( self ):
+        """Return sort key of album. Derived from position in tree (root name and path
+        below root), not from mount point
+        """
+        if self._parentDir is None:
+            return naturalSortKey( self._path )
+        return naturalSortKey( self._parentDir.getName() + "/" + os.path.basename( self._path ) )
+
+
+    def _updateFingerprint( self, previous, context ):
+        """Take fingerprint and size of previous album if content is unchanged, else compute them.
+        Costs a stat of each track and a read of the first track, thus in a first scan
+        or after a change only. A file which could not be read (or timed out) counts as
+        failure of the scan, the album is kept without fingerprint
+        """
+        if previous is not None and previous._audioFiles == self._audioFiles and previous._directoryDate == self._directoryDate:
+            self._fingerprint = previous._fingerprint
+            self._size = previous._size
+        sampleSize = self._libObj.getFingerprintSize()
+        if ( self._fingerprint is None or self._size is None ) and sampleSize > 0 and self._audioFiles:
+            try:
+                self._fingerprint, self._size = computeFingerprint( self._audioFiles, sampleSize, context )
+            except OSError as e:
+                if context is not None:
+                    context.failed( self._path, e )
+                else:
+                    logging.debug( "No fingerprint of %s: %s", self._path, e )
+
+
+    def toDict( self, root=None ):
+        """
+        :param root:    Root directory, paths are written relative to it
+        """
+        return { "type": "CAudioAlbum",
+                 "path": _toRelative( self._path, root ),
+                 "imageFiles": [ _toRelative( path, root ) for path in self._imageFiles ],
+                 "audioFiles": [ _toRelative( path, root ) for path in self._audioFiles ],
+                 "directoryDate": self._directoryDate,
+                 "fingerprint": self._fingerprint,
+                 "size": self._size,
+                 "sortKey": self._sortKey }
+
+    def fromDict( self, data, root=None ):
+        """
+        :param root:    Root directory relative paths are resolved against
+        """
+        if data["type"] != "CAudioAlbum":
+            raise Exception( "Wrong type {}".format( str( data ) ) )
+        self._path = _toAbsolute( data["path"], root )
+        self._imageFiles = [ _toAbsolute( path, root ) for path in data["imageFiles"] ]
+        self._audioFiles = [ _toAbsolute( path, root ) for path in data["audioFiles"] ]
+        self._directoryDate = data["directoryDate"]
+        self._fingerprint = data.get( "fingerprint" )
+        self._size = data.get( "size" )
+        self._sortKey = data.get( "sortKey" )
+        if self._sortKey is None:
+            # written by previous version, tracks are not sorted natural so far
+            self._imageFiles.sort( key=_fileSortKey )
+            self._audioFiles.sort( key=_fileSortKey )
+            self._sortKey = self._createSortKey()
+
+
+    def getNumAudioFiles( self ):
+        """Return number of audio files in this album
+        """
+        return len( self._audioFiles )
+
+    def getAudioFiles( self ):
+        """Return list with audio files of this album
+        """
+        return self._audioFiles
+
+    def getImageFiles( self ):
+        """Return list with all image files of this album
+        """
+        return self._imageFiles
+
+
+    def getImage( self, idx=0, size=None ):
+        """Return image object of this album. Return None in case image is not
+        available or error during load.
+        :param size:    Image is decoded at a size fitting into it, full size if None
+        """
+        res = None
+        if idx < len( self._imageFiles ):
+            res = self._libObj.getImage( self._imageFiles[idx], size )
+        return res
+
+
+
+    def getNumImageFiles( self ):
+        """Return number of image files in this album
+        """
+        return len( self._imageFiles )
+
+    def getPath( self ):
+        """Return path to this directory
+        """
+        return self._path
+
+    def getName( self ):
+        """Return name of this object derived from path
+        """
+        return CAudioAlbum.getNameOfPath( self._path )
+
+    @staticmethod
+    def getNameOfPath( path ):
+        """Return name of album with given path
+        """
+        return path.replace( " ", "" ).replace( "/", "" )
+
+    def getDisplayName( self ):
+        """Return last directory part which might be shown in case no picture is available
+        """
+        return os.path.basename( self._path )
+
+    def getDate( self ):
+        """Return create timestamp of directory
+        """
+        return self._directoryDate
+
+    def getSortKey( self ):
+        """Return key albums are sorted by, see naturalSortKey
+        """
+        return self._sortKey
+
+    def getSize( self ):
+        """Return total size of audio files in bytes, None if not available
+        """
+        return self._size
+
+    def getFingerprint( self ):
+        """Return fingerprint of content independent of path, None if not available
+        """
+        return self._fingerprint
+
+    def getParentDir( self ):
+        """Return parent CAudioDirectory object
+        """
+        return self._parentDir
+
+    def getRootName( self ):
+        """Return name of library root the album belongs to, see CLibraryRoot.getName
+        """
+        directory = self._parentDir
+        if directory is None:
+            return ""
+        while directory.getParentDir() is not None:
+            directory = directory.getParentDir()
+        return directory.getName()[len( "root/" ):]
+
+
+
+class CAudioDirectory:
+    """Represents one directory with at least one other audio directory or album directory
+    """
+
+    def __init__( self, audioLibraryObj, parentDir, name=None ):
+        """
+        :param name:    Name of root directory, derived from path if None
+        """
+        self._libObj = audioLibraryObj
+        self._parentDir = parentDir         # parent CAudioDirectory or None in case of root
+        self._childs = {}                   # child name and object, kept in natural order, see _sortChilds
+        self._staleChilds = set()           # name of childs taken from previous scan, see adoptStale
+        self._imageFiles = []
+        self._sortKey = None                # derived from name on first use
+        self._firstAlbumName = None         # cached result of getFirstAlbumName
+        if parentDir is not None:
+            self._name = parentDir.getName() + "/"
+        elif name is not None:
+            self._name = "root/" + name
+        else:
+            self._name = "root/"
+
+
+    def __eq__( self, other ):
+        if self._imageFiles != other._imageFiles:
+            return False
+
+        if self._childs.keys() != other._childs.keys():
+            return False
+
+        for childName, child in self._childs.items():
+            if child != other._childs[childName]:
+                return False
+
+        return True
+
+
+    def __ne__( self, other ):
+        return not ( self == other )
+
+
+    def toDict( self, root=None ):
+        """
+        :param root:    Root directory, paths are written relative to it
+        """
+        childsData = []
+        for child in self._childs:
+            childsData.append( self._childs[child].toDict( root ) )
+        return { "type": "CAudioDirectory",
+                "name": self._name,
+                "imageFiles": [ _toRelative( path, root ) for path in self._imageFiles ],
+                "stale": sorted( self._staleChilds ),
+                "childs": childsData }
+
+    def fromDict( self, data, root=None ):
+        """
+        :param root:    Root directory relative paths are resolved against
+        """
+        if data["type"] != "CAudioDirectory":
+            raise Exception( "Invalid type: {}".format( str( data ) ) )
+        self._name = data["name"]
+        self._imageFiles = sorted( ( _toAbsolute( path, root ) for path in data["imageFiles"] ), key=_fileSortKey )
+        self._staleChilds = set( data.get( "stale", [] ) )
+        self._childs.clear()
+        for childData in data["childs"]:
+            if childData["type"] == "CAudioDirectory":
+                child = CAudioDirectory( self._libObj, self )
+            else:
+                child = CAudioAlbum( None, self._libObj, self )
+            child.fromDict( childData, root )
+            logging.debug( "Restored %s: %s", child, child.getName() )
+            self._childs[child.getName()] = child
+        self._sortChilds()
+
+
+    def addPath( self, path, splash, context=None, concurrency=1, previous=None ):
+        """Build up tree of given path
+        :param context:     CScanContext of this scan or None
+        :param concurrency: Number of threads sub directories of path are scanned with
+        :param previous:    Last known CAudioDirectory of path or None. Sub trees which
+                            could not be read are taken from this tree and marked as stale
+        """
+        if context is None:
+            context = CScanContext()
+        context.directoryFound()
+        if concurrency > 1:
+            if self._name.endswith( "/" ):
+                self._name += os.path.basename( path )
+            listing = self._readListing( path, context, previous )
+            if listing is not None:
+                self._searchDirectoryParallel( self._libObj.getImageExtensions(), path, context, previous, listing, concurrency )
+            context.directoryDone()
+        else:
+            for album in self.scanPath( path, splash, context, previous ):
+                pass
+
+    def scanPath( self, path, splash, context=None, previous=None, listing=None ):
+        """Same as addPath, but generator which yields each CAudioAlbum
+        object as soon as it is found. The tree is build up while iterating.
+        :param listing:     Result of CFileSystem.readDirectory of path, if already read
+        """
+        if context is None:
+            context = CScanContext()
+        if self._name.endswith( "/" ):
+            self._name += os.path.basename( path )
+        if listing is None:
+            listing = self._readListing( path, context, previous )
+        if listing is not None:
+            yield from self._searchDirectory( self._libObj.getImageExtensions(), path, splash, context, previous, listing )
+        context.directoryDone()
+
+    def getNumChilds( self ):
+        """Return number of child directories
+        """
+        return len( self._childs )
+
+    def getChildList( self ):
+        """Return list with name of child elements in natural order, see naturalSortKey
+        """
+        return list( self._childs )
+
+    def iterChilds( self ):
+        """Return iterator over tuples (name, child object) in order of getChildList,
+        without copying the list
+        """
+        return iter( self._childs.items() )
+
+    def _sortChilds( self ):
+        """Bring childs in natural order once after they are added, thus readers do not
+        have to sort
+        """
+        childs = self._childs
+        order = sorted( childs, key=lambda childName: ( childs[childName].getSortKey() or "", childName ) )
+        self._childs = { childName: childs[childName] for childName in order }
+        self._firstAlbumName = None
+
+    def getSortKey( self ):
+        """Return key directories are sorted by, see naturalSortKey
+        """
+        if self._sortKey is None:
+            self._sortKey = naturalSortKey( self._name )
+        return self._sortKey
+
+    def getChild( self, childName ):
+        """Return one child item
+        """
+        assert childName in self._childs
+        return self._childs[childName]
+
+    def isChildStale( self, childName ):
+        """Return True in case child could not be read during last scan and its
+        last known content is used
+        """
+        return childName in self._staleChilds
+
+    def _readListing( self, path, context, previous ):
+        """Read own directory. On error (or during backoff after an error) the content
+        of previous is used and None is returned. Without previous the error is raised.
+        """
+        if previous is not None and context.isBackingOff( path ):
+            self.adoptStale( previous )
+            return None
+        try:
+            listing = context.readDirectory( path )
+        except OSError as e:
+            context.failed( path, e )
+            if previous is None:
+                raise
+            self.adoptStale( previous )
+            return None
+        context.succeeded( path )
+        return listing
+
+    def adoptStale( self, previous ):
+        """Use content of previous directory object, all childs are marked as stale
+        """
+        self._imageFiles = list( previous._imageFiles )
+        for childName, child in previous._childs.items():
+            self._childs[childName] = child
+            self._staleChilds.add( childName )
+            child._parentDir = self             # previous tree is released after the scan
+        self._sortChilds()
+
+    def _addChild( self, child, stale ):
+        self._childs[child.getName()] = child
+        child._parentDir = self                 # stale child is taken from previous tree
+        if stale:
+            self._staleChilds.add( child.getName() )
+
+    def _searchDirectory( self, imageExtensions, path, splash, context, previous, listing ):
+        """Search in own path for albums or other directories
+        """
+        logging.debug( "Search in directory %s for directories or albums", path )
+        entries = listing[1]
+        self._libObj._addScanEntries( len( entries ) )
+        for entry, isDir, isFile in entries:
+            context.checkCancelled()
+            entryPathName = os.path.join( path, entry )
+            if not entry.startswith( '.' ) and isDir:
+                logging.debug( "  Found directory %s", entry )
+                context.directoryFound()
+                if splash is not None:
+                    splash.showMessage( self._libObj.tr( "Search in directory {} for audio files" ).format( entry ) )
+                child, stale = yield from self._scanEntry( entryPathName, splash, context, previous )
+                if child is not None:
+                    self._addChild( child, stale )
+            elif not entry.startswith( "." ) and isFile:
+                # also look for image files
+                extension = os.path.splitext( entry )[1]
+                if extension in imageExtensions:
+                    self._imageFiles.append( entryPathName )
+            context.throttle()
+
+        self._imageFiles.sort( key=_fileSortKey )
+        self._sortChilds()
+
+
+    def _searchDirectoryParallel( self, imageExtensions, path, context, previous, listing, concurrency ):
+        """Same as _searchDirectory, but sub directories are scanned by concurrency threads
+        """
+        logging.debug( "Search in directory %s with %s threads", path, concurrency )
+        entries = listing[1]
+        self._libObj._addScanEntries( len( entries ) )
+        subDirectories = []
+        for entry, isDir, isFile in entries:
+            context.checkCancelled()
+            entryPathName = os.path.join( path, entry )
+            if not entry.startswith( '.' ) and isDir:
+                context.directoryFound()
+                subDirectories.append( entryPathName )
+            elif not entry.startswith( "." ) and isFile:
+                extension = os.path.splitext( entry )[1]
+                if extension in imageExtensions:
+                    self._imageFiles.append( entryPathName )
+
+        with concurrent.futures.ThreadPoolExecutor( concurrency ) as executor:
+            scan = lambda entryPathName: _consume( self._scanEntry( entryPathName, None, context, previous ) )
+            for child, stale in executor.map( scan, subDirectories ):
+                if child is not None:
+                    self._addChild( child, stale )
+
+        self._imageFiles.sort( key=_fileSortKey )
+        self._sortChilds()
+
+
+    def _scanEntry( self, entryPathName, splash, context, previous ):
+        """Generator to scan one sub directory, yields albums found. Returns tuple of
+        CAudioAlbum or CAudioDirectory (None if directory does not contain any album) and
+        True in case child is taken from previous tree since directory could not be read
+        """
+        previousChild = None
+        if previous is not None:
+            previousChild = previous._childs.get( CAudioAlbum.getNameOfPath( entryPathName ) ) or \
+                            previous._childs.get( self._name + "/" + os.path.basename( entryPathName ) )
+
+        listing = None
+        if previousChild is None or not context.isBackingOff( entryPathName ):
+            try:
+                listing = context.readDirectory( entryPathName )
+                context.succeeded( entryPathName )
+            except OSError as e:
+                context.failed( entryPathName, e )
+        if listing is None:
+            context.directoryDone()
+            return ( previousChild, previousChild is not None )
+
+        albumObj = CAudioAlbum( entryPathName, self._libObj, self, listing,
+                                previousChild if isinstance( previousChild, CAudioAlbum ) else None, context )
+        if albumObj.getNumAudioFiles() > 0:
+            # found album
+            context.directoryDone()
+            yield albumObj
+            return ( albumObj, False )
+
+        # no album, try directory
+        dirObj = CAudioDirectory( self._libObj, self )
+        previousDir = previousChild if isinstance( previousChild, CAudioDirectory ) else None
+        yield from dirObj.scanPath( entryPathName, splash, context, previousDir, listing )
+        if dirObj.getNumChilds() > 0:
+            # found directory with at least one album
+            return ( dirObj, False )
+        logging.debug( " No content in directory %s", entryPathName )
+        return ( None, False )
+
+
+    def addChilds( self, other ):
+        """Add all childs and images of other directory to this one. Used to combine
+        the trees of several roots, the child objects are shared
+        """
+        if self._name.endswith( "/" ):
+            self._name = other._name
+        self._childs.update( other._childs )
+        self._staleChilds.update( other._staleChilds )
+        self._imageFiles = sorted( self._imageFiles + other._imageFiles, key=_fileSortKey )
+        self._sortChilds()
+
+
+    def getName( self ):
+        """Return name of this directory derived from tree and path
+        """
+        return self._name
+
+
+    def getParentDir( self ):
+        """Return parent CAudioDirectory object, None in case of root
+        """
+        return self._parentDir
+
+
+    def getFirstAlbumName( self ):
+        """Return first album found in my list. If first entry is a
+        directory, forward call to this object. None if directory does not
+        contain any album. Result is cached
+        """
+        if self._firstAlbumName is None:
+            for child in self._childs.values():
+                if isinstance( child, CAudioDirectory ):
+                    self._firstAlbumName = child.getFirstAlbumName()
+                else:
+                    self._firstAlbumName = child.getName()
+                if self._firstAlbumName is not None:
+                    break
+        return self._firstAlbumName
+
+
+    def shareSubtrees( self, other ):
+        """Replace each child which is equal to the child of other tree by the object
+        of the other tree, thus unchanged subtrees are shared between both trees. Has to
+        be called before this tree is published. Shared childs of a changed directory
+        are moved to it, thus the other tree is released once it is not used anymore.
+        Return True in case both trees are equal, then the other tree is used instead
+        of this one and its childs keep their parent
+        """
+        equal = self._imageFiles == other._imageFiles and len( self._childs ) == len( other._childs ) and \
+                self._staleChilds == other._staleChilds
+        for childName, child in self._childs.items():
+            otherChild = other._childs.get( childName )
+            if otherChild is None or type( otherChild ) is not type( child ):
+                equal = False
+                continue
+            if isinstance( child, CAudioDirectory ):
+                childEqual = child.shareSubtrees( otherChild )
+            else:
+                childEqual = child == otherChild
+            if childEqual:
+                self._childs[childName] = otherChild
+            else:
+                equal = False
+        if not equal:
+            for child in self._childs.values():
+                child._parentDir = self
+        return equal
+
+
+    def iterAlbums( self ):
+        """Generator of all CAudioAlbum objects of this sub tree, depth first in order
+        of getChildList
+        """
+        for album, stale in self.iterAlbumEntries():
+            yield album
+
+    def iterAlbumEntries( self, stale=False ):
+        """Generator of tuples (CAudioAlbum, True if stale) of this sub tree, depth first
+        in order of getChildList. Album is stale if it or one of its parent directories
+        could not be read during last scan, see isChildStale
+        :param stale:   True if this directory is stale
+        """
+        for childName, child in self._childs.items():
+            childStale = stale or childName in self._staleChilds
+            if isinstance( child, CAudioDirectory ):
+                yield from child.iterAlbumEntries( childStale )
+            else:
+                yield ( child, childStale )
+
+    def walk( self ):
+        """Generator of this directory and all sub directories (CAudioDirectory objects),
+        depth first in order of getChildList
+        """
+        yield self
+        for child in self._childs.values():
+            if isinstance( child, CAudioDirectory ):
+                yield from child.walk()
+
+
+    def getAlbumChanges( self, other, added=None, removed=None ):
+        """Compare this tree with other (older) tree. Subtrees shared by both trees
+        are skipped. Return tuple of lists (added albums, removed albums), a changed
+        album is reported as removed and added.
+        """
+        if added is None:
+            added = []
+            removed = []
+        for childName, child in self._childs.items():
+            otherChild = other._childs.get( childName )
+            if otherChild is child:
+                continue
+            if isinstance( child, CAudioDirectory ) and isinstance( otherChild, CAudioDirectory ):
+                child.getAlbumChanges( otherChild, added, removed )
+                continue
+            if otherChild is not None and type( otherChild ) is type( child ) and otherChild == child:
+                continue
+            if isinstance( child, CAudioDirectory ):
+                added.extend( child.iterAlbums() )
+            else:
+                added.append( child )
+            if isinstance( otherChild, CAudioDirectory ):
+                removed.extend( otherChild.iterAlbums() )
+            elif otherChild is not None:
+                removed.append( otherChild )
+        for childName, otherChild in other._childs.items():
+            if childName in self._childs:
+                continue
+            if isinstance( otherChild, CAudioDirectory ):
+                removed.extend( otherChild.iterAlbums() )
+            else:
+                removed.append( otherChild )
+        return ( added, removed )
+
+
+
+class CLibrarySnapshot:
+    """Consistent state of the library: audio tree, album map and sorted album lists.
+    A snapshot is never modified after creation. The library publishes a new snapshot
+    by replacing its reference, thus readers of any thread fetch the reference once
+    and work on a consistent state without locking.
+    """
+
+    def __init__( self, audioTree, albumMap=None, dirFirstAlbums=None, previous=None, newestSize=100, albumTable=False ):
+        """
+        :param audioTree:       Root CAudioDirectory, must not be changed afterwards
+        :param albumMap:        Album name and album object. Derived from tree if None
+        :param dirFirstAlbums:  First album of each top directory. Derived from tree if None
+        :param previous:        Previous snapshot. Its index of newest albums is updated with
+                                the albums changed between both trees
+        :param newestSize:      Number of albums in index of newest albums
+        :param albumTable:      If True album lists and queries are served by a CAlbumTable
+                                (needs NumPy), build on first use
+        """
+        self._audioTree = audioTree
+        self._numDirectories = 0
+        self._staleAlbums = set()           # albums of sub trees which could not be read during last scan
+        self._derivedFromTree = albumMap is None     # album map and newest index match audioTree
+        if albumMap is None:
+            albumMap = {}
+            self._addAlbums( audioTree, albumMap )
+        elif previous is not None:
+            previous = None                 # given album map is not necessarily derived from tree
+        self._albumMap = albumMap
+
+        if dirFirstAlbums is None:
+            dirFirstAlbums = [ child.getFirstAlbumName() for childName, child in audioTree.iterChilds()
+                               if isinstance( child, CAudioDirectory ) ]
+            dirFirstAlbums = [ name for name in dirFirstAlbums if name is not None ]
+
+        if previous is not None and ( not previous._derivedFromTree or previous._newestIndex.getCapacity() != newestSize ):
+            previous = None                 # e.g. progressive scan: index holds albums missing in its tree
+        self._newestIndex = self._createNewestIndex( previous, newestSize )
+
+        self._albumLists = { "dir": tuple( dirFirstAlbums ) }     # further lists are created on first use
+        self._albumIndex = {}
+        self._useAlbumTable = albumTable
+        self._albumTable = None
+
+
+    def _createNewestIndex( self, previous, newestSize ):
+        """Return CRecentIndex of this snapshot. Derived from index of previous snapshot
+        if available, only the albums of changed sub trees are updated
+        """
+        if previous is not None:
+            newestIndex = previous._newestIndex.copy()
+            added, removed = self._audioTree.getAlbumChanges( previous._audioTree )
+            for album in removed:
+                newestIndex.remove( album.getName() )
+            for album in added:
+                newestIndex.add( album.getName(), album.getDate() )
+            if not newestIndex.needsRefill():
+                return newestIndex
+        newestIndex = CRecentIndex.CRecentIndex( newestSize )
+        newestIndex.fill( ( albumName, album.getDate() ) for albumName, album in self._albumMap.items() )
+        return newestIndex
+
+
+    def _addAlbums( self, audioDirectory, albumMap ):
+        """Walk through audioDirectory and write all albums found to albumMap
+        """
+        self._numDirectories += sum( 1 for directory in audioDirectory.walk() )
+        for album, stale in audioDirectory.iterAlbumEntries():
+            if album.getName() in albumMap:
+                raise Exception( "Child name {} already in album map".format( album.getName() ) )
+            albumMap[ album.getName() ] = album
+            if stale:
+                self._staleAlbums.add( album.getName() )
+
+
+    def getTree( self ):
+        """Return root CAudioDirectory
+        """
+        return self._audioTree
+
+    def getNumAlbums( self ):
+        return len( self._albumMap )
+
+    def getNumDirectories( self ):
+        """Return number of directories (including root) with albums
+        """
+        return self._numDirectories
+
+    def getAlbum( self, albumName ):
+        """Return album object for given name. Return None in case not found
+        """
+        return self._albumMap.get( albumName )
+
+    def isAlbumStale( self, albumName ):
+        """Return True in case album is last known content of a directory which could
+        not be read during last scan
+        """
+        return albumName in self._staleAlbums
+
+    def getNumStaleAlbums( self ):
+        return len( self._staleAlbums )
+
+    def getAlbumList( self, type="full" ):
+        """Return sorted tuple with album names, see CAudioLibrary.getAlbumList. The
+        list is sorted on first use
+        """
+        if type not in self._albumLists:
+            albumMap = self._albumMap
+            albumTable = self.getAlbumTable()
+            if albumTable is not None and type in ( "full", "date" ):
+                albumList = albumTable.getNames( albumTable.order( type ) )
+            elif "full" == type:
+                albumList = sorted( albumMap, key=lambda albumName: ( albumMap[albumName].getSortKey(), albumName ) )
+            elif "date" == type:
+                albumList = sorted( albumMap, key=lambda albumName: ( albumMap[albumName].getDate(), albumMap[albumName].getSortKey() or "", albumName ) )
+            elif "newest" == type:
+                albumList = self._newestIndex.getNewest()
+            else:
+                raise Exception( "Order type/method {} not implemented yet".format( type ) )
+            self._albumLists[type] = tuple( albumList )
+        return self._albumLists[type]
+
+    def getAlbumTable( self ):
+        """Return CAlbumTable of this snapshot, None if disabled
+        """
+        if self._useAlbumTable and self._albumTable is None:
+            import CAlbumTable
+            self._albumTable = CAlbumTable.CAlbumTable( self._albumMap )
+        return self._albumTable
+
+    def queryAlbums( self, type="full", root=None, dateFrom=None, dateTo=None, minTracks=None, limit=None ):
+        """Return list with names of albums matching all given conditions
+        :param type:        Order of result, "full", "date" or "newest" (newest first)
+        :param root:        Name of root, see CLibraryRoot.getName
+        :param dateFrom:    Minimum date (timestamp, inclusive)
+        :param dateTo:      Maximum date (timestamp, exclusive)
+        :param minTracks:   Minimum number of audio files
+        :param limit:       Maximum number of albums, all if None
+        """
+        albumTable = self.getAlbumTable()
+        if albumTable is not None:
+            rows = albumTable.filter( root, dateFrom, dateTo, minTracks, type="full" if "newest" == type else type )
+            if "newest" == type:
+                rows = albumTable.newest( len( rows ) if limit is None else limit, rows )
+            elif limit is not None:
+                rows = rows[0:limit]
+            return albumTable.getNames( rows )
+
+        albumMap = self._albumMap
+        def matches( album ):
+            date = album.getDate() or 0.0
+            return ( root is None or album.getRootName() == root ) and \
+                   ( dateFrom is None or date >= dateFrom ) and \
+                   ( dateTo is None or date < dateTo ) and \
+                   ( minTracks is None or album.getNumAudioFiles() >= minTracks )
+        albumList = self.getAlbumList( "date" if "newest" == type else type )
+        result = []
+        for albumName in ( reversed( albumList ) if "newest" == type else albumList ):
+            if matches( albumMap[albumName] ):
+                result.append( albumName )
+                if limit is not None and len( result ) >= limit:
+                    break
+        return result
+
+    def getAlbumIndex( self, albumName, type="full" ):
+        """Return position of album in list of given type or None if not in list
+        """
+        if type not in self._albumIndex:
+            self._albumIndex[type] = { name: idx for idx, name in enumerate( self.getAlbumList( type ) ) }
+        return self._albumIndex[type].get( albumName )
+
+    def getNewestAlbums( self, count ):
+        """Return list with names of the count newest albums, newest first
+        """
+        if count <= self._newestIndex.getCapacity():
+            return self._newestIndex.getNewest( count )
+        return list( reversed( self.getAlbumList( "date" ) ) )[0:count]
+
+
+
+class CLibraryRoot:
+    """One root directory of the library with its own scan policy: refresh interval,
+    throttling, concurrency and watch mode. The tree of each root is persisted and
+    refreshed independently, thus a slow root does not delay the other ones.
+    """
+
+    def __init__( self, path, updateInterval=600, scanDelay=0.010, concurrency=1, watch="poll", cacheFile=None,
+                  fileSystem=None, retryDelay=60.0, name=None ):
+        """
+        :param updateInterval:  Time in s between two refreshes
+        :param scanDelay:       Time in s to sleep after each directory entry during refresh
+        :param concurrency:     Number of threads the sub directories of root are scanned with
+        :param watch:           "poll": refresh periodically, "manual": only refresh on request
+        :param cacheFile:       File the tree is persisted to, None to disable
+        :param fileSystem:      CFileSystem used for scans, e.g. CDeadlineFileSystem
+        :param retryDelay:      Time in s until first retry of a directory which could not be read
+        :param name:            Name of root, independent of mount point. Persisted tree and image
+                                cache are keyed by it. Derived from path if None
+        """
+        if watch not in ( "poll", "manual" ):
+            raise Exception( "Invalid watch mode {} of {}".format( watch, path ) )
+        self._path = path
+        self._name = name if name else CLibraryRoot.getNameOfPath( path )
+        self._updateInterval = updateInterval
+        self._scanDelay = scanDelay
+        self._concurrency = max( 1, concurrency )
+        self._watch = watch
+        self._cacheFile = cacheFile
+        self._fileSystem = fileSystem
+        self._retryDelay = retryDelay
+        self._failures = {}                 # failed directories, see CScanContext
+        self._lastScanFailures = 0
+        self._tree = None                   # CAudioDirectory of this root, None until loaded or scanned
+        self._worker = None                 # CScanWorker of running refresh
+        self._timer = None                  # QTimer starting next refresh, set by CAudioLibrary
+
+
+    def getPath( self ):
+        return self._path
+
+    def getName( self ):
+        return self._name
+
+    @staticmethod
+    def getNameOfPath( path ):
+        """Return default name of root with given path
+        """
+        return os.path.basename( path.rstrip( "/" ) ) or "root"
+
+    def getUpdateInterval( self ):
+        return self._updateInterval
+
+    def getScanDelay( self ):
+        return self._scanDelay
+
+    def getConcurrency( self ):
+        return self._concurrency
+
+    def getWatchMode( self ):
+        return self._watch
+
+    def getCacheFile( self ):
+        return self._cacheFile
+
+    def getTree( self ):
+        """Return current CAudioDirectory of root or None if not available so far
+        """
+        return self._tree
+
+    def setTree( self, tree ):
+        self._tree = tree
+
+    def getWorker( self ):
+        return self._worker
+
+    def setWorker( self, worker ):
+        self._worker = worker
+
+    def getTimer( self ):
+        return self._timer
+
+    def setTimer( self, timer ):
+        self._timer = timer
+
+
+    def createTree( self, audioLibraryObj ):
+        """Return new empty CAudioDirectory for this root
+        """
+        return CAudioDirectory( audioLibraryObj, None, self._name )
+
+
+    def readTree( self, audioLibraryObj ):
+        """Return tree read from cache file. Paths are stored relative to the root, thus
+        the file could be build on another machine with the library mounted elsewhere
+        """
+        tree = self.createTree( audioLibraryObj )
+        with open( self._cacheFile, "r" ) as fp:
+            tree.fromDict( json.load( fp ), self._path )
+        return tree
+
+
+    def load( self, audioLibraryObj ):
+        """Load persisted tree of root. Return True on success
+        """
+        if self._cacheFile is None:
+            return False
+        try:
+            self._tree = self.readTree( audioLibraryObj )
+            logging.info( "Successfully loaded previous state of {}".format( self._path ) )
+            return True
+        except FileNotFoundError:
+            logging.info( "No previous state of {}".format( self._path ) )
+        except Exception:
+            logging.exception( "Error load previous state of {}".format( self._path ) )
+        return False
+
+
+    def save( self, tree ):
+        """Write given tree to cache file of root. The file is replaced atomically
+        """
+        if self._cacheFile is None:
+            return
+        tmpName = self._cacheFile + ".tmp"
+        with open( tmpName, "w" ) as fp:
+            json.dump( tree.toDict( self._path ), fp )
+        os.replace( tmpName, self._cacheFile )
+
+
+    def getNextRetry( self ):
+        """Return time.monotonic() of next retry of a directory which could not be read,
+        None in case all directories were read
+        """
+        if not self._failures:
+            return None
+        return min( failure[1] for failure in self._failures.values() )
+
+    def getLastScanFailures( self ):
+        """Return number of directories which could not be read during last scan
+        """
+        return self._lastScanFailures
+
+
+    def createScanContext( self, control=None, throttle=False ):
+        """Return CScanContext for a scan of this root
+        :param throttle:    If True sleep scan delay after each directory entry
+        """
+        return CScanContext( self._fileSystem, self._scanDelay if throttle else None, control, self._failures,
+                             self._retryDelay, max( self._retryDelay, self._updateInterval ) )
+
+
+    def scan( self, audioLibraryObj, splash=None, control=None, throttle=False ):
+        """Build up and return new tree of root. Sub trees which could not be read are
+        taken from current tree
+        """
+        context = self.createScanContext( control, throttle )
+        tree = self.createTree( audioLibraryObj )
+        tree.addPath( self._path, splash, context, self._concurrency, self._tree )
+        if tree.getNumChilds() == 0 and self._tree is not None and self._tree.getNumChilds() > 0:
+            # e.g. network share not mounted and mount point is empty
+            context.failed( self._path, "no album found" )
+            tree.adoptStale( self._tree )
+        self._lastScanFailures = context.getNumFailures()
+        return tree
+
+
+
+class CLibraryIndex:
+    """Library without Qt and GUI: reads the library settings, loads, scans and
+    persists the trees of all roots the same way CAudioLibrary does. Used by
+    libraryTool to build the index and the image cache ahead of time.
+    """
+
+    def __init__( self, settings, fileSystem=None ):
+        """
+        :param settings:    QSettings or CIniSettings object
+        :param fileSystem:  CFileSystem used for scans, created from settings if None
+        """
+        self._settings = settings
+        self._audioExtensions = getListSetting( settings, "library/audioExtension", [ ".mp3" ] )
+        self._imageExtensions = getListSetting( settings, "library/imageExtension", [ ".png", ".jpg" ] )
+        self._cacheDir = None
+        if int( settings.value( "library/imageCache", True ) ):
+            self._cacheDir = getCacheDirectory( settings )
+            os.makedirs( self._cacheDir, exist_ok=True )
+        self._roots = createRoots( settings, self._cacheDir, fileSystem )
+        self._newestSize = int( settings.value( "library/newestIndexSize", 100 ) )
+        self._albumTable = isAlbumTableEnabled( settings )
+        self._fingerprintSize = int( settings.value( "library/fingerprintSize", 16384 ) )
+        self._numScanEntries = 0
+
+
+    def tr( self, text ):
+        return text
+
+    def getAudioExtensions( self ):
+        return self._audioExtensions
+
+    def getImageExtensions( self ):
+        return self._imageExtensions
+
+    def getFingerprintSize( self ):
+        """Return number of bytes of first track hashed for album fingerprint, 0 if disabled
+        """
+        return self._fingerprintSize
+
+    def getCacheDir( self ):
+        """Return directory of local cache, None in case cache is disabled
+        """
+        return self._cacheDir
+
+    def getRoots( self ):
+        return self._roots
+
+    def getNumScanEntries( self ):
+        """Return number of directory entries read by scans so far
+        """
+        return self._numScanEntries
+
+    def _addScanEntries( self, count ):
+        self._numScanEntries += count
+
+
+    def load( self ):
+        """Load persisted tree of all roots. Return number of roots loaded
+        """
+        return sum( 1 for root in self._roots if root.load( self ) )
+
+
+    def scan( self, root ):
+        """Scan given root without throttling, set and return new tree. Sub trees which
+        could not be read are taken from the loaded tree
+        """
+        tree = root.scan( self )
+        root.setTree( tree )
+        return tree
+
+
+    def loadTree( self, root ):
+        """Return tree persisted in cache file of root without changing the root, None
+        if not available
+        """
+        if root.getCacheFile() is None or not os.path.isfile( root.getCacheFile() ):
+            return None
+        return root.readTree( self )
+
+
+    def buildSnapshot( self ):
+        """Return CLibrarySnapshot of the combined trees of all roots
+        """
+        audioTree = CAudioDirectory( self, None )
+        for root in self._roots:
+            if root.getTree() is not None:
+                audioTree.addChilds( root.getTree() )
+        return CLibrarySnapshot( audioTree, newestSize=self._newestSize, albumTable=self._albumTable )
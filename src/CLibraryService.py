@@ -0,0 +1,428 @@
+#!/bin/python3
+# 
+# Copyright Florian Pfanner 2026
+#
+# This file is part of AudioPlayer.
+# 
+# AudioPlayer is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# AudioPlayer is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+# 
+# You should have received a copy of the GNU General Public License
+# along with AudioPlayer. If not, see <https://www.gnu.org/licenses/>.
+# 
+# 
+
+
+
+import os
+import json
+import time
+import socket
+import logging
+import threading
+import socketserver
+
+import CLibraryIndex
+import CImageCache
+
+
+
+class CServiceStopped( Exception ):
+    """Raised inside the directory walk in case the service is stopped
+    """
+    pass
+
+
+
+class CLibraryService:
+    """Library service running in its own process. Owns scanning, persistence and the
+    image cache of all roots and serves the trees to the players over a local unix
+    socket, thus the GUI does not compete with the scan for the GIL and starts
+    without loading the library.
+
+    Protocol: one json object per line. Each request has a "command" and is answered
+    by one object with "ok" True or False ("error" holds the message):
+        status      Generation, number of albums and state of each root
+        trees       Persisted tree of each root, optional "roots" list of names
+        album       Album "name" of the combined library
+        albumList   Album names of given "type", see CLibrarySnapshot.getAlbumList
+        rescan      Start refresh of all roots now
+        subscribe   Answered with event "subscribed", connection stays open and an
+                    event "changed" is sent after content changed. Both hold the
+                    generation of each root
+    """
+
+    def __init__( self, settings, socketPath, fileSystem=None ):
+        """
+        :param settings:    QSettings or CIniSettings object
+        :param socketPath:  Path of unix socket the service listens on
+        """
+        self._index = CLibraryIndex.CLibraryIndex( settings, fileSystem )
+        self._socketPath = socketPath
+        self._prewarmConcurrency = int( settings.value( "library/servicePrewarmConcurrency", 4 ) )
+        self._imageCache = None
+        if self._index.getCacheDir() is not None:
+            self._imageCache = CImageCache.CImageCache( os.path.join( self._index.getCacheDir(), "img" ),
+                                                        { root.getPath(): root.getName() for root in self._index.getRoots() } )
+
+        self._lock = threading.Condition()
+        self._generation = 0
+        self._rootGenerations = {}          # root name and generation of last change
+        self._rootData = {}                 # root name and json text of tree, served as is
+        self._snapshot = self._index.buildSnapshot()
+        self._rescan = threading.Event()
+        self._stop = False
+        self._server = None
+        self._serverThread = None
+
+
+    def getSocketPath( self ):
+        return self._socketPath
+
+    def getGeneration( self ):
+        """Return counter incremented on each content change
+        """
+        with self._lock:
+            return self._generation
+
+
+    def start( self ):
+        """Load persisted trees and start serving requests in a separate thread
+        """
+        self._index.load()
+        self._publish( [ root for root in self._index.getRoots() if root.getTree() is not None ] )
+
+        if os.path.exists( self._socketPath ):
+            os.remove( self._socketPath )           # left over by a previous service
+        self._server = socketserver.ThreadingUnixStreamServer( self._socketPath, self._createHandler() )
+        self._server.daemon_threads = True
+        self._serverThread = threading.Thread( target=self._server.serve_forever, daemon=True )
+        self._serverThread.start()
+        logging.info( "Library service listening on {}".format( self._socketPath ) )
+
+
+    def stop( self ):
+        """Stop refresh loop and server
+        """
+        self._stop = True
+        self._rescan.set()
+        with self._lock:
+            self._lock.notify_all()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._serverThread.join()
+            self._server = None
+            try:
+                os.remove( self._socketPath )
+            except OSError:
+                pass
+
+
+    def requestRescan( self ):
+        """Refresh all roots as soon as possible
+        """
+        self._rescan.set()
+
+
+    def checkCancelled( self ):
+        """Scan control, see CScanContext. Raise CServiceStopped to abort running scan
+        """
+        if self._stop:
+            raise CServiceStopped()
+
+    def directoryFound( self ):
+        pass
+
+    def directoryDone( self ):
+        pass
+
+
+    def run( self ):
+        """Refresh loop, blocks until stop is called. Roots are refreshed according to
+        their update interval and watch mode like in CAudioLibrary
+        """
+        nextScan = { root.getName(): time.monotonic() + ( 0 if root.getTree() is None else 30 )
+                     for root in self._index.getRoots() }
+        while not self._stop:
+            now = time.monotonic()
+            due = [ root for root in self._index.getRoots() if nextScan[root.getName()] is not None and nextScan[root.getName()] <= now ]
+            for root in due:
+                if self._stop:
+                    return
+                self._refreshRoot( root )
+                nextScan[root.getName()] = self._getNextScan( root )
+
+            pending = [ value for value in nextScan.values() if value is not None ]
+            timeout = max( 0.0, min( pending ) - time.monotonic() ) if pending else None
+            if self._rescan.wait( timeout ):
+                self._rescan.clear()
+                nextScan = { name: 0.0 for name in nextScan }
+
+
+    def _getNextScan( self, root ):
+        """Return time.monotonic() of next refresh of root, None if only done on request
+        """
+        delay = root.getUpdateInterval()
+        nextRetry = root.getNextRetry()
+        if nextRetry is not None:
+            delay = min( delay, max( 0.0, nextRetry - time.monotonic() ) )
+        if root.getWatchMode() == "poll" or root.getTree() is None or nextRetry is not None:
+            return time.monotonic() + delay
+        return None
+
+
+    def _refreshRoot( self, root ):
+        """Scan root with throttling, persist and publish tree in case it changed
+        """
+        logging.info( "Start refresh of %s", root.getPath() )
+        curTree = root.getTree()
+        try:
+            newTree = root.scan( self._index, control=self, throttle=True )
+        except CServiceStopped:
+            return
+        except Exception:
+            logging.exception( "Error scan {}".format( root.getPath() ) )
+            return
+        if curTree is not None and newTree.shareSubtrees( curTree ):
+            logging.info( "No changes in audio tree of %s", root.getPath() )
+            return
+
+        logging.info( "Audio tree of %s changed", root.getPath() )
+        try:
+            root.save( newTree )
+        except Exception:
+            logging.exception( "Error save audio tree of {}".format( root.getPath() ) )
+        root.setTree( newTree )
+        self._publish( [ root ] )
+
+        if self._imageCache is not None:
+            if curTree is not None:
+                added, removed = newTree.getAlbumChanges( curTree )
+                for oldAlbum, newAlbum in CLibraryIndex.getAlbumMoves( added, removed ):
+                    logging.info( "Album moved from %s to %s", oldAlbum.getPath(), newAlbum.getPath() )
+                    self._imageCache.moveAlbum( oldAlbum, newAlbum )
+            else:
+                added = list( newTree.iterAlbums() )
+            imgPaths = [ imgPath for album in added for imgPath in album.getImageFiles() ]
+            if imgPaths:
+                logging.info( "Image cache: {}".format( self._imageCache.prewarm( imgPaths, self._prewarmConcurrency ) ) )
+
+
+    def _publish( self, roots ):
+        """Make current tree of given roots available to clients and inform subscribers
+        """
+        rootData = { root.getName(): json.dumps( root.getTree().toDict( root.getPath() ) ) for root in roots }
+        snapshot = self._index.buildSnapshot()
+        with self._lock:
+            self._generation += 1
+            for name in rootData:
+                self._rootGenerations[name] = self._generation
+            self._rootData.update( rootData )
+            self._snapshot = snapshot
+            self._lock.notify_all()
+
+
+    def _getGenerations( self ):
+        """Return current generation and generation of each root
+        """
+        with self._lock:
+            return self._generation, dict( self._rootGenerations )
+
+
+    def _waitForChange( self, generation ):
+        """Block until generation changed or service is stopped. Return current
+        generation and generation of each root
+        """
+        with self._lock:
+            while self._generation == generation and not self._stop:
+                self._lock.wait()
+            return self._generation, dict( self._rootGenerations )
+
+
+    def handleRequest( self, request ):
+        """Return response object of given request object
+        """
+        command = request.get( "command" )
+        with self._lock:
+            generation = self._generation
+            snapshot = self._snapshot
+            rootGenerations = dict( self._rootGenerations )
+        if command == "status":
+            return { "ok": True, "generation": generation, "albums": snapshot.getNumAlbums(),
+                     "staleAlbums": snapshot.getNumStaleAlbums(), "scanEntries": self._index.getNumScanEntries(),
+                     "roots": [ { "name": root.getName(), "path": root.getPath(), "loaded": root.getTree() is not None,
+                                  "generation": rootGenerations.get( root.getName(), 0 ),
+                                  "failedDirectories": root.getLastScanFailures() }
+                                for root in self._index.getRoots() ] }
+        if command == "album":
+            album = snapshot.getAlbum( request.get( "name" ) )
+            if album is None:
+                return { "ok": False, "error": "Unknown album {}".format( request.get( "name" ) ) }
+            return { "ok": True, "album": album.toDict() }
+        if command == "albumList":
+            return { "ok": True, "generation": generation, "albums": list( snapshot.getAlbumList( request.get( "type", "full" ) ) ) }
+        if command == "rescan":
+            self.requestRescan()
+            return { "ok": True }
+        return { "ok": False, "error": "Unknown command {}".format( command ) }
+
+
+    def _getTrees( self, names ):
+        """Return response text of command trees. Trees are already serialized
+        """
+        with self._lock:
+            generation = self._generation
+            entries = [ ( root.getName(), root.getPath(), self._rootGenerations[root.getName()], self._rootData[root.getName()] )
+                        for root in self._index.getRoots()
+                        if root.getName() in self._rootData and ( names is None or root.getName() in names ) ]
+        roots = [ '{{"name": {}, "path": {}, "generation": {}, "tree": {}}}'.format( json.dumps( name ), json.dumps( path ), rootGeneration, data )
+                  for name, path, rootGeneration, data in entries ]
+        return '{{"ok": true, "generation": {}, "roots": [{}]}}'.format( generation, ", ".join( roots ) )
+
+
+    def _createHandler( self ):
+        service = self
+
+        class Handler( socketserver.StreamRequestHandler ):
+            def handle( self ):
+                for line in self.rfile:
+                    try:
+                        request = json.loads( line )
+                        command = request.get( "command" )
+                        if command == "subscribe":
+                            self._subscribe()
+                            return
+                        if command == "trees":
+                            response = service._getTrees( request.get( "roots" ) )
+                        else:
+                            response = json.dumps( service.handleRequest( request ) )
+                    except Exception as e:
+                        logging.exception( "Error handle request" )
+                        response = json.dumps( { "ok": False, "error": str( e ) } )
+                    self.wfile.write( response.encode() + b"\n" )
+
+            def _subscribe( self ):
+                generation, rootGenerations = service._getGenerations()
+                self.wfile.write( json.dumps( { "ok": True, "event": "subscribed", "generation": generation,
+                                                "roots": rootGenerations } ).encode() + b"\n" )
+                while not service._stop:
+                    generation, rootGenerations = service._waitForChange( generation )
+                    if service._stop:
+                        break
+                    event = { "event": "changed", "generation": generation, "roots": rootGenerations }
+                    self.wfile.write( json.dumps( event ).encode() + b"\n" )
+
+        return Handler
+
+
+
+class CLibraryClient:
+    """Client of CLibraryService. Requests are send over one connection, change
+    notifications are received by a separate thread.
+    """
+
+    def __init__( self, socketPath, timeout=10.0 ):
+        self._socketPath = socketPath
+        self._timeout = timeout
+        self._lock = threading.Lock()
+        self._socket = None
+        self._reader = None
+        self._subscribeThread = None
+        self._stop = False
+
+
+    def getSocketPath( self ):
+        return self._socketPath
+
+
+    def _connect( self ):
+        sock = socket.socket( socket.AF_UNIX, socket.SOCK_STREAM )
+        try:
+            sock.settimeout( self._timeout )
+            sock.connect( self._socketPath )
+        except Exception:
+            sock.close()
+            raise
+        return sock
+
+
+    def request( self, command, **args ):
+        """Send request to service and return response object. Raises an exception
+        in case the service is not reachable or the request failed
+        """
+        request = dict( args, command=command )
+        with self._lock:
+            try:
+                if self._socket is None:
+                    self._socket = self._connect()
+                    self._reader = self._socket.makefile( "rb" )
+                self._socket.sendall( json.dumps( request ).encode() + b"\n" )
+                line = self._reader.readline()
+                if not line:
+                    raise Exception( "Library service closed connection" )
+            except Exception:
+                self._close()
+                raise
+        response = json.loads( line )
+        if not response.get( "ok" ):
+            raise Exception( "Library service request {} failed: {}".format( command, response.get( "error" ) ) )
+        return response
+
+
+    def subscribe( self, callback, retryDelay=5.0 ):
+        """Call callback( event ) in a separate thread on each change notification of
+        the service. Callback is also called with the answer of the subscription, thus
+        changes done before or while the connection was lost are not missed. Lost
+        connections are established again after retryDelay in s
+        """
+        self._subscribeThread = threading.Thread( target=self._subscribeWorker, args=( callback, retryDelay ), daemon=True )
+        self._subscribeThread.start()
+
+
+    def _subscribeWorker( self, callback, retryDelay ):
+        while not self._stop:
+            try:
+                sock = self._connect()
+            except OSError as e:
+                logging.debug( "Library service not reachable: {}".format( e ) )
+                time.sleep( retryDelay )
+                continue
+            try:
+                sock.settimeout( None )
+                sock.sendall( json.dumps( { "command": "subscribe" } ).encode() + b"\n" )
+                with sock.makefile( "rb" ) as reader:
+                    for line in reader:
+                        if self._stop:
+                            break
+                        callback( json.loads( line ) )
+            except Exception:
+                logging.exception( "Error library service subscription" )
+            finally:
+                sock.close()
+            if not self._stop:
+                logging.warning( "Connection to library service lost" )
+                time.sleep( retryDelay )
+
+
+    def _close( self ):
+        if self._socket is not None:
+            self._reader.close()
+            self._socket.close()
+            self._socket = None
+            self._reader = None
+
+
+    def close( self ):
+        """Close connection. Subscription thread terminates with next event
+        """
+        self._stop = True
+        with self._lock:
+            self._close()
@@ -32,14 +32,21 @@ from PyQt5.QtCore import pyqtSignal
 from PyQt5.QtCore import pyqtSlot
 from PyQt5.QtCore import QSettings
 from PyQt5.QtCore import QTimer
+from PyQt5.QtCore import QSocketNotifier
 import logging
 import os
+import signal
+import socket
 
 
 import CAudioLibrary
 import CGuiAudioPlayer
 import CGuiAlbumSelector
 import CGuiAlbumGroupSelector
+import CMetrics
+import CProfiler
+import CTracer
+import CScheduler
 
 
 fileDirName = os.path.dirname( os.path.abspath(__file__) )
@@ -47,15 +54,31 @@ fileDirName = os.path.dirname( os.path.abspath(__file__) )
 
 class CMainWindow( QWidget ):
 
-    def __init__( self, parent=None, splash=None ):
+    def __init__( self, parent=None, splash=None, phaseTimer=None, settings=None, userData=None ):
+        """:param settings:     QSettings object with settings, default is settings/settings.ini
+        :param userData:        QSettings object with user data, default is QSettings()
+        """
         super().__init__( parent )
 
-        self._settings = QSettings( os.path.join( fileDirName, "../settings/settings.ini" ), QSettings.IniFormat )
-        self._userData = QSettings()
+        self._phaseTimer = phaseTimer
+        self._initDone = False              # first paint done, deferred init is started
+        self._deferredInitDone = False
+
+        self._settings = settings or QSettings( os.path.join( fileDirName, "../settings/settings.ini" ), QSettings.IniFormat )
+        self._userData = userData or QSettings()
+
+        # user data is only written if changed, components trigger job after change
+        CScheduler.getScheduler().addJob( "settingsSync", self._handleTimer, 60.0, True )
 
         fullScreen = self._settings.value( "audioPlayer/maximized", 1 ) == 1
 
+        self._profiler = None
+        profileOnStart = int( self._settings.value( "profiling/enabled", 0 ) )
+        if profileOnStart or int( self._settings.value( "profiling/signal", 0 ) ):
+            self._initProfiler( profileOnStart )
+
         self._audioLibrary = CAudioLibrary.CAudioLibrary( self._settings, self._userData, self, splash )
+        self._markPhase( "library load" )
 
         if splash is not None:
             splash.showMessage( self.tr( "Create GUI" ) )
@@ -90,23 +113,148 @@ class CMainWindow( QWidget ):
             if settingsSize is None:
                 self.showMaximized()
 
-        self._timer = QTimer()
-        self._timer.setInterval( 60000 )
-        self._timer.timeout.connect( self._handleTimer )
-        self._timer.start()
+        self._markPhase( "widget creation" )
+
+
+    def isInitDone( self ):
+        """Return True after deferred initialization is done
+        """
+        return self._deferredInitDone
+
+
+    def _markPhase( self, phaseName ):
+        if self._phaseTimer is not None:
+            self._phaseTimer.mark( phaseName )
+
+
+    def paintEvent( self, event ):
+        super().paintEvent( event )
+        if not self._initDone:
+            # first frame is visible, do remaining initialization afterwards
+            self._initDone = True
+            self._markPhase( "first paint" )
+            QTimer.singleShot( 0, self._deferredInit )
+
+
+    @pyqtSlot()
+    def _deferredInit( self ):
+        """Initialization not needed for the first frame: playback backend, models
+        of group selector and all timers
+        """
+        self._player.initPlayer()
+        self._groupSelector.populate()
+        self._audioLibrary.startRefresh()
+        self._initMetrics()
+        self._deferredInitDone = True
+        self._markPhase( "deferred init" )
+        if self._phaseTimer is not None:
+            self._phaseTimer.log()
+
+
+    def _initProfiler( self, start ):
+        """Install profiling hooks in hot paths. Profiling is started now if start
+        is set, else with signal SIGUSR1
+        """
+        outputDir = os.path.join( CAudioLibrary.getCacheDirectory( self._settings ), "profile" )
+        self._profiler = CProfiler.CProfiler( outputDir,
+                                              float( self._settings.value( "profiling/duration", 60 ) ),
+                                              float( self._settings.value( "profiling/slowCallThreshold", 0.2 ) ),
+                                              int( self._settings.value( "profiling/tracemalloc", 0 ) ) != 0 )
+
+        def albumPath( audioLibrary, albumName ):
+            album = audioLibrary.getAlbum( albumName ) if albumName else None
+            return album.getPath() if album is not None else albumName
+
+        self._profiler.wrapMethod( CAudioLibrary.CAudioLibrary, "_processCacheWorker",
+                                   lambda lib, root, worker: root.getPath() )
+        self._profiler.wrapMethod( CGuiAlbumSelector.CGuiAlbumSelector, "showAlbum",
+                                   lambda selector, *args: albumPath( selector._audioLibrary, selector._curAlbumName ) )
+        def modelAlbumPath( model, index, role ):
+            albumList = model._albumList
+            return albumPath( model._audioLibrary, albumList[index.row()] if 0 <= index.row() < len( albumList ) else None )
+
+        self._profiler.wrapMethod( CGuiAlbumGroupSelector.CDataModel, "data", modelAlbumPath )
+        self._profiler.wrapMethod( CGuiAudioPlayer.CGuiAudioPlayer, "_handleTimer",
+                                   lambda player: albumPath( player._audioLibrary, player.getCurAlbum() ) )
+        self._profiler.wrapMethod( CMainWindow, "_handleTimer" )
+
+        try:
+            self._profiler.startOnSignal()
+            self._installSignalWakeup()
+        except Exception:
+            logging.exception( "Could not install signal handler for profiling" )
+        if start:
+            self._profiler.start()
+
+
+    def _installSignalWakeup( self ):
+        """Python signal handlers run only when the interpreter gets control, which
+        does not happen while Qt waits idle in its event loop. The signal module
+        writes to a socket which wakes up the event loop, thus the handler runs.
+        """
+        self._signalSocket, writeSocket = socket.socketpair()
+        self._signalSocket.setblocking( False )
+        writeSocket.setblocking( False )
+        signal.set_wakeup_fd( writeSocket.fileno() )
+        self._signalWriteSocket = writeSocket
+        self._signalNotifier = QSocketNotifier( self._signalSocket.fileno(), QSocketNotifier.Read, self )
+        self._signalNotifier.activated.connect( self._readSignalSocket )
+
+
+    def _readSignalSocket( self ):
+        try:
+            while self._signalSocket.recv( 64 ):
+                pass
+        except OSError:
+            pass
+
+
+    def _initMetrics( self ):
+        """Start metrics export in case a port or text file is configured
+        """
+        self._metrics = None
+        port = int( self._settings.value( "metrics/port", 0 ) )
+        textFile = self._settings.value( "metrics/textFile", "" )
+        if port <= 0 and not textFile:
+            return
+
+        self._metrics = CMetrics.CMetrics()
+        self._metrics.addCollector( self._audioLibrary.getMetrics )
+        self._metrics.addCollector( self._player.getMetrics )
+        self._metrics.addCollector( CMetrics.processCollector )
+        self._metrics.addCollector( CTracer.getTracer().getMetrics )
+        self._metrics.addCollector( CScheduler.getScheduler().getMetrics )
+        if textFile:
+            self._metrics.setTextFile( textFile )
+        if port > 0:
+            try:
+                self._metrics.startHttpServer( port, self._settings.value( "metrics/address", "127.0.0.1" ) )
+            except Exception:
+                logging.exception( "Could not start metrics server" )
+        self._metrics.update()
+
+        CScheduler.getScheduler().addJob( "metrics", self._metrics.update,
+                                          float( self._settings.value( "metrics/interval", 15 ) ) ).start()
 
 
     def keyPressEvent( self, event ):
         if event.key() == Qt.Key_Escape:
+            self._player.flush()
             self._userData.sync()
+            self._audioLibrary.stopScan()
             self.close()
             event.accept()
+        elif event.key() == Qt.Key_F5:
+            self._audioLibrary.rescanNow()
+            event.accept()
         else:
             super().keyPressEvent( event )
 
 
     @pyqtSlot()
     def _handleTimer( self ):
+        """Write changed user data, started by job settingsSync
+        """
         self._userData.sync()
 
 
@@ -0,0 +1,168 @@
+#!/bin/python3
+# 
+# Copyright Florian Pfanner 2026
+#
+# This file is part of AudioPlayer.
+# 
+# AudioPlayer is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# AudioPlayer is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+# 
+# You should have received a copy of the GNU General Public License
+# along with AudioPlayer. If not, see <https://www.gnu.org/licenses/>.
+# 
+# 
+
+
+
+
+import os
+import logging
+import resource
+import threading
+import http.server
+
+
+
+class CMetrics:
+    """Collection of metrics exported in Prometheus text format. Values are
+    provided by collector functions which are called with update(), e.g. by a
+    timer of the GUI thread. The rendered text is served on a local port
+    and/or written to a text file (for the node exporter textfile collector).
+    Exporting never calls into the application, only the text of the last
+    update is used.
+    """
+
+    def __init__( self, prefix="audioplayer" ):
+        self._prefix = prefix
+        self._collectors = []           # functions returning list of ( name, type, help, value, labels )
+        self._text = ""
+        self._lock = threading.Lock()
+        self._server = None
+        self._textFile = None
+
+
+    def addCollector( self, collector ):
+        """Add function returning a list of tuples ( name, type, help, value, labels ).
+        type is "gauge", "counter" or "histogram", labels is a dictionary or None.
+        Value of a histogram is a dictionary with "buckets" (list of upper bound and
+        cumulative count), "sum" and "count"
+        """
+        self._collectors.append( collector )
+
+
+    def startHttpServer( self, port, address="127.0.0.1" ):
+        """Serve metrics on http://address:port/metrics in a background thread
+        """
+        metrics = self
+
+        class CHandler( http.server.BaseHTTPRequestHandler ):
+            def do_GET( self ):
+                if self.path not in ( "/", "/metrics" ):
+                    self.send_error( 404 )
+                    return
+                data = metrics.getText().encode( "utf-8" )
+                self.send_response( 200 )
+                self.send_header( "Content-Type", "text/plain; version=0.0.4; charset=utf-8" )
+                self.send_header( "Content-Length", str( len( data ) ) )
+                self.end_headers()
+                self.wfile.write( data )
+
+            def log_message( self, format, *args ):
+                pass
+
+        self._server = http.server.ThreadingHTTPServer( ( address, port ), CHandler )
+        self._server.daemon_threads = True
+        threading.Thread( target=self._server.serve_forever, daemon=True ).start()
+        logging.info( "Metrics served on http://%s:%s/metrics", address, port )
+
+
+    def setTextFile( self, fileName ):
+        """Write metrics to given file with each update
+        """
+        self._textFile = fileName
+
+
+    def stop( self ):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+
+    def getText( self ):
+        """Return metrics of last update in Prometheus text format
+        """
+        with self._lock:
+            return self._text
+
+
+    def _formatSample( self, name, labels, value ):
+        if labels:
+            labelTxt = ",".join( '{}="{}"'.format( k, str( v ).replace( "\\", "\\\\" ).replace( '"', '\\"' ) ) for k, v in labels.items() )
+            return "{}{{{}}} {}".format( name, labelTxt, float( value ) )
+        return "{} {}".format( name, float( value ) )
+
+
+    def update( self ):
+        """Call all collectors and render metrics
+        """
+        lines = []
+        for collector in self._collectors:
+            try:
+                samples = collector()
+            except Exception:
+                logging.exception( "Error collect metrics" )
+                continue
+            lastName = None
+            for name, metricType, helpText, value, labels in samples:
+                fullName = "{}_{}".format( self._prefix, name )
+                if fullName != lastName:
+                    lines.append( "# HELP {} {}".format( fullName, helpText ) )
+                    lines.append( "# TYPE {} {}".format( fullName, metricType ) )
+                    lastName = fullName
+                if metricType == "histogram":
+                    for bound, count in value["buckets"]:
+                        bucketLabels = dict( labels or {} )
+                        bucketLabels["le"] = "+Inf" if bound == float( "inf" ) else bound
+                        lines.append( self._formatSample( fullName + "_bucket", bucketLabels, count ) )
+                    lines.append( self._formatSample( fullName + "_sum", labels, value["sum"] ) )
+                    lines.append( self._formatSample( fullName + "_count", labels, value["count"] ) )
+                else:
+                    lines.append( self._formatSample( fullName, labels, value ) )
+        text = "\n".join( lines ) + "\n"
+
+        with self._lock:
+            self._text = text
+
+        if self._textFile is not None:
+            try:
+                tmpName = self._textFile + ".tmp"
+                with open( tmpName, "w" ) as fp:
+                    fp.write( text )
+                os.replace( tmpName, self._textFile )
+            except Exception:
+                logging.exception( "Error write metrics file %s", self._textFile )
+
+
+
+def getMemoryRss():
+    """Return resident set size of this process in bytes
+    """
+    try:
+        with open( "/proc/self/statm", "r" ) as fp:
+            return int( fp.read().split()[1] ) * os.sysconf( "SC_PAGE_SIZE" )
+    except Exception:
+        return resource.getrusage( resource.RUSAGE_SELF ).ru_maxrss * 1024
+
+
+def processCollector():
+    """Collector with memory usage of this process
+    """
+    return [ ( "memory_rss_bytes", "gauge", "Resident set size of the process", getMemoryRss(), None ) ]
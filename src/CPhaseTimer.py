@@ -0,0 +1,70 @@
+#!/bin/python3
+# 
+# Copyright Florian Pfanner 2026
+#
+# This file is part of AudioPlayer.
+# 
+# AudioPlayer is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# AudioPlayer is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+# 
+# You should have received a copy of the GNU General Public License
+# along with AudioPlayer. If not, see <https://www.gnu.org/licenses/>.
+# 
+# 
+
+
+
+
+import logging
+import time
+
+
+
+class CPhaseTimer:
+    """Measures duration of consecutive phases, e.g. during startup. Each call
+    of mark() ends the current phase and starts the next one.
+    """
+
+    def __init__( self, name, startTime=None ):
+        """:param startTime:    time.perf_counter() value the first phase started,
+                                default is now
+        """
+        self._name = name
+        self._startTime = startTime if startTime is not None else time.perf_counter()
+        self._lastTime = self._startTime
+        self._phases = []           # list of [ phase name, duration in s ]
+
+
+    def mark( self, phaseName ):
+        """End phase with given name
+        """
+        now = time.perf_counter()
+        self._phases.append( [ phaseName, now - self._lastTime ] )
+        logging.info( "{} phase {} took {:.3f}s".format( self._name, phaseName, now - self._lastTime ) )
+        self._lastTime = now
+
+
+    def getPhases( self ):
+        """Return list with [ phase name, duration in s ]
+        """
+        return self._phases
+
+
+    def getTotal( self ):
+        """Return time in s since start until last mark
+        """
+        return self._lastTime - self._startTime
+
+
+    def log( self ):
+        """Log summary of all phases
+        """
+        phaseTxt = ", ".join( "{} {:.3f}s".format( name, duration ) for name, duration in self._phases )
+        logging.info( "{} done in {:.3f}s: {}".format( self._name, self.getTotal(), phaseTxt ) )
@@ -0,0 +1,142 @@
+#!/bin/python3
+# 
+# Copyright Florian Pfanner 2026
+#
+# This file is part of AudioPlayer.
+# 
+# AudioPlayer is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# AudioPlayer is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+# 
+# You should have received a copy of the GNU General Public License
+# along with AudioPlayer. If not, see <https://www.gnu.org/licenses/>.
+# 
+# 
+
+
+
+
+import logging
+
+
+
+class CPlaybackBackend:
+    """Interface of a playback backend used by CAudioPlayer. A backend plays
+    a list of audio files and informs registered handlers about events:
+        "trackChanged":     next track of list started, argument is track index
+        "playing":          playback started, argument is track index
+        "stopped":          playback stopped or end of list reached
+    """
+
+    def __init__( self ):
+        self._eventHandlers = []
+
+
+    def addEventHandler( self, handler ):
+        """Register handler( eventName, trackIdx ) called for each event
+        """
+        self._eventHandlers.append( handler )
+
+
+    def _emitEvent( self, eventName, trackIdx ):
+        for handler in self._eventHandlers:
+            try:
+                handler( eventName, trackIdx )
+            except Exception:
+                logging.exception( "Error in playback event handler" )
+
+
+    def setPlaylist( self, files ):
+        """Set list of files to play, playback is not started"""
+        raise NotImplementedError()
+
+    def playItem( self, idx ):
+        """Start playback of file idx of the play list"""
+        raise NotImplementedError()
+
+    def play( self ):
+        raise NotImplementedError()
+
+    def stop( self ):
+        raise NotImplementedError()
+
+    def pause( self, on ):
+        raise NotImplementedError()
+
+    def next( self ):
+        raise NotImplementedError()
+
+    def previous( self ):
+        raise NotImplementedError()
+
+    def isPlaying( self ):
+        raise NotImplementedError()
+
+    def isStopped( self ):
+        raise NotImplementedError()
+
+    def isPause( self ):
+        raise NotImplementedError()
+
+    def getTrackCount( self ):
+        """Return number of files in play list"""
+        raise NotImplementedError()
+
+    def getTrack( self ):
+        """Return number of current track, 1 ... getTrackCount(). 0 if nothing played so far"""
+        raise NotImplementedError()
+
+    def getVolume( self ):
+        """Return volume in the rage of 0 ... 1.0"""
+        raise NotImplementedError()
+
+    def setVolume( self, volume ):
+        """Set volume, input range is 0 ... 1.0"""
+        raise NotImplementedError()
+
+    def getTime( self ):
+        """Return time of current track in s"""
+        raise NotImplementedError()
+
+    def setTime( self, seconds ):
+        """Set playback time of current track in s"""
+        raise NotImplementedError()
+
+    def getLength( self ):
+        """Return length of current track in s"""
+        raise NotImplementedError()
+
+    def getPosition( self ):
+        """Return position of current track in percent 0 ... 1.0. For VBR files
+        without TOC this is the byte position"""
+        raise NotImplementedError()
+
+    def setPosition( self, pos ):
+        """Set playback position of current track in percent 0 ... 1.0"""
+        raise NotImplementedError()
+
+    def getTrackDescription( self ):
+        """Return text description of current active track"""
+        raise NotImplementedError()
+
+
+
+def createBackend( settings ):
+    """Create backend configured with audioPlayer/backend. Modules are
+    imported on demand, thus libvlc is only needed for the vlc backend.
+    """
+    name = settings.value( "audioPlayer/backend", "vlc" )
+    if name == "vlc":
+        import CVlcBackend
+        return CVlcBackend.CVlcBackend()
+    elif name == "simulated":
+        import CSimulatedBackend
+        return CSimulatedBackend.CSimulatedBackend( float( settings.value( "audioPlayer/simulationTrackLength", 300 ) ),
+                                                    float( settings.value( "audioPlayer/simulationSpeed", 1.0 ) ) )
+    raise Exception( "Playback backend {} not implemented".format( name ) )
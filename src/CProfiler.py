@@ -0,0 +1,178 @@
+#!/bin/python3
+# 
+# Copyright Florian Pfanner 2026
+#
+# This file is part of AudioPlayer.
+# 
+# AudioPlayer is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# AudioPlayer is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+# 
+# You should have received a copy of the GNU General Public License
+# along with AudioPlayer. If not, see <https://www.gnu.org/licenses/>.
+# 
+# 
+
+
+
+
+import os
+import json
+import time
+import signal
+import logging
+import cProfile
+import pstats
+import threading
+import tracemalloc
+import functools
+import collections
+
+
+
+class CProfiler:
+    """On-demand profiling of hot paths. Methods wrapped with wrap() are run
+    under cProfile (one profile per thread) while a profiling window is
+    active. At the end of the window pstats, an optional tracemalloc snapshot
+    and the slow calls are dumped to the output directory. Calls slower than
+    the threshold are recorded also outside of a window.
+    """
+
+    def __init__( self, outputDir, duration=60.0, slowThreshold=0.2, traceMemory=False ):
+        self._outputDir = outputDir
+        self._duration = duration
+        self._slowThreshold = slowThreshold
+        self._traceMemory = traceMemory
+        self._active = False
+        self._lock = threading.Lock()
+        self._profiles = {}                                     # thread id and cProfile.Profile object
+        self._slowCalls = collections.deque( maxlen=1000 )      # dictionaries with slow call data
+        self._stopTimer = None
+        self._local = threading.local()                         # nesting depth of wrapped calls per thread
+
+
+    def isActive( self ):
+        return self._active
+
+
+    def start( self ):
+        """Start profiling window, stops automatically after configured duration
+        """
+        with self._lock:
+            if self._active:
+                return
+            self._profiles = {}
+            self._active = True
+        if self._traceMemory:
+            tracemalloc.start()
+        self._stopTimer = threading.Timer( self._duration, self.stop )
+        self._stopTimer.daemon = True
+        self._stopTimer.start()
+        logging.warning( "Profiling started for %ss", self._duration )
+
+
+    def stop( self ):
+        """End profiling window and dump results
+        """
+        with self._lock:
+            if not self._active:
+                return
+            self._active = False
+            profiles = list( self._profiles.values() )
+            self._profiles = {}
+        if self._stopTimer is not None:
+            self._stopTimer.cancel()
+            self._stopTimer = None
+
+        try:
+            os.makedirs( self._outputDir, exist_ok=True )
+            baseName = os.path.join( self._outputDir, time.strftime( "profile_%Y%m%d_%H%M%S" ) )
+            if profiles:
+                stats = pstats.Stats( profiles[0] )
+                for profile in profiles[1:]:
+                    stats.add( profile )
+                stats.dump_stats( baseName + ".pstats" )
+            if self._traceMemory and tracemalloc.is_tracing():
+                tracemalloc.take_snapshot().dump( baseName + ".snapshot" )
+                tracemalloc.stop()
+            with open( baseName + "_slowcalls.json", "w" ) as fp:
+                json.dump( list( self._slowCalls ), fp, indent=1 )
+            logging.warning( "Profiling done, results written to %s.*", baseName )
+        except Exception:
+            logging.exception( "Error write profiling results" )
+
+
+    def startOnSignal( self, signalNumber=signal.SIGUSR1 ):
+        """Start profiling window each time given signal is received
+        """
+        signal.signal( signalNumber, lambda signum, frame: self.start() )
+
+
+    def getSlowCalls( self ):
+        """Return list with slow calls recorded so far
+        """
+        return list( self._slowCalls )
+
+
+    def wrap( self, func, name=None, contextFunc=None ):
+        """Return wrapper of func for profiling.
+        :param contextFunc:     Called with arguments of func, returns text stored
+                                with slow calls, e.g. album path
+        """
+        name = name or func.__qualname__
+
+        @functools.wraps( func )
+        def wrapper( *args, **kwargs ):
+            profile = None
+            depth = getattr( self._local, "depth", 0 )
+            if self._active and depth == 0:
+                # nested calls are already covered by profile of outer call
+                threadId = threading.get_ident()
+                with self._lock:
+                    if self._active:
+                        profile = self._profiles.setdefault( threadId, cProfile.Profile() )
+            self._local.depth = depth + 1
+            startTime = time.perf_counter()
+            if profile is not None:
+                profile.enable()
+            try:
+                return func( *args, **kwargs )
+            finally:
+                if profile is not None:
+                    profile.disable()
+                self._local.depth = depth
+                duration = time.perf_counter() - startTime
+                if duration > self._slowThreshold:
+                    self._recordSlowCall( name, duration, contextFunc, args )
+
+        return wrapper
+
+
+    def _recordSlowCall( self, name, duration, contextFunc, args ):
+        context = ""
+        if contextFunc is not None:
+            try:
+                context = str( contextFunc( *args ) )
+            except Exception:
+                context = "?"
+        self._slowCalls.append( { "function": name,
+                                  "duration": duration,
+                                  "context": context,
+                                  "time": time.time(),
+                                  "thread": threading.current_thread().name } )
+        logging.warning( "Slow call %s took %.3fs (%s)", name, duration, context )
+
+
+    def wrapMethod( self, cls, methodName, contextFunc=None ):
+        """Replace method of class by profiling wrapper. Has to be done before
+        methods are connected to signals
+        """
+        func = getattr( cls, methodName )
+        func = getattr( func, "__wrapped__", func )         # wrapped by previous profiler object
+        setattr( cls, methodName, self.wrap( func, "{}.{}".format( cls.__name__, methodName ), contextFunc ) )
@@ -0,0 +1,110 @@
+#!/bin/python3
+# 
+# Copyright Florian Pfanner 2026
+#
+# This file is part of AudioPlayer.
+# 
+# AudioPlayer is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# AudioPlayer is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+# 
+# You should have received a copy of the GNU General Public License
+# along with AudioPlayer. If not, see <https://www.gnu.org/licenses/>.
+# 
+# 
+
+
+
+
+import bisect
+import heapq
+
+
+
+class CRecentIndex:
+    """Bounded index of the newest albums, sorted by date. The index holds the newest
+    entries of all albums (at most twice the capacity) and is updated incrementally
+    on add and remove, thus the newest N albums are available without sorting the
+    whole library. Only in case removals shrink the index below its capacity it has
+    to be refilled from all albums (see needsRefill).
+    """
+
+    def __init__( self, capacity=100 ):
+        self._capacity = capacity
+        self._maxEntries = 2 * capacity
+        self._entries = []          # ascending list of ( date, album name ), newest at end
+        self._dates = {}            # album name and date of entries
+        self._numAlbums = 0         # number of albums in library, also the ones not in index
+
+
+    def copy( self ):
+        other = CRecentIndex( self._capacity )
+        other._entries = list( self._entries )
+        other._dates = dict( self._dates )
+        other._numAlbums = self._numAlbums
+        return other
+
+
+    def getCapacity( self ):
+        return self._capacity
+
+
+    def fill( self, albums ):
+        """Build up index from scratch
+        :param albums:  Iterable with tuple ( album name, date ) of all albums
+        """
+        entries = []
+        self._numAlbums = 0
+        for name, date in albums:
+            entries.append( ( date or 0.0, name ) )
+            self._numAlbums += 1
+        self._entries = heapq.nlargest( self._maxEntries, entries )
+        self._entries.reverse()
+        self._dates = { name: date for date, name in self._entries }
+
+
+    def add( self, name, date ):
+        """Album was added to library. An entry of an album with same name is replaced
+        """
+        if name in self._dates:
+            self.remove( name )
+        entry = ( date or 0.0, name )
+        complete = len( self._entries ) == self._numAlbums      # all albums are in index
+        self._numAlbums += 1
+        if not complete and self._entries and entry < self._entries[0]:
+            return                  # older than all entries, might be older than albums not in index
+        bisect.insort( self._entries, entry )
+        self._dates[name] = entry[0]
+        if len( self._entries ) > self._maxEntries:
+            date, name = self._entries.pop( 0 )
+            del self._dates[name]
+
+
+    def remove( self, name ):
+        """Album was removed from library
+        """
+        self._numAlbums -= 1
+        if name in self._dates:
+            idx = bisect.bisect_left( self._entries, ( self._dates.pop( name ), name ) )
+            del self._entries[idx]
+
+
+    def needsRefill( self ):
+        """Return True in case index holds less than capacity entries although library
+        contains more albums
+        """
+        return len( self._entries ) < min( self._capacity, self._numAlbums )
+
+
+    def getNewest( self, count=None ):
+        """Return list with names of newest albums, newest first. count is limited to
+        the capacity of the index
+        """
+        count = self._capacity if count is None else min( count, self._capacity )
+        return [ name for date, name in self._entries[-1:-count-1:-1] ] if count > 0 else []
@@ -0,0 +1,124 @@
+#!/bin/python3
+#
+# Copyright Florian Pfanner 2026
+#
+# This file is part of AudioPlayer.
+#
+# AudioPlayer is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# AudioPlayer is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with AudioPlayer. If not, see <https://www.gnu.org/licenses/>.
+#
+#
+
+
+import os
+import json
+import logging
+import time
+
+
+
+class CResumeStore:
+    """Resume position (track index and time) of each album. Updates are only
+    kept in memory and written in one batch, at most once per write interval, to
+    reduce the number of flash writes. The file is replaced atomically, thus
+    after a power loss either the old or the new content is available.
+    """
+
+    def __init__( self, fileName, writeInterval=60 ):
+        self._fileName = fileName
+        self._writeInterval = writeInterval
+        self._positions = {}            # album name and [ track index, time in s ]
+        self._dirty = False
+        self._lastWrite = 0.0
+        self._writeCount = 0
+
+        try:
+            with open( self._fileName, "r" ) as fp:
+                self._positions = json.load( fp )
+            logging.info( "Loaded resume position of {} albums".format( len( self._positions ) ) )
+        except FileNotFoundError:
+            pass
+        except Exception:
+            logging.exception( "Error load resume positions" )
+
+
+    def get( self, albumName ):
+        """Return tuple (track index, time in s) of given album. Returns (0, 0.0)
+        in case album is not known
+        """
+        if albumName in self._positions:
+            track, seconds = self._positions[albumName]
+            return ( int( track ), float( seconds ) )
+        return ( 0, 0.0 )
+
+
+    def update( self, albumName, track, seconds ):
+        """Remember position of album. Data is written with next flush
+        """
+        position = [ track, round( seconds, 1 ) ]
+        if self._positions.get( albumName ) != position:
+            self._positions[albumName] = position
+            self._dirty = True
+
+
+    def move( self, oldName, newName ):
+        """Take over position of album which was renamed or moved
+        """
+        if oldName in self._positions:
+            self._positions[newName] = self._positions.pop( oldName )
+            self._dirty = True
+
+
+    def isDirty( self ):
+        """Return True in case data changed since last write
+        """
+        return self._dirty
+
+
+    def getWriteCount( self ):
+        """Return number of writes done so far
+        """
+        return self._writeCount
+
+
+    def flush( self, force=False ):
+        """Write data in case it changed and write interval elapsed since last
+        write. If force is True interval is not checked.
+        """
+        if not self._dirty:
+            return
+        if not force and time.monotonic() - self._lastWrite < self._writeInterval:
+            return
+
+        try:
+            os.makedirs( os.path.dirname( self._fileName ), exist_ok=True )
+            tmpName = self._fileName + ".tmp"
+            with open( tmpName, "w" ) as fp:
+                json.dump( self._positions, fp )
+                fp.flush()
+                os.fsync( fp.fileno() )
+            os.replace( tmpName, self._fileName )
+            dirFd = os.open( os.path.dirname( self._fileName ), os.O_RDONLY )
+            try:
+                os.fsync( dirFd )
+            finally:
+                os.close( dirFd )
+        except Exception:
+            logging.exception( "Error write resume positions" )
+            return
+        finally:
+            self._lastWrite = time.monotonic()
+
+        self._dirty = False
+        self._writeCount += 1
+        logging.debug( "Resume positions written ({} writes)".format( self._writeCount ) )
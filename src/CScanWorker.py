@@ -0,0 +1,161 @@
+#!/bin/python3
+# 
+# Copyright Florian Pfanner 2026
+#
+# This file is part of AudioPlayer.
+# 
+# AudioPlayer is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# AudioPlayer is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+# 
+# You should have received a copy of the GNU General Public License
+# along with AudioPlayer. If not, see <https://www.gnu.org/licenses/>.
+# 
+# 
+
+
+
+
+import time
+import logging
+import threading
+
+from PyQt5.QtCore import QObject
+from PyQt5.QtCore import QThread
+from PyQt5.QtCore import pyqtSignal
+from PyQt5.QtCore import pyqtSlot
+
+
+
+class CScanCancelled( Exception ):
+    """Raised inside the directory walk in case the scan was cancelled"""
+    pass
+
+
+
+class CScanWorker( QObject ):
+    """Runs a library scan in its own QThread. The scan function is called with
+    this object as argument, it has to call checkCancelled() regularly and
+    directoryFound() / directoryDone() to report progress. The scan function
+    returns a result object which is passed with the finished signal.
+    """
+
+    progress = pyqtSignal( int, int )
+    """Signal with number of directories done and number of directories found so far"""
+
+    finished = pyqtSignal( object )
+    """Signal with result of scan function"""
+
+    error = pyqtSignal( str )
+    """Signal with error message in case scan function raised an exception"""
+
+    cancelled = pyqtSignal()
+    """Signal emitted in case scan was cancelled"""
+
+    def __init__( self, scanFunc, progressInterval=0.5 ):
+        super().__init__()
+        self._scanFunc = scanFunc
+        self._progressInterval = progressInterval
+        self._cancelEvent = threading.Event()
+        self._done = 0
+        self._total = 0
+        self._lock = threading.Lock()                   # directory walk might use several threads
+        self._lastProgress = 0.0
+        self._thread = QThread()
+        self.moveToThread( self._thread )
+        self._thread.started.connect( self._run )
+
+
+    def start( self ):
+        """Start scan in separate thread
+        """
+        self._thread.start()
+
+
+    def cancel( self ):
+        """Request cancellation, scan stops at next check
+        """
+        self._cancelEvent.set()
+
+
+    def wait( self ):
+        """Wait until thread is done
+        """
+        self._thread.wait()
+
+
+    def isRunning( self ):
+        return self._thread.isRunning()
+
+
+    def checkCancelled( self ):
+        """Called inside the directory walk. Raise CScanCancelled in case scan was cancelled
+        """
+        if self._cancelEvent.is_set():
+            raise CScanCancelled()
+
+
+    def directoryFound( self, count=1 ):
+        with self._lock:
+            self._total += count
+
+
+    def directoryDone( self ):
+        with self._lock:
+            self._done += 1
+            now = time.monotonic()
+            if now - self._lastProgress < self._progressInterval:
+                return
+            self._lastProgress = now
+            done = self._done
+            total = self._total
+        self.progress.emit( done, total )
+
+
+    @pyqtSlot()
+    def _run( self ):
+        try:
+            result = self._scanFunc( self )
+            self.progress.emit( self._done, self._total )
+            self.finished.emit( result )
+        except CScanCancelled:
+            logging.info( "Scan cancelled after %s of %s directories", self._done, self._total )
+            self.cancelled.emit()
+        except Exception as e:
+            logging.exception( "Error during scan" )
+            self.error.emit( str( e ) )
+        finally:
+            self._thread.quit()
+
+
+
+class CScanControl:
+    """Scan control for a directory walk in a plain thread, e.g. the progressive scan:
+    only cancellation, no progress. See CScanWorker
+    """
+
+    def __init__( self ):
+        self._cancelEvent = threading.Event()
+
+
+    def cancel( self ):
+        """Request cancellation, scan stops at next check
+        """
+        self._cancelEvent.set()
+
+
+    def checkCancelled( self ):
+        if self._cancelEvent.is_set():
+            raise CScanCancelled()
+
+    def directoryFound( self, count=1 ):
+        pass
+
+    def directoryDone( self ):
+        pass
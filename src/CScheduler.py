@@ -0,0 +1,160 @@
+#!/bin/python3
+# 
+# Copyright Florian Pfanner 2026
+#
+# This file is part of AudioPlayer.
+# 
+# AudioPlayer is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# AudioPlayer is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+# 
+# You should have received a copy of the GNU General Public License
+# along with AudioPlayer. If not, see <https://www.gnu.org/licenses/>.
+# 
+# 
+
+
+
+
+import time
+import logging
+import functools
+import collections
+
+from PyQt5.QtCore import QTimer
+
+
+
+class CScheduler:
+    """Owns the timers of the application. Each job is a named QTimer which is
+    only active while there is work for it: periodic jobs stop themselves when
+    they become idle (callback returns False), deferred jobs are started with
+    trigger() when work is pending. Every timer expiry is counted as wakeup,
+    thus the wakeups per minute show how often the application leaves idle.
+    """
+
+    def __init__( self ):
+        self._timers = {}                                   # job name and QTimer
+        self._wakeups = collections.Counter()              # job name and number of wakeups
+        self._recentWakeups = collections.deque()           # time.monotonic() of wakeups during last minute
+
+
+    def addJob( self, name, callback, interval, singleShot=False ):
+        """Create timer of job, it is not started. A job with the same name is replaced,
+        e.g. after the main window was created again.
+        :param callback:    Called on each expiry. Periodic timer is stopped in case it returns False
+        :param interval:    Time in s between two calls or until the call of a single shot job
+        :return:            QTimer of job, could be started and stopped directly
+        """
+        self.removeJob( name )
+        timer = QTimer()
+        timer.setSingleShot( singleShot )
+        timer.setInterval( int( interval * 1000 ) )
+        timer.timeout.connect( functools.partial( self._handleTimeout, name, callback ) )
+        self._timers[name] = timer
+        return timer
+
+
+    def removeJob( self, name ):
+        timer = self._timers.pop( name, None )
+        if timer is not None:
+            timer.stop()
+
+
+    def getTimer( self, name ):
+        return self._timers[name]
+
+
+    def start( self, name, interval=None ):
+        """(Re)start timer of job
+        :param interval:    New interval in s, keep current one if None
+        """
+        timer = self._timers[name]
+        if interval is not None:
+            timer.setInterval( int( interval * 1000 ) )
+        timer.start()
+
+
+    def stop( self, name ):
+        self._timers[name].stop()
+
+
+    def trigger( self, name ):
+        """Start job in case it is not active so far. Used for deferred work like
+        writing settings: the first change starts the timer, further changes until
+        expiry do not delay it
+        """
+        timer = self._timers[name]
+        if not timer.isActive():
+            timer.start()
+
+
+    def isActive( self, name ):
+        return self._timers[name].isActive()
+
+
+    def _handleTimeout( self, name, callback ):
+        now = time.monotonic()
+        self._wakeups[name] += 1
+        self._recentWakeups.append( now )
+        self._dropOldWakeups( now )
+        try:
+            keepRunning = callback()
+        except Exception:
+            logging.exception( "Error in job {}".format( name ) )
+            return
+        if keepRunning is False:
+            logging.debug( "Job %s idle, timer stopped", name )
+            self._timers[name].stop()
+
+
+    def _dropOldWakeups( self, now ):
+        while self._recentWakeups and self._recentWakeups[0] < now - 60.0:
+            self._recentWakeups.popleft()
+
+
+    def getWakeupsPerMinute( self ):
+        """Return number of timer wakeups during the last minute
+        """
+        self._dropOldWakeups( time.monotonic() )
+        return len( self._recentWakeups )
+
+
+    def getNumWakeups( self ):
+        """Return number of timer wakeups since start
+        """
+        return sum( self._wakeups.values() )
+
+
+    def getActiveJobs( self ):
+        """Return sorted list with name of active jobs
+        """
+        return sorted( name for name, timer in self._timers.items() if timer.isActive() )
+
+
+    def getMetrics( self ):
+        """Collector for CMetrics, return list of ( name, type, help, value, labels )
+        """
+        res = [ ( "scheduler_wakeups_per_minute", "gauge", "Timer wakeups during last minute", self.getWakeupsPerMinute(), None ),
+                ( "scheduler_active_jobs", "gauge", "Number of active timers", len( self.getActiveJobs() ), None ) ]
+        for name, count in sorted( self._wakeups.items() ):
+            res.append( ( "scheduler_wakeups_total", "counter", "Timer wakeups by job", count, { "job": name } ) )
+        return res
+
+
+
+_scheduler = None
+
+def getScheduler():
+    """Return scheduler object of application, created on first use
+    """
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = CScheduler()
+    return _scheduler
@@ -0,0 +1,369 @@
+#!/bin/python3
+#
+# Copyright Florian Pfanner 2026
+#
+# This file is part of AudioPlayer.
+#
+# AudioPlayer is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# AudioPlayer is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with AudioPlayer. If not, see <https://www.gnu.org/licenses/>.
+#
+#
+
+
+import os
+import bisect
+import json
+import logging
+import mmap
+import threading
+
+
+# Bitrates in kbit/s of layer III frames, index 0 is "free", 15 is invalid
+_BITRATES_MPEG1 = [ 0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 0 ]
+_BITRATES_MPEG2 = [ 0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160, 0 ]
+
+# Sample rates, key is version field of frame header (3: MPEG1, 2: MPEG2, 0: MPEG2.5)
+_SAMPLERATES = { 3: [ 44100, 48000, 32000 ],
+                 2: [ 22050, 24000, 16000 ],
+                 0: [ 11025, 12000, 8000 ] }
+
+
+def parseFrameHeader( header ):
+    """Parse 4 bytes of a MPEG audio layer III frame header.
+    Return tuple (frame length in bytes, samples per frame, sample rate) or None
+    in case header is invalid
+    """
+    if len( header ) < 4 or header[0] != 0xFF or ( header[1] & 0xE0 ) != 0xE0:
+        return None
+    version = ( header[1] >> 3 ) & 0x03
+    layer = ( header[1] >> 1 ) & 0x03
+    bitrateIdx = ( header[2] >> 4 ) & 0x0F
+    sampleRateIdx = ( header[2] >> 2 ) & 0x03
+    padding = ( header[2] >> 1 ) & 0x01
+    if version == 1 or layer != 1 or bitrateIdx in ( 0, 15 ) or sampleRateIdx == 3:
+        return None
+
+    sampleRate = _SAMPLERATES[version][sampleRateIdx]
+    if version == 3:
+        bitrate = _BITRATES_MPEG1[bitrateIdx] * 1000
+        samples = 1152
+        frameLength = 144 * bitrate // sampleRate + padding
+    else:
+        bitrate = _BITRATES_MPEG2[bitrateIdx] * 1000
+        samples = 576
+        frameLength = 72 * bitrate // sampleRate + padding
+    return ( frameLength, samples, sampleRate )
+
+
+def _id3v2Size( data ):
+    """Return size of ID3v2 tag at start of data, 0 if no tag is available
+    """
+    if len( data ) < 10 or data[0:3] != b"ID3":
+        return 0
+    size = ( data[6] << 21 ) | ( data[7] << 14 ) | ( data[8] << 7 ) | data[9]
+    if data[5] & 0x10:
+        size += 10          # footer present
+    return size + 10
+
+
+
+class CSeekIndex:
+    """Table of time to byte offset of one MP3 file. The table is build once
+    from the frame headers and holds one entry per interval. Seeking with the
+    table does not depend on the bitrate guess of the player, thus also VBR
+    files without TOC are positioned exactly.
+    """
+
+    def __init__( self, interval=1.0 ):
+        self._interval = interval
+        self._times = []            # start time of frame in s
+        self._offsets = []          # byte offset of frame
+        self._length = 0.0          # exact length of file in s
+        self._fileSize = 0
+        self._fileDate = None
+
+
+    def build( self, path ):
+        """Read all frame headers of given file and build up the table
+        """
+        statData = os.stat( path )
+        self._fileSize = statData.st_size
+        self._fileDate = statData.st_mtime
+        self._times = []
+        self._offsets = []
+        self._length = 0.0
+
+        if self._fileSize <= 0:
+            return
+
+        with open( path, "rb" ) as fp:
+            with mmap.mmap( fp.fileno(), 0, access=mmap.ACCESS_READ ) as data:
+                pos = _id3v2Size( data[0:10] )
+                curTime = 0.0
+                nextEntry = 0.0
+                while pos + 4 <= self._fileSize:
+                    frame = parseFrameHeader( data[pos:pos+4] )
+                    if frame is None:
+                        if data[pos:pos+3] == b"TAG":
+                            break                       # ID3v1 tag at end of file
+                        pos = data.find( b"\xFF", pos + 1 )     # lost sync, search next frame
+                        if pos < 0:
+                            break
+                        continue
+                    frameLength, samples, sampleRate = frame
+                    if curTime >= nextEntry:
+                        self._times.append( curTime )
+                        self._offsets.append( pos )
+                        nextEntry += self._interval
+                    curTime += samples / sampleRate
+                    pos += frameLength
+                self._length = curTime
+
+        logging.debug( "Seek index of {}: {} entries, length {:.1f}s".format( path, len( self._times ), self._length ) )
+
+
+    def isValid( self, path ):
+        """Return True in case the table still matches the file on disk
+        """
+        try:
+            statData = os.stat( path )
+        except OSError:
+            return False
+        return statData.st_size == self._fileSize and statData.st_mtime == self._fileDate
+
+
+    def toDict( self ):
+        return { "type": "CSeekIndex",
+                 "interval": self._interval,
+                 "times": self._times,
+                 "offsets": self._offsets,
+                 "length": self._length,
+                 "fileSize": self._fileSize,
+                 "fileDate": self._fileDate }
+
+    def fromDict( self, data ):
+        if data["type"] != "CSeekIndex":
+            raise Exception( "Wrong type {}".format( str( data ) ) )
+        self._interval = data["interval"]
+        self._times = data["times"]
+        self._offsets = data["offsets"]
+        self._length = data["length"]
+        self._fileSize = data["fileSize"]
+        self._fileDate = data["fileDate"]
+
+
+    def getInterval( self ):
+        """Return time in s between two table entries
+        """
+        return self._interval
+
+
+    def getLength( self ):
+        """Return exact length of file in s
+        """
+        return self._length
+
+
+    def getFileSize( self ):
+        """Return size of file in bytes
+        """
+        return self._fileSize
+
+
+    def getOffset( self, seconds ):
+        """Return byte offset of given time in s. Position between two table
+        entries is interpolated.
+        """
+        if not self._times:
+            return 0
+        seconds = max( 0.0, min( self._length, seconds ) )
+        idx = bisect.bisect_right( self._times, seconds ) - 1
+        if idx + 1 < len( self._times ):
+            nextTime = self._times[idx + 1]
+            nextOffset = self._offsets[idx + 1]
+        else:
+            nextTime = self._length
+            nextOffset = self._fileSize
+        span = nextTime - self._times[idx]
+        if span <= 0:
+            return self._offsets[idx]
+        ratio = ( seconds - self._times[idx] ) / span
+        return int( self._offsets[idx] + ratio * ( nextOffset - self._offsets[idx] ) )
+
+
+    def getTime( self, offset ):
+        """Return time in s of given byte offset, inverse of getOffset
+        """
+        if not self._offsets:
+            return 0.0
+        idx = max( 0, bisect.bisect_right( self._offsets, offset ) - 1 )
+        if idx + 1 < len( self._offsets ):
+            nextTime = self._times[idx + 1]
+            nextOffset = self._offsets[idx + 1]
+        else:
+            nextTime = self._length
+            nextOffset = self._fileSize
+        span = nextOffset - self._offsets[idx]
+        if span <= 0:
+            return self._times[idx]
+        ratio = max( 0.0, min( 1.0, ( offset - self._offsets[idx] ) / span ) )
+        return self._times[idx] + ratio * ( nextTime - self._times[idx] )
+
+
+    def getRatio( self, seconds ):
+        """Return byte position 0 ... 1.0 of given time in s
+        """
+        if self._fileSize <= 0:
+            return 0.0
+        return self.getOffset( seconds ) / self._fileSize
+
+
+    def getTimeOfRatio( self, ratio ):
+        """Return time in s of given byte position 0 ... 1.0
+        """
+        return self.getTime( ratio * self._fileSize )
+
+
+
+class CSeekIndexStore:
+    """Holds seek index of all tracks requested so far. Missing tables are
+    build in a background thread and the store is saved to a json file
+    after each build.
+    """
+
+    def __init__( self, fileName, interval=1.0 ):
+        self._fileName = fileName
+        self._interval = interval
+        self._indexMap = {}             # audio file path and CSeekIndex object
+        self._pending = []              # audio files waiting for build
+        self._checked = {}              # audio file path and ( CSeekIndex object, True if usable ), see get
+        self._lock = threading.Lock()
+        self._event = threading.Event()
+        self._stop = False
+        self._thread = None
+
+        try:
+            with open( self._fileName, "r" ) as fp:
+                for path, data in json.load( fp ).items():
+                    index = CSeekIndex( self._interval )
+                    index.fromDict( data )
+                    self._indexMap[path] = index
+            logging.info( "Loaded {} seek index entries".format( len( self._indexMap ) ) )
+        except FileNotFoundError:
+            pass
+        except Exception:
+            logging.exception( "Error load seek index" )
+
+
+    def stop( self ):
+        """Stop background thread, wait until current build is done
+        """
+        self._stop = True
+        self._event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+    def get( self, path ):
+        """Return CSeekIndex of given file or None in case not available (yet). The
+        index is validated against the file once, again with the next request
+        """
+        with self._lock:
+            index = self._indexMap.get( path )
+            checked = self._checked.get( path )
+        if checked is None or checked[0] is not index:
+            checked = ( index, self._isUsable( path, index ) )
+            with self._lock:
+                self._checked[path] = checked
+        return index if checked[1] else None
+
+
+    def request( self, paths ):
+        """Request seek index for given files. Build is done in background for
+        all files without valid index
+        """
+        with self._lock:
+            for path in paths:
+                index = self._indexMap.get( path )
+                usable = self._isUsable( path, index )
+                self._checked[path] = ( index, usable )
+                if path in self._pending or usable:
+                    continue
+                self._pending.append( path )
+            if not self._pending:
+                return
+            if self._thread is None:
+                self._thread = threading.Thread( target=self._worker, daemon=True )
+                self._thread.start()
+        self._event.set()
+
+
+    def move( self, oldPaths, newPaths ):
+        """Take over seek index of files which were renamed or moved, e.g. with their
+        album. oldPaths and newPaths are lists of same length
+        """
+        with self._lock:
+            moved = 0
+            for oldPath, newPath in zip( oldPaths, newPaths ):
+                index = self._indexMap.pop( oldPath, None )
+                self._checked.pop( oldPath, None )
+                if index is not None:
+                    self._indexMap[newPath] = index
+                    moved += 1
+        if moved:
+            self._save()
+
+
+    def _isUsable( self, path, index ):
+        """Return True in case index is available and up to date
+        """
+        return index is not None and index.getInterval() == self._interval and index.isValid( path )
+
+
+    def _worker( self ):
+        """Executed in separate thread to build requested tables
+        """
+        while not self._stop:
+            self._event.wait()
+            self._event.clear()
+            changed = False
+            while not self._stop:
+                with self._lock:
+                    if not self._pending:
+                        break
+                    path = self._pending.pop( 0 )
+                index = CSeekIndex( self._interval )
+                try:
+                    index.build( path )
+                except Exception:
+                    logging.exception( "Error build seek index of {}".format( path ) )
+                    continue
+                with self._lock:
+                    self._indexMap[path] = index
+                    self._checked[path] = ( index, True )
+                changed = True
+            if changed:
+                self._save()
+
+
+    def _save( self ):
+        with self._lock:
+            data = { path: index.toDict() for path, index in self._indexMap.items() }
+        try:
+            tmpName = self._fileName + ".tmp"
+            with open( tmpName, "w" ) as fp:
+                json.dump( data, fp )
+            os.replace( tmpName, self._fileName )
+        except Exception:
+            logging.exception( "Error write seek index" )         # kept in memory, written with next build
@@ -0,0 +1,197 @@
+#!/bin/python3
+# 
+# Copyright Florian Pfanner 2026
+#
+# This file is part of AudioPlayer.
+# 
+# AudioPlayer is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# AudioPlayer is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+# 
+# You should have received a copy of the GNU General Public License
+# along with AudioPlayer. If not, see <https://www.gnu.org/licenses/>.
+# 
+# 
+
+
+
+
+import os
+import time
+
+import CPlaybackBackend
+
+
+
+class CSimulatedBackend( CPlaybackBackend.CPlaybackBackend ):
+    """Playback backend without audio output. Playback runs on a virtual clock,
+    all tracks have the same length. The clock is moved by advance(). If speed
+    is greater 0 the clock additionally follows the wall clock multiplied by
+    speed, thus a session can run faster than real time. With speed 0 the
+    backend is fully deterministic.
+    """
+
+    def __init__( self, trackLength=300.0, speed=0.0 ):
+        super().__init__()
+        self._trackLength = trackLength
+        self._speed = speed
+        self._files = []
+        self._trackIdx = -1
+        self._trackTime = 0.0
+        self._state = "stopped"
+        self._volume = 1.0
+        self._virtualTime = 0.0
+        self._lastWallTime = time.monotonic()
+
+
+    def getVirtualTime( self ):
+        """Return virtual time in s since creation of backend
+        """
+        self._followWallClock()
+        return self._virtualTime
+
+
+    def advance( self, seconds ):
+        """Move virtual clock by given time. While playing, track changes and the
+        end of the play list are signaled as events
+        """
+        self._virtualTime += seconds
+        if self._state != "playing":
+            return
+        self._trackTime += seconds
+        while self._state == "playing" and self._trackTime >= self._trackLength:
+            self._trackTime -= self._trackLength
+            if self._trackIdx + 1 < len( self._files ):
+                self._trackIdx += 1
+                self._emitEvent( "trackChanged", self._trackIdx )
+                self._emitEvent( "playing", self._trackIdx )
+            else:
+                self._trackTime = 0.0
+                self._state = "stopped"
+                self._emitEvent( "stopped", self._trackIdx )
+
+
+    def _followWallClock( self ):
+        now = time.monotonic()
+        if self._speed > 0:
+            self.advance( ( now - self._lastWallTime ) * self._speed )
+        self._lastWallTime = now
+
+
+    def setPlaylist( self, files ):
+        self._followWallClock()
+        self._files = list( files )
+        self._trackIdx = -1
+        self._trackTime = 0.0
+        self._state = "stopped"
+
+
+    def playItem( self, idx ):
+        self._followWallClock()
+        if 0 <= idx < len( self._files ):
+            self._trackIdx = idx
+            self._trackTime = 0.0
+            self._state = "playing"
+            self._emitEvent( "trackChanged", self._trackIdx )
+            self._emitEvent( "playing", self._trackIdx )
+
+
+    def play( self ):
+        self._followWallClock()
+        if self._state == "paused":
+            self._state = "playing"
+            self._emitEvent( "playing", self._trackIdx )
+        elif self._state == "stopped":
+            self.playItem( 0 )
+
+
+    def stop( self ):
+        self._followWallClock()
+        if self._state != "stopped":
+            self._state = "stopped"
+            self._trackTime = 0.0
+            self._emitEvent( "stopped", self._trackIdx )
+
+
+    def pause( self, on ):
+        self._followWallClock()
+        if on and self._state == "playing":
+            self._state = "paused"
+        elif not on and self._state == "paused":
+            self._state = "playing"
+
+
+    def next( self ):
+        self._followWallClock()
+        if self._trackIdx + 1 < len( self._files ):
+            self.playItem( self._trackIdx + 1 )
+
+
+    def previous( self ):
+        self._followWallClock()
+        if self._trackIdx > 0:
+            self.playItem( self._trackIdx - 1 )
+
+
+    def isPlaying( self ):
+        self._followWallClock()
+        return self._state == "playing"
+
+
+    def isStopped( self ):
+        self._followWallClock()
+        return self._state == "stopped"
+
+
+    def isPause( self ):
+        return self._state == "paused"
+
+
+    def getTrackCount( self ):
+        return len( self._files )
+
+
+    def getTrack( self ):
+        return self._trackIdx + 1
+
+
+    def getVolume( self ):
+        return self._volume
+
+
+    def setVolume( self, volume ):
+        self._volume = max( 0, min( 100, int( volume*100 ) ) ) / 100.0
+
+
+    def getTime( self ):
+        self._followWallClock()
+        return self._trackTime
+
+
+    def setTime( self, seconds ):
+        self._trackTime = max( 0.0, min( self._trackLength, seconds ) )
+
+
+    def getLength( self ):
+        return self._trackLength
+
+
+    def getPosition( self ):
+        return self.getTime() / self._trackLength
+
+
+    def setPosition( self, pos ):
+        self.setTime( pos * self._trackLength )
+
+
+    def getTrackDescription( self ):
+        if 0 <= self._trackIdx < len( self._files ):
+            return os.path.basename( self._files[self._trackIdx] )
+        return ""
+
@@ -0,0 +1,170 @@
+#!/bin/python3
+# 
+# Copyright Florian Pfanner 2026
+#
+# This file is part of AudioPlayer.
+# 
+# AudioPlayer is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# AudioPlayer is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+# 
+# You should have received a copy of the GNU General Public License
+# along with AudioPlayer. If not, see <https://www.gnu.org/licenses/>.
+# 
+# 
+
+
+
+
+import time
+import logging
+import threading
+import collections
+
+
+# Upper bounds of histogram buckets in s
+DEFAULT_BUCKETS = [ 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0 ]
+
+
+
+class CLatencyHistogram:
+    """Histogram of latencies with fixed buckets and the most recent samples
+    """
+
+    def __init__( self, buckets=DEFAULT_BUCKETS, numSamples=256 ):
+        self._buckets = buckets
+        self._counts = [ 0 ] * ( len( buckets ) + 1 )      # last one is +Inf
+        self._sum = 0.0
+        self._count = 0
+        self._samples = collections.deque( maxlen=numSamples )
+
+
+    def add( self, value ):
+        idx = 0
+        while idx < len( self._buckets ) and value > self._buckets[idx]:
+            idx += 1
+        self._counts[idx] += 1
+        self._sum += value
+        self._count += 1
+        self._samples.append( value )
+
+
+    def getCount( self ):
+        return self._count
+
+
+    def getSum( self ):
+        return self._sum
+
+
+    def getCumulativeBuckets( self ):
+        """Return list of ( upper bound, count of values <= upper bound ), last bound is +Inf
+        """
+        res = []
+        total = 0
+        for bound, count in zip( self._buckets + [ float( "inf" ) ], self._counts ):
+            total += count
+            res.append( ( bound, total ) )
+        return res
+
+
+    def getPercentile( self, p ):
+        """Return percentile p (0 ... 100) of the recent samples, None if no sample
+        """
+        if not self._samples:
+            return None
+        values = sorted( self._samples )
+        return values[ min( len( values ) - 1, int( len( values ) * p / 100 ) ) ]
+
+
+    def toDict( self ):
+        return { "count": self._count,
+                 "sum": self._sum,
+                 "buckets": self.getCumulativeBuckets(),
+                 "p50": self.getPercentile( 50 ),
+                 "p95": self.getPercentile( 95 ),
+                 "max": max( self._samples ) if self._samples else None }
+
+
+
+class CTracer:
+    """Lightweight tracing of user actions, e.g. from input to playback start.
+    A trace is started with begin(), each stage is stamped with the time since
+    begin. The latency of each stage is kept in a histogram. Stamps can be done
+    from any thread. A trace older than timeout is dropped without recording, e.g.
+    an action whose final stage never happened.
+    """
+
+    def __init__( self, timeout=10.0 ):
+        self._timeout = timeout
+        self._lock = threading.Lock()
+        self._open = {}                 # trace name and [ start time, list of ( stage, latency ) ]
+        self._histograms = {}           # ( trace name, stage ) and CLatencyHistogram
+
+
+    def begin( self, traceName ):
+        """Start trace with given name. A trace with same name still open is dropped
+        """
+        with self._lock:
+            self._open[traceName] = [ time.perf_counter(), [] ]
+
+
+    def stamp( self, traceName, stage ):
+        """Record time since begin of trace for given stage. Ignored if trace is not open
+        """
+        now = time.perf_counter()
+        with self._lock:
+            trace = self._open.get( traceName )
+            if trace is None:
+                return
+            latency = now - trace[0]
+            if latency > self._timeout:
+                del self._open[traceName]
+                logging.debug( "Trace %s dropped at %s after %.1fs", traceName, stage, latency )
+                return
+            trace[1].append( ( stage, latency ) )
+            self._histograms.setdefault( ( traceName, stage ), CLatencyHistogram() ).add( latency )
+
+
+    def end( self, traceName, stage ):
+        """Stamp last stage and close trace
+        """
+        self.stamp( traceName, stage )
+        with self._lock:
+            trace = self._open.pop( traceName, None )
+        if trace is not None:
+            logging.info( "Trace %s: %s", traceName, ", ".join( "{} {:.1f}ms".format( s, l * 1000.0 ) for s, l in trace[1] ) )
+
+
+    def getHistograms( self ):
+        """Return dictionary "trace/stage" and dictionary with histogram data
+        """
+        with self._lock:
+            return { "{}/{}".format( traceName, stage ): histogram.toDict() for ( traceName, stage ), histogram in self._histograms.items() }
+
+
+    def getMetrics( self ):
+        """Collector for CMetrics, return list of ( name, type, help, value, labels )
+        """
+        res = []
+        with self._lock:
+            for ( traceName, stage ), histogram in sorted( self._histograms.items() ):
+                res.append( ( "trace_latency_seconds", "histogram", "Latency since begin of trace until stage",
+                              { "buckets": histogram.getCumulativeBuckets(), "sum": histogram.getSum(), "count": histogram.getCount() },
+                              { "trace": traceName, "stage": stage } ) )
+        return res
+
+
+
+_tracer = CTracer()
+
+def getTracer():
+    """Return tracer object of application
+    """
+    return _tracer
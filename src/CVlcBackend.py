@@ -0,0 +1,159 @@
+#!/bin/python3
+# 
+# Copyright Florian Pfanner 2026
+#
+# This file is part of AudioPlayer.
+# 
+# AudioPlayer is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# AudioPlayer is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+# 
+# You should have received a copy of the GNU General Public License
+# along with AudioPlayer. If not, see <https://www.gnu.org/licenses/>.
+# 
+# 
+
+
+
+
+import vlc
+
+import CPlaybackBackend
+
+
+
+class CVlcBackend( CPlaybackBackend.CPlaybackBackend ):
+    """Playback backend based on libvlc"""
+
+    def __init__( self ):
+        super().__init__()
+
+        self.__player = vlc.MediaPlayer()
+        self.__listPlayer = vlc.MediaListPlayer()
+        self.__listPlayer.set_media_player( self.__player )
+        self.__curMediaList = vlc.MediaList()
+
+        self.__eventManager = self.__listPlayer.event_manager()
+        self.__eventManager.event_attach( vlc.EventType.MediaListPlayerNextItemSet, self.__eventHandler )
+        self.__playerEventManager = self.__player.event_manager()
+        self.__playerEventManager.event_attach( vlc.EventType.MediaPlayerPlaying, self.__playerEventHandler )
+        self.__playerEventManager.event_attach( vlc.EventType.MediaPlayerStopped, self.__playerEventHandler )
+        self.__eventsCount = 0
+
+
+    def __eventHandler( self, *args ):
+        self.__eventsCount = min( self.getTrackCount(), self.__eventsCount + 1 )
+        self._emitEvent( "trackChanged", self.__eventsCount - 1 )
+
+
+    def __playerEventHandler( self, event ):
+        if event.type == vlc.EventType.MediaPlayerPlaying:
+            self._emitEvent( "playing", self.__eventsCount - 1 )
+        else:
+            self._emitEvent( "stopped", self.__eventsCount - 1 )
+
+
+    def setPlaylist( self, files ):
+        mediaList = vlc.MediaList()
+        for file in files:
+            mediaList.add_media( file )
+        self.__curMediaList = mediaList
+        self.__listPlayer.set_media_list( mediaList )
+        self.__eventsCount = 0
+
+
+    def playItem( self, idx ):
+        self.__eventsCount = idx          # NextItemSet event increments to idx + 1
+        self.__listPlayer.play_item_at_index( idx )
+
+
+    def stop( self ):
+        self.__listPlayer.stop()
+
+
+    def pause( self, on ):
+        self.__player.set_pause( on )
+
+
+    def play( self ):
+        self.__listPlayer.play()
+
+
+    def next( self ):
+        self.__listPlayer.next()
+
+
+    def previous( self ):
+        oldEvents = self.__eventsCount
+        self.__listPlayer.previous()
+        newEvents = self.__eventsCount
+        if oldEvents < newEvents:
+            self.__eventsCount = max( 1, self.__eventsCount - 2 )
+
+
+    def isPlaying( self ):
+        return self.__player.is_playing()
+
+
+    def isStopped( self ):
+        return self.__player.get_state() == vlc.State.Stopped
+
+
+    def isPause( self ):
+        return self.__player.get_state() == vlc.State.Paused
+
+
+    def getTrackCount( self ):
+        return self.__curMediaList.count()
+
+
+    def getTrack( self ):
+        return self.__eventsCount
+
+
+    def getVolume( self ):
+        return self.__player.audio_get_volume() / 100.0
+
+
+    def setVolume( self, volume ):
+        self.__player.audio_set_volume( max( 0, min( 100, int( volume*100 )  ) ) )
+
+
+    def getTime( self ):
+        return self.__player.get_time() / 1000.0
+
+
+    def setTime( self, seconds ):
+        self.__player.set_time( int( seconds * 1000 ) )
+
+
+    def getLength( self ):
+        return self.__player.get_length() / 1000.0
+
+
+    def getPosition( self ):
+        return self.__player.get_position()
+
+
+    def setPosition( self, pos ):
+        self.__player.set_position( pos )
+
+
+    def getTrackDescription( self ):
+        m = self.__player.get_media()
+        if m is not None:
+            title = m.get_meta( vlc.Meta.Title )
+            artist = m.get_meta( vlc.Meta.Artist )
+            if title is None:
+                title = ""
+            if artist is None:
+                artist = ""
+            return  "{} - {}".format( title, artist )
+        return ""
+
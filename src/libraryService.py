@@ -0,0 +1,71 @@
+#!/bin/python3
+# 
+# Copyright Florian Pfanner 2026
+#
+# This file is part of AudioPlayer.
+# 
+# AudioPlayer is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# AudioPlayer is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+# 
+# You should have received a copy of the GNU General Public License
+# along with AudioPlayer. If not, see <https://www.gnu.org/licenses/>.
+# 
+# 
+
+
+
+
+
+"""Library service without GUI and Qt. Scans and persists the library of a settings
+file and serves it to the players over the unix socket of setting
+library/serviceSocket, see CLibraryService. Runs until SIGTERM or SIGINT.
+"""
+
+import sys
+import signal
+import logging
+import argparse
+
+import CIniSettings
+import CLibraryService
+
+
+
+def main( argv=None ):
+    parser = argparse.ArgumentParser( description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter )
+    parser.add_argument( "settings", help="Settings file in ini format, e.g. settings/settings.ini" )
+    parser.add_argument( "--socket", help="Path of unix socket, default is setting library/serviceSocket" )
+    parser.add_argument( "--verbose", action="store_true", help="Print debug messages" )
+    args = parser.parse_args( argv )
+    logging.basicConfig( level=logging.DEBUG if args.verbose else logging.INFO,
+                         format="%(asctime)s %(levelname)s %(message)s" )
+
+    settings = CIniSettings.CIniSettings( args.settings )
+    socketPath = args.socket or settings.value( "library/serviceSocket", "" )
+    if not socketPath:
+        logging.error( "No socket given, set library/serviceSocket or use --socket" )
+        return 1
+
+    service = CLibraryService.CLibraryService( settings, socketPath )
+    service.start()
+
+    def stop( signum, frame ):
+        logging.info( "Stop library service" )
+        service.stop()
+    signal.signal( signal.SIGTERM, stop )
+    signal.signal( signal.SIGINT, stop )
+
+    service.run()
+    return 0
+
+
+
+if __name__ == "__main__":
+    sys.exit( main() )
@@ -0,0 +1,212 @@
+#!/bin/python3
+# 
+# Copyright Florian Pfanner 2026
+#
+# This file is part of AudioPlayer.
+# 
+# AudioPlayer is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# AudioPlayer is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+# 
+# You should have received a copy of the GNU General Public License
+# along with AudioPlayer. If not, see <https://www.gnu.org/licenses/>.
+# 
+# 
+
+
+
+
+
+"""Library tool without GUI and Qt. Builds, inspects and verifies the library
+index of a settings file, thus a player can be provisioned with a warm cache
+instead of scanning on first boot.
+
+    scan        Scan all roots and write the index to the cache directory
+    prewarm     Copy the cover images of all albums into the image cache
+    stats       Print statistics of the persisted index
+    query       Print albums of the persisted index
+    verify      Compare the persisted index with the content on disk
+
+All results are written as json to stdout. Exit code is 0 on success, 1 in case
+of an error or a difference found by verify.
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+
+import CIniSettings
+import CLibraryIndex
+import CImageCache
+
+
+
+def _getImageCache( index ):
+    if index.getCacheDir() is None:
+        raise Exception( "Image cache disabled (library/imageCache)" )
+    return CImageCache.CImageCache( os.path.join( index.getCacheDir(), "img" ),
+                                    { root.getPath(): root.getName() for root in index.getRoots() } )
+
+
+def _loadIndex( index ):
+    if index.load() == 0:
+        raise Exception( "No persisted index found, run scan first" )
+    return index.buildSnapshot()
+
+
+def _albumToDict( snapshot, album ):
+    return { "name": album.getName(),
+             "displayName": album.getDisplayName(),
+             "path": album.getPath(),
+             "date": album.getDate(),
+             "audioFiles": album.getNumAudioFiles(),
+             "imageFiles": album.getNumImageFiles(),
+             "stale": snapshot.isAlbumStale( album.getName() ) }
+
+
+def _prewarm( index, snapshot, concurrency ):
+    imageCache = _getImageCache( index )
+    imgPaths = []
+    for albumName in snapshot.getAlbumList():
+        imgPaths.extend( snapshot.getAlbum( albumName ).getImageFiles() )
+    startTime = time.perf_counter()
+    result = imageCache.prewarm( imgPaths, concurrency )
+    result["seconds"] = round( time.perf_counter() - startTime, 3 )
+    return result
+
+
+def commandScan( index, args ):
+    index.load()                    # last known content is kept for directories which could not be read
+    result = { "roots": [] }
+    for root in index.getRoots():
+        startTime = time.perf_counter()
+        tree = index.scan( root )
+        root.save( tree )
+        result["roots"].append( { "path": root.getPath(),
+                                  "cacheFile": root.getCacheFile(),
+                                  "seconds": round( time.perf_counter() - startTime, 3 ),
+                                  "failedDirectories": root.getLastScanFailures() } )
+    snapshot = index.buildSnapshot()
+    result["albums"] = snapshot.getNumAlbums()
+    result["staleAlbums"] = snapshot.getNumStaleAlbums()
+    result["entries"] = index.getNumScanEntries()
+    if args.prewarm:
+        result["prewarm"] = _prewarm( index, snapshot, args.concurrency )
+    return result, 0
+
+
+def commandPrewarm( index, args ):
+    return _prewarm( index, _loadIndex( index ), args.concurrency ), 0
+
+
+def commandStats( index, args ):
+    snapshot = _loadIndex( index )
+    result = { "albums": snapshot.getNumAlbums(),
+               "directories": snapshot.getNumDirectories(),
+               "staleAlbums": snapshot.getNumStaleAlbums(),
+               "roots": [ { "path": root.getPath(),
+                            "cacheFile": root.getCacheFile(),
+                            "loaded": root.getTree() is not None,
+                            "albums": sum( 1 for album in root.getTree().iterAlbums() ) if root.getTree() is not None else 0 }
+                          for root in index.getRoots() ] }
+    if index.getCacheDir() is not None:
+        numFiles, numBytes = _getImageCache( index ).getSize()
+        result["imageCache"] = { "files": numFiles, "bytes": numBytes }
+    return result, 0
+
+
+def commandQuery( index, args ):
+    snapshot = _loadIndex( index )
+    albums = []
+    if args.type == "dir":
+        albumNames = snapshot.getAlbumList( args.type )
+    else:
+        albumNames = snapshot.queryAlbums( args.type, args.root, minTracks=args.minTracks )
+    for albumName in albumNames:
+        album = snapshot.getAlbum( albumName )
+        if args.match and args.match.lower() not in album.getPath().lower():
+            continue
+        albums.append( _albumToDict( snapshot, album ) )
+        if args.limit and len( albums ) >= args.limit:
+            break
+    return albums, 0
+
+
+def commandVerify( index, args ):
+    result = { "roots": [] }
+    exitCode = 0
+    for root in index.getRoots():
+        persisted = index.loadTree( root )
+        current = index.scan( root )
+        rootResult = { "path": root.getPath(), "cacheFile": root.getCacheFile(), "persisted": persisted is not None }
+        if persisted is None:
+            rootResult["ok"] = False
+        else:
+            added, removed = current.getAlbumChanges( persisted )
+            rootResult["moved"] = sorted( [ oldAlbum.getPath(), newAlbum.getPath() ]
+                                          for oldAlbum, newAlbum in CLibraryIndex.getAlbumMoves( added, removed ) )
+            rootResult["added"] = sorted( album.getPath() for album in added )
+            rootResult["removed"] = sorted( album.getPath() for album in removed )
+            rootResult["failedDirectories"] = root.getLastScanFailures()
+            rootResult["ok"] = current == persisted
+        if not rootResult["ok"]:
+            exitCode = 1
+        result["roots"].append( rootResult )
+    return result, exitCode
+
+
+def main( argv=None ):
+    parser = argparse.ArgumentParser( description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter )
+    parser.add_argument( "settings", help="Settings file in ini format, e.g. settings/settings.ini" )
+    parser.add_argument( "--verbose", action="store_true", help="Print debug messages" )
+    subparsers = parser.add_subparsers( dest="command", required=True )
+
+    scanParser = subparsers.add_parser( "scan", help="Scan all roots and write the index" )
+    scanParser.add_argument( "--prewarm", action="store_true", help="Copy cover images into image cache after scan" )
+    scanParser.add_argument( "--concurrency", type=int, default=8, help="Number of threads copying images" )
+    scanParser.set_defaults( func=commandScan )
+
+    prewarmParser = subparsers.add_parser( "prewarm", help="Copy cover images into image cache" )
+    prewarmParser.add_argument( "--concurrency", type=int, default=8, help="Number of threads copying images" )
+    prewarmParser.set_defaults( func=commandPrewarm )
+
+    statsParser = subparsers.add_parser( "stats", help="Print statistics of persisted index" )
+    statsParser.set_defaults( func=commandStats )
+
+    queryParser = subparsers.add_parser( "query", help="Print albums of persisted index" )
+    queryParser.add_argument( "--type", default="full", choices=[ "full", "date", "newest", "dir" ], help="Order of albums" )
+    queryParser.add_argument( "--match", help="Only albums with this text in path (case insensitive)" )
+    queryParser.add_argument( "--root", help="Only albums of root with this name" )
+    queryParser.add_argument( "--minTracks", type=int, help="Only albums with at least this number of tracks" )
+    queryParser.add_argument( "--limit", type=int, default=0, help="Maximum number of albums, 0 for all" )
+    queryParser.set_defaults( func=commandQuery )
+
+    verifyParser = subparsers.add_parser( "verify", help="Compare persisted index with content on disk" )
+    verifyParser.set_defaults( func=commandVerify )
+
+    args = parser.parse_args( argv )
+    logging.basicConfig( level=logging.DEBUG if args.verbose else logging.WARNING )
+
+    try:
+        index = CLibraryIndex.CLibraryIndex( CIniSettings.CIniSettings( args.settings ) )
+        result, exitCode = args.func( index, args )
+    except Exception as e:
+        logging.debug( "Command failed", exc_info=True )
+        print( json.dumps( { "error": str( e ) } ) )
+        return 1
+    print( json.dumps( result, indent=2 ) )
+    return exitCode
+
+
+
+if __name__ == "__main__":
+    sys.exit( main() )
@@ -21,23 +21,28 @@
 
 
 
+import time
+startTime = time.perf_counter()         # start of import phase
+
 from PyQt5.QtWidgets import QApplication
 from PyQt5.QtWidgets import QSplashScreen
 from PyQt5.QtCore import QCoreApplication
+from PyQt5.QtCore import QSettings
+from PyQt5.QtCore import Qt
 from PyQt5.Qt import QPixmap
 import sys
 import os
-import time
 import logging
 
-import CAudioLibrary
-import CMainWindow
+import CPhaseTimer
 
 
 
 if __name__ == "__main__":
 
-    logging.basicConfig( level=logging.DEBUG )
+    settings = QSettings( os.path.join( os.path.dirname( os.path.abspath(__file__) ), "../settings/settings.ini" ), QSettings.IniFormat )
+    logging.basicConfig( level=getattr( logging, str( settings.value( "logging/level", "INFO" ) ).upper(), logging.INFO ) )
+    firstStart = True
 
     QCoreApplication.setOrganizationName( "Pfanner" )
     QCoreApplication.setApplicationName( "AudioPlayer" )
@@ -46,12 +51,28 @@ if __name__ == "__main__":
 
     while True:
         try:
-            pixmap = QPixmap( os.path.join( os.path.dirname( os.path.abspath(__file__) ), "../images/splash.png" ) )
+            phaseTimer = CPhaseTimer.CPhaseTimer( "Startup", startTime )
+            if firstStart:
+                phaseTimer.mark( "import Qt" )
+                firstStart = False
+
+            # show cover of last album as early as possible, fall back to splash image
+            pixmap = QPixmap()
+            lastImage = QSettings().value( "albumSelector/lastImage", "" )
+            if not lastImage or not os.path.isfile( lastImage ) or not pixmap.load( lastImage ):
+                pixmap = QPixmap( os.path.join( os.path.dirname( os.path.abspath(__file__) ), "../images/splash.png" ) )
+            else:
+                screenSize = app.primaryScreen().size()
+                pixmap = pixmap.scaled( screenSize, Qt.KeepAspectRatio )
             splash = QSplashScreen( pixmap )
             splash.show()
             app.processEvents()
+            phaseTimer.mark( "splash" )
+
+            import CMainWindow                  # GUI modules are imported after splash is shown
+            phaseTimer.mark( "import GUI" )
 
-            g = CMainWindow.CMainWindow( None, splash )
+            g = CMainWindow.CMainWindow( None, splash, phaseTimer )
             g.show()
             splash.finish(g)
 
@@ -59,4 +80,4 @@ if __name__ == "__main__":
         except Exception as e:
             logging.exception( "Main execption" )
         time.sleep( 5 )
-
+        startTime = time.perf_counter()